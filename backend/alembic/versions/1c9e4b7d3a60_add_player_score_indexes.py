@@ -0,0 +1,30 @@
+"""Add player score indexes
+
+Revision ID: 1c9e4b7d3a60
+Revises: e5a7c3f19b24
+Create Date: 2026-10-17 15:12:37.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c9e4b7d3a60'
+down_revision: Union[str, None] = 'e5a7c3f19b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_player_scores_match_id'), 'player_scores', ['match_id'], unique=False)
+    op.create_index(op.f('ix_player_scores_player_id'), 'player_scores', ['player_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_player_scores_player_id'), table_name='player_scores')
+    op.drop_index(op.f('ix_player_scores_match_id'), table_name='player_scores')
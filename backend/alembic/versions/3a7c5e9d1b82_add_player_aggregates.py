@@ -0,0 +1,67 @@
+"""Add player aggregates
+
+Revision ID: 3a7c5e9d1b82
+Revises: 5d1a8c6e2f47
+Create Date: 2026-10-17 19:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c5e9d1b82'
+down_revision: Union[str, None] = '5d1a8c6e2f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('player_aggregates',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('matches_played', sa.Integer(), nullable=False),
+    sa.Column('score_count', sa.Integer(), nullable=False),
+    sa.Column('total_points', sa.Float(), nullable=True),
+    sa.Column('average_points', sa.Float(), nullable=True),
+    sa.Column('highest_score', sa.Float(), nullable=True),
+    sa.Column('lowest_score', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index('ix_player_aggregates_average_points', 'player_aggregates', ['average_points'], unique=False)
+    op.create_index('ix_player_aggregates_role_average_points', 'player_aggregates', ['role', 'average_points'], unique=False)
+    
+    # Populate the summary from the recorded scores
+    op.execute(
+        """
+        INSERT INTO player_aggregates (
+            player_id, role, matches_played, score_count, total_points,
+            average_points, highest_score, lowest_score, updated_at
+        )
+        SELECT
+            s.player_id,
+            p.role,
+            COUNT(DISTINCT s.match_id),
+            COUNT(s.id),
+            SUM(s.points),
+            SUM(s.points) / COUNT(DISTINCT s.match_id),
+            MAX(s.points),
+            MIN(s.points),
+            CURRENT_TIMESTAMP
+        FROM player_scores s
+        JOIN players p ON p.id = s.player_id
+        GROUP BY s.player_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_player_aggregates_role_average_points', table_name='player_aggregates')
+    op.drop_index('ix_player_aggregates_average_points', table_name='player_aggregates')
+    op.drop_table('player_aggregates')
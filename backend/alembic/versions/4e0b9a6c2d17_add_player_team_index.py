@@ -0,0 +1,28 @@
+"""Add player team index
+
+Revision ID: 4e0b9a6c2d17
+Revises: c31d7e5a0f42
+Create Date: 2026-10-17 10:41:55.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e0b9a6c2d17'
+down_revision: Union[str, None] = 'c31d7e5a0f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_players_team_id'), 'players', ['team_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_players_team_id'), table_name='players')
@@ -0,0 +1,32 @@
+"""Add player price indexes
+
+Revision ID: 59bb3c7912ba
+Revises: aea75ad6e1b1
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '59bb3c7912ba'
+down_revision: Union[str, None] = 'aea75ad6e1b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite appends the rowid (players.id) to every index entry, so these also
+    # serve (price, id) keyset pagination
+    op.create_index(op.f('ix_players_base_price'), 'players', ['base_price'], unique=False)
+    op.create_index(op.f('ix_players_sold_price'), 'players', ['sold_price'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_players_sold_price'), table_name='players')
+    op.drop_index(op.f('ix_players_base_price'), table_name='players')
@@ -0,0 +1,48 @@
+"""Add score corrections
+
+Revision ID: 5d1a8c6e2f47
+Revises: b2e6f0a4d8c3
+Create Date: 2026-10-17 18:03:26.512794
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1a8c6e2f47'
+down_revision: Union[str, None] = 'b2e6f0a4d8c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('score_corrections',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('score_id', sa.Integer(), nullable=False),
+    sa.Column('previous_points', sa.Float(), nullable=True),
+    sa.Column('new_points', sa.Float(), nullable=False),
+    sa.Column('delta', sa.Float(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['score_id'], ['player_scores.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_score_corrections_id'), 'score_corrections', ['id'], unique=False)
+    op.create_index(op.f('ix_score_corrections_match_id'), 'score_corrections', ['match_id'], unique=False)
+    op.create_index(op.f('ix_score_corrections_player_id'), 'score_corrections', ['player_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_score_corrections_player_id'), table_name='score_corrections')
+    op.drop_index(op.f('ix_score_corrections_match_id'), table_name='score_corrections')
+    op.drop_index(op.f('ix_score_corrections_id'), table_name='score_corrections')
+    op.drop_table('score_corrections')
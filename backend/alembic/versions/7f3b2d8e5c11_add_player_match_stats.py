@@ -0,0 +1,53 @@
+"""Add player match stats
+
+Revision ID: 7f3b2d8e5c11
+Revises: 1c9e4b7d3a60
+Create Date: 2026-10-17 16:05:43.219870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3b2d8e5c11'
+down_revision: Union[str, None] = '1c9e4b7d3a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('player_match_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('runs', sa.Integer(), nullable=False),
+    sa.Column('balls', sa.Integer(), nullable=False),
+    sa.Column('fours', sa.Integer(), nullable=False),
+    sa.Column('sixes', sa.Integer(), nullable=False),
+    sa.Column('wickets', sa.Integer(), nullable=False),
+    sa.Column('maidens', sa.Integer(), nullable=False),
+    sa.Column('catches', sa.Integer(), nullable=False),
+    sa.Column('stumpings', sa.Integer(), nullable=False),
+    sa.Column('run_outs', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('match_id', 'player_id', name='uq_player_match_stats_match_player')
+    )
+    op.create_index(op.f('ix_player_match_stats_id'), 'player_match_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_player_match_stats_match_id'), 'player_match_stats', ['match_id'], unique=False)
+    op.create_index(op.f('ix_player_match_stats_player_id'), 'player_match_stats', ['player_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_player_match_stats_player_id'), table_name='player_match_stats')
+    op.drop_index(op.f('ix_player_match_stats_match_id'), table_name='player_match_stats')
+    op.drop_index(op.f('ix_player_match_stats_id'), table_name='player_match_stats')
+    op.drop_table('player_match_stats')
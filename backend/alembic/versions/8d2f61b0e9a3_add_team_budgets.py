@@ -0,0 +1,61 @@
+"""Add team budgets
+
+Revision ID: 8d2f61b0e9a3
+Revises: 4e0b9a6c2d17
+Create Date: 2026-10-17 11:27:08.440192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f61b0e9a3'
+down_revision: Union[str, None] = '4e0b9a6c2d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('team_budgets',
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('total_spent', sa.Float(), nullable=False),
+    sa.Column('player_count', sa.Integer(), nullable=False),
+    sa.Column('bat_count', sa.Integer(), nullable=False),
+    sa.Column('bowl_count', sa.Integer(), nullable=False),
+    sa.Column('ar_count', sa.Integer(), nullable=False),
+    sa.Column('wk_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('team_id')
+    )
+    
+    # Populate the summary from the current squads
+    op.execute(
+        """
+        INSERT INTO team_budgets (
+            team_id, total_spent, player_count,
+            bat_count, bowl_count, ar_count, wk_count, updated_at
+        )
+        SELECT
+            t.id,
+            COALESCE(SUM(p.sold_price), 0.0),
+            COUNT(p.id),
+            COALESCE(SUM(CASE WHEN p.role = 'BAT' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN p.role = 'BOWL' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN p.role = 'AR' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN p.role = 'WK' THEN 1 ELSE 0 END), 0),
+            CURRENT_TIMESTAMP
+        FROM teams t
+        LEFT OUTER JOIN players p ON p.team_id = t.id
+        GROUP BY t.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('team_budgets')
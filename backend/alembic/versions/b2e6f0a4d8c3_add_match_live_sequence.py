@@ -0,0 +1,28 @@
+"""Add match live sequence
+
+Revision ID: b2e6f0a4d8c3
+Revises: 7f3b2d8e5c11
+Create Date: 2026-10-17 17:21:09.845531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e6f0a4d8c3'
+down_revision: Union[str, None] = '7f3b2d8e5c11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('matches', sa.Column('live_sequence', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('matches', 'live_sequence')
@@ -0,0 +1,61 @@
+"""Add player name search index
+
+Revision ID: c31d7e5a0f42
+Revises: 59bb3c7912ba
+Create Date: 2026-10-17 10:02:13.532871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c31d7e5a0f42'
+down_revision: Union[str, None] = '59bb3c7912ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE players_fts USING fts5(
+            name, content='players', content_rowid='id', tokenize='trigram'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER players_fts_ai AFTER INSERT ON players BEGIN
+            INSERT INTO players_fts(rowid, name) VALUES (new.id, new.name);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER players_fts_ad AFTER DELETE ON players BEGIN
+            INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER players_fts_au AFTER UPDATE OF name ON players BEGIN
+            INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO players_fts(rowid, name) VALUES (new.id, new.name);
+        END
+        """
+    )
+    # Index the existing players
+    op.execute("INSERT INTO players_fts(players_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS players_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS players_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS players_fts_ai")
+    op.execute("DROP TABLE IF EXISTS players_fts")
@@ -0,0 +1,71 @@
+"""Add auction ledger
+
+Revision ID: e5a7c3f19b24
+Revises: 8d2f61b0e9a3
+Create Date: 2026-10-17 14:02:51.317406
+
+"""
+from typing import Sequence, Union
+from datetime import datetime
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3f19b24'
+down_revision: Union[str, None] = '8d2f61b0e9a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('auction_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=True),
+    sa.Column('sold_price', sa.Float(), nullable=True),
+    sa.Column('previous_team_id', sa.Integer(), nullable=True),
+    sa.Column('previous_sold_price', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auction_events_id'), 'auction_events', ['id'], unique=False)
+    op.create_index(op.f('ix_auction_events_player_id'), 'auction_events', ['player_id'], unique=False)
+    op.create_table('auction_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('state', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id')
+    )
+    op.create_index(op.f('ix_auction_snapshots_id'), 'auction_snapshots', ['id'], unique=False)
+    
+    # Snapshot the current squads as the starting point for replay
+    sold = op.get_bind().execute(
+        sa.text("SELECT id, team_id, sold_price FROM players WHERE team_id IS NOT NULL")
+    ).fetchall()
+    snapshots = sa.table('auction_snapshots',
+        sa.column('event_id', sa.Integer),
+        sa.column('state', sa.Text),
+        sa.column('created_at', sa.DateTime)
+    )
+    op.bulk_insert(snapshots, [{
+        'event_id': 0,
+        'state': json.dumps({str(row.id): [row.team_id, row.sold_price] for row in sold}),
+        'created_at': datetime.utcnow()
+    }])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_auction_snapshots_id'), table_name='auction_snapshots')
+    op.drop_table('auction_snapshots')
+    op.drop_index(op.f('ix_auction_events_player_id'), table_name='auction_events')
+    op.drop_index(op.f('ix_auction_events_id'), table_name='auction_events')
+    op.drop_table('auction_events')
@@ -1,12 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Numeric
+from sqlalchemy import func
 from datetime import datetime
-from sqlalchemy import update
+from sqlalchemy import update, select
+from typing import Dict, List, Tuple, Any, Optional
 
-from ..db.database import get_db
-from ..models import Player, Team
-from ..schemas.auction import AuctionPurchase, AuctionStats, PlayerPurchaseResponse
+from ..core.config import MAX_SQUAD_SIZE, MIN_SQUAD_SIZE
+from ..db.database import get_db, begin_immediate
+from ..models import Player, Team, TeamBudget, AuctionEvent
+from ..services import ledger, team_budget
+from ..services.auction_stats import accumulator
+from ..services.bid_limits import pool as unsold_pool, compute_max_bids
+from ..services.events import publish_player_event, player_state, model_to_dict
+from ..schemas.auction import (
+    AuctionPurchase,
+    AuctionStats,
+    PlayerPurchaseResponse,
+    BatchPurchaseRequest,
+    BatchPurchaseResponse,
+    AuctionEventResponse,
+    LedgerState,
+    LedgerRestoreResult,
+    MaxBidResponse
+)
 
 router = APIRouter()
 
@@ -22,57 +38,179 @@ def purchase_player(
     - Team exists and has sufficient purse
     - Team has not exceeded player limit (16)
     """
-    # Get player and validate
-    player = db.query(Player).filter(Player.id == purchase.player_id).first()
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
-    if player.team_id is not None:
-        raise HTTPException(status_code=400, detail="Player is already sold")
+    # Reject bids that already fail the checks with one read, without taking
+    # the write lock; under contention most bids end here
+    failure = _purchase_failure(db, purchase)
+    if failure is not None:
+        raise HTTPException(status_code=failure[0], detail=failure[1])
     
-    # Get team and validate
-    team = db.query(Team).filter(Team.id == purchase.team_id).first()
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
-    
-    # Check team size limit
-    team_players = db.query(Player).filter(Player.team_id == team.id).all()
-    if len(team_players) >= 16:
-        raise HTTPException(status_code=400, detail="Team has reached maximum size of 16 players")
-    
-    # Calculate total spent by the team using proper type casting
-    total_spent = db.query(
-        func.coalesce(func.sum(cast(Player.sold_price, Numeric)), 0.0)
-    ).filter(
-        Player.team_id == team.id
-    ).scalar() or 0.0
-    
-    # Calculate remaining purse with proper type casting
-    initial_purse = db.query(
-        func.coalesce(cast(Team.initial_purse, Numeric), 0.0)
-    ).filter(
-        Team.id == team.id
-    ).scalar() or 0.0
-    
-    remaining_purse = float(initial_purse) - float(total_spent)
-    if remaining_purse < float(purchase.purchase_price):
-        raise HTTPException(status_code=400, detail="Team does not have sufficient purse")
-    
-    # Update player
+    price = float(purchase.purchase_price)
+    team_purse = select(Team.initial_purse).where(Team.id == purchase.team_id).scalar_subquery()
+    team_spent = select(TeamBudget.total_spent).where(TeamBudget.team_id == purchase.team_id).scalar_subquery()
+    team_size = select(TeamBudget.player_count).where(TeamBudget.team_id == purchase.team_id).scalar_subquery()
+    
+    # Sell the player in a single guarded UPDATE. The unsold, squad size and purse
+    # checks are evaluated again by the database under the write lock, so two
+    # concurrent bids can never both pass them.
     player_stmt = (
         update(Player)
-        .where(Player.id == purchase.player_id)
+        .where(
+            Player.id == purchase.player_id,
+            Player.team_id.is_(None),
+            func.coalesce(team_size, 0) < MAX_SQUAD_SIZE,
+            team_purse - func.coalesce(team_spent, 0.0) >= price
+        )
         .values(
             team_id=purchase.team_id,
             sold_price=purchase.purchase_price,
             updated_at=datetime.utcnow()
         )
+        .returning(*Player.__table__.columns)
+        .execution_options(synchronize_session=False)
     )
-    db.execute(player_stmt)
+    sold = db.execute(player_stmt).first()
+    if sold is None:
+        # A concurrent sale got in between: release the write lock, then report why
+        db.rollback()
+        status_code, detail = _purchase_failure(db, purchase) or (
+            409, "Player or team changed during the purchase, please retry"
+        )
+        raise HTTPException(status_code=status_code, detail=detail)
+    
+    team_budget.add_player(db, purchase.team_id, purchase.purchase_price, sold.role)
+    ledger.record(db, "purchase", sold.id, purchase.team_id, purchase.purchase_price)
     db.commit()
     
-    # Refresh and return updated player
-    db.refresh(player)
-    return player
+    sold_player = dict(sold._mapping)
+    publish_player_event(
+        "purchase",
+        sold_player,
+        {**player_state(sold), "team_id": None, "sold_price": None}
+    )
+    return {**sold_player, "is_sold": True}
+
+def _purchase_failure(db: Session, purchase: AuctionPurchase) -> Optional[Tuple[int, str]]:
+    """
+    Check a purchase against the current state with a single SELECT.
+    Returns (status code, detail) for the first failing check, or None if it
+    would currently succeed.
+    """
+    row = db.execute(select(
+        select(Player.team_id.isnot(None)).where(Player.id == purchase.player_id).scalar_subquery().label('sold'),
+        select(Team.initial_purse).where(Team.id == purchase.team_id).scalar_subquery().label('purse'),
+        select(TeamBudget.total_spent).where(TeamBudget.team_id == purchase.team_id).scalar_subquery().label('spent'),
+        select(TeamBudget.player_count).where(TeamBudget.team_id == purchase.team_id).scalar_subquery().label('size')
+    )).one()
+    if row.sold is None:
+        return 404, "Player not found"
+    if row.sold:
+        return 400, "Player is already sold"
+    if row.purse is None:
+        return 404, "Team not found"
+    if (row.size or 0) >= MAX_SQUAD_SIZE:
+        return 400, f"Team has reached maximum size of {MAX_SQUAD_SIZE} players"
+    if float(row.purse) - float(row.spent or 0) < float(purchase.purchase_price):
+        return 400, "Team does not have sufficient purse"
+    return None
+
+@router.post("/purchase/batch", response_model=BatchPurchaseResponse)
+def purchase_players_batch(
+    batch: BatchPurchaseRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Replay an ordered list of sales, e.g. from an offline auction log.
+    Each sale is validated like a single purchase, against the squads as they
+    stand after the earlier sales in the list. Valid sales are written in one
+    transaction; failures are reported per sale. With all_or_nothing, a single
+    failure means nothing is written.
+    """
+    begin_immediate(db)
+    
+    player_ids = {purchase.player_id for purchase in batch.purchases}
+    team_ids = {purchase.team_id for purchase in batch.purchases}
+    
+    # Load everything the validation needs in two queries
+    players = {
+        row.id: dict(row._mapping)
+        for row in db.query(*Player.__table__.columns).filter(Player.id.in_(player_ids)).all()
+    }
+    teams = {
+        row.id: {"remaining_purse": float(row.initial_purse or 0) - float(row.total_spent), "player_count": int(row.player_count)}
+        for row in db.query(
+            Team.id,
+            Team.initial_purse,
+            func.coalesce(TeamBudget.total_spent, 0.0).label('total_spent'),
+            func.coalesce(TeamBudget.player_count, 0).label('player_count')
+        ).outerjoin(
+            TeamBudget, TeamBudget.team_id == Team.id
+        ).filter(Team.id.in_(team_ids)).all()
+    }
+    
+    # Validate in order against a running model of the squads
+    now = datetime.utcnow()
+    sales: List[Dict[str, Any]] = []
+    failures = []
+    for index, purchase in enumerate(batch.purchases):
+        player = players.get(purchase.player_id)
+        team = teams.get(purchase.team_id)
+        price = float(purchase.purchase_price)
+        failure = None
+        if player is None:
+            failure = (404, "Player not found")
+        elif player["team_id"] is not None:
+            failure = (400, "Player is already sold")
+        elif team is None:
+            failure = (404, "Team not found")
+        elif team["player_count"] >= MAX_SQUAD_SIZE:
+            failure = (400, f"Team has reached maximum size of {MAX_SQUAD_SIZE} players")
+        elif team["remaining_purse"] < price:
+            failure = (400, "Team does not have sufficient purse")
+        
+        if failure is not None:
+            failures.append({
+                "index": index,
+                "player_id": purchase.player_id,
+                "team_id": purchase.team_id,
+                "status_code": failure[0],
+                "detail": failure[1]
+            })
+            continue
+        
+        player.update(team_id=purchase.team_id, sold_price=purchase.purchase_price, updated_at=now)
+        team["player_count"] += 1
+        team["remaining_purse"] -= price
+        sales.append(player)
+    
+    if failures and batch.all_or_nothing:
+        db.rollback()
+        return {"applied": False, "purchased": [], "failures": failures}
+    
+    if sales:
+        # Bulk UPDATE by primary key, then one budget upsert per team
+        db.execute(update(Player), [
+            {"id": sale["id"], "team_id": sale["team_id"], "sold_price": sale["sold_price"], "updated_at": now}
+            for sale in sales
+        ])
+        purchases_by_team: Dict[int, List[Tuple[float, str]]] = {}
+        for sale in sales:
+            purchases_by_team.setdefault(sale["team_id"], []).append((sale["sold_price"], sale["role"]))
+        for team_id, team_purchases in purchases_by_team.items():
+            team_budget.add_players(db, team_id, team_purchases)
+        ledger.record_many(db, [
+            {"event_type": "purchase", "player_id": sale["id"], "team_id": sale["team_id"], "sold_price": sale["sold_price"]}
+            for sale in sales
+        ])
+    db.commit()
+    
+    for sale in sales:
+        publish_player_event("purchase", sale, {**player_state(sale), "team_id": None, "sold_price": None})
+    
+    return {
+        "applied": True,
+        "purchased": [{**sale, "is_sold": True} for sale in sales],
+        "failures": failures
+    }
 
 @router.put("/reset/{player_id}", response_model=PlayerPurchaseResponse)
 def reset_player(
@@ -82,12 +220,15 @@ def reset_player(
     """
     Reset a player to unsold status.
     """
+    begin_immediate(db)
+    
     # Get player and validate
     player = db.query(Player).filter(Player.id == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     if player.team_id is None:
         raise HTTPException(status_code=400, detail="Player is not sold")
+    previous = player_state(player)
     
     # Reset player
     player_stmt = (
@@ -100,14 +241,51 @@ def reset_player(
         )
     )
     db.execute(player_stmt)
+    team_budget.remove_player(db, previous["team_id"], previous["sold_price"], previous["role"])
+    ledger.record(db, "reset", player_id, None, None, previous["team_id"], previous["sold_price"])
     db.commit()
     
     # Refresh and return updated player
     db.refresh(player)
+    publish_player_event("reset", model_to_dict(player), previous)
     return player
 
+@router.get("/max-bids", response_model=MaxBidResponse)
+def get_max_bids(
+    player_id: int,
+    min_squad_size: int = Query(MIN_SQUAD_SIZE, ge=0, le=MAX_SQUAD_SIZE),
+    db: Session = Depends(get_db)
+):
+    """
+    Maximum bid every team can place on an unsold player while still being able
+    to reach the minimum squad size at the cheapest remaining base prices.
+    Parameters:
+    - player_id: Player up for auction
+    - min_squad_size: Squad size each team must still be able to reach
+    """
+    if not unsold_pool.seeded:
+        unsold_pool.seed(db)
+    if not accumulator.seeded:
+        accumulator.seed(db)
+    
+    base_price = unsold_pool.base_price(player_id)
+    if base_price is None:
+        player = db.query(Player.id).filter(Player.id == player_id).first()
+        if player is None:
+            raise HTTPException(status_code=404, detail="Player not found")
+        raise HTTPException(status_code=400, detail="Player is already sold")
+    
+    sorted_prices, prefix = unsold_pool.arrays()
+    return {
+        "player_id": player_id,
+        "base_price": base_price,
+        "min_squad_size": min_squad_size,
+        "teams": compute_max_bids(accumulator.team_squads(), sorted_prices, prefix, base_price, min_squad_size)
+    }
+
 @router.get("/stats", response_model=AuctionStats)
 def get_auction_stats(
+    refresh: bool = False,
     db: Session = Depends(get_db)
 ):
     """
@@ -116,95 +294,88 @@ def get_auction_stats(
     - Team-wise spending and player counts
     - Role-wise spending and player counts
     - Highest/lowest purchases by role
-    """
-    # Get all sold players with proper type handling
-    stats_result = db.query(
-        func.count(Player.id).label('total_sold'),
-        func.coalesce(func.sum(cast(Player.sold_price, Numeric)), 0.0).label('total_spent'),
-        func.coalesce(func.max(cast(Player.sold_price, Numeric)), 0.0).label('highest_price'),
-        func.coalesce(func.min(cast(Player.sold_price, Numeric)), 0.0).label('lowest_price')
-    ).filter(
-        Player.team_id.isnot(None)
-    ).first()
-    
-    # Handle the case where stats_result might be None
-    if stats_result is None:
-        total_players_sold = 0
-        total_spent = 0.0
-        highest_purchase = 0.0
-        lowest_purchase = 0.0
-    else:
-        total_players_sold = int(stats_result.total_sold or 0)
-        total_spent = float(stats_result.total_spent or 0.0)
-        highest_purchase = float(stats_result.highest_price or 0.0)
-        lowest_purchase = float(stats_result.lowest_price or 0.0)
-    
-    avg_price = total_spent / total_players_sold if total_players_sold > 0 else 0.0
-    
-    # Get team-wise spending and player counts
-    team_stats = db.query(
-        Team.id,
-        Team.name,
-        func.count(Player.id).label('players_bought'),
-        func.coalesce(func.sum(cast(Player.sold_price, Numeric)), 0.0).label('total_spent'),
-        cast(Team.initial_purse, Numeric).label('initial_purse')
-    ).outerjoin(
-        Player, Team.id == Player.team_id
-    ).group_by(
-        Team.id, Team.name, Team.initial_purse
-    ).all()
-    
-    teams_data = [{
-        "team_id": t.id,
-        "team_name": t.name,
-        "players_bought": int(t.players_bought),
-        "total_spent": float(t.total_spent),
-        "remaining_purse": float(t.initial_purse) - float(t.total_spent),
-        "purse_utilization": (float(t.total_spent) / float(t.initial_purse)) * 100 if float(t.initial_purse) > 0 else 0
-    } for t in team_stats]
-    
-    # Get role-wise spending and player counts for sold players
-    role_stats = db.query(
-        Player.role,
-        func.count(Player.id).label('players_sold'),
-        func.coalesce(func.sum(cast(Player.sold_price, Numeric)), 0.0).label('total_spent'),
-        func.coalesce(func.avg(cast(Player.sold_price, Numeric)), 0.0).label('avg_price'),
-        func.coalesce(func.max(cast(Player.sold_price, Numeric)), 0.0).label('highest_price'),
-        func.coalesce(func.min(cast(Player.sold_price, Numeric)), 0.0).label('lowest_price')
-    ).filter(
-        Player.team_id.isnot(None)
-    ).group_by(
-        Player.role
-    ).all()
-    
-    roles_data = [{
-        "role": r.role,
-        "players_sold": int(r.players_sold),
-        "total_spent": float(r.total_spent),
-        "avg_price": float(r.avg_price),
-        "highest_price": float(r.highest_price),
-        "lowest_price": float(r.lowest_price)
-    } for r in role_stats]
-    
-    # Get players available by role
-    available_players = db.query(
-        Player.role,
-        func.count(Player.id).label('count')
-    ).filter(
-        Player.team_id.is_(None)
-    ).group_by(
-        Player.role
-    ).all()
-    
-    players_by_role = {str(role): int(count) for role, count in available_players}
     
+    Served from an in-process accumulator kept current by auction events;
+    pass refresh=true to reload it from the database first.
+    """
+    if refresh or not accumulator.seeded:
+        accumulator.seed(db)
+    return accumulator.snapshot()
+
+@router.get("/ledger", response_model=List[AuctionEventResponse])
+def get_ledger(
+    after_id: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    player_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List auction events in the order they happened.
+    Parameters:
+    - after_id: Only return events after this id (for paging)
+    - limit: Maximum number of events to return
+    - player_id: Only return events for this player
+    """
+    query = db.query(AuctionEvent).filter(AuctionEvent.id > after_id)
+    if player_id is not None:
+        query = query.filter(AuctionEvent.player_id == player_id)
+    return query.order_by(AuctionEvent.id).limit(limit).all()
+
+def _ledger_state_or_404(db: Session, as_of: int) -> Dict[str, Any]:
+    if as_of > ledger.last_event_id(db):
+        raise HTTPException(status_code=404, detail="Event not found")
+    rebuilt = ledger.state_as_of(db, as_of)
+    if rebuilt is None:
+        raise HTTPException(status_code=404, detail="No snapshot at or before this event")
+    return rebuilt
+
+@router.get("/ledger/state", response_model=LedgerState)
+def get_ledger_state(
+    as_of: int = Query(..., ge=0, description="Event id to rebuild the auction state at"),
+    db: Session = Depends(get_db)
+):
+    """
+    Rebuild player ownership and team squads as they were right after an event,
+    from the nearest snapshot plus the events after it.
+    """
+    rebuilt = _ledger_state_or_404(db, as_of)
+    state = rebuilt["state"]
     return {
-        "total_players_sold": total_players_sold,
-        "total_money_spent": total_spent,
-        "average_price": avg_price,
-        "highest_purchase": highest_purchase,
-        "lowest_purchase": lowest_purchase,
-        "available_players": players_by_role,
-        "team_stats": teams_data,
-        "role_stats": roles_data
-    } 
\ No newline at end of file
+        "event_id": rebuilt["event_id"],
+        "snapshot_event_id": rebuilt["snapshot_event_id"],
+        "replayed_events": rebuilt["replayed_events"],
+        "sold_players": [
+            {"player_id": player_id, "team_id": team_id, "sold_price": sold_price}
+            for player_id, (team_id, sold_price) in sorted(state.items())
+        ],
+        "teams": ledger.summarize_teams(db, state)
+    }
+
+@router.post("/ledger/restore", response_model=LedgerRestoreResult)
+def restore_ledger_state(
+    as_of: int = Query(..., ge=0, description="Event id whose state should be restored"),
+    db: Session = Depends(get_db)
+):
+    """
+    Roll player ownership back (or forward) to the state right after an event,
+    e.g. to undo a bad reset. Nothing is deleted: each changed player gets a
+    restore event appended to the ledger. Returns 409 if the restored squads
+    would exceed a squad size or purse limit.
+    """
+    begin_immediate(db)
+    rebuilt = _ledger_state_or_404(db, as_of)
+    # Squads and purses may have changed since; never restore past the limits
+    violations = ledger.limit_violations(db, rebuilt["state"])
+    if violations:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Restoring event {as_of} would break team limits: {'; '.join(violations)}"
+        )
+    changes = ledger.restore(db, rebuilt["state"])
+    last_event_id = ledger.last_event_id(db)
+    db.commit()
+    
+    for player, previous in changes:
+        publish_player_event("restore", model_to_dict(player), previous)
+    
+    return {"restored_to": as_of, "players_changed": len(changes), "last_event_id": last_event_id}
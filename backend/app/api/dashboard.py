@@ -1,12 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, distinct
-from typing import List
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 
 from ..db.database import get_db
-from ..models import Team, Player, PlayerScore, Match
+from ..models import Team, Player, PlayerAggregate, PlayerScore, Match
+from ..services import leaderboard as leaderboard_service
+from ..services.cache import scorecard_cache
+from ..services.distribution import role_distribution
+from ..services.form import form_tracker
+from ..services.live_scoring import live_scoring
+from ..services.points_series import points_series
 from ..schemas.dashboard import (
+    CacheStats,
+    LeaderboardMovement,
+    PlayerForm,
+    PlayerRoleStanding,
+    RoleScoreDistribution,
+    PointsSeries,
     TeamLeaderboard,
     TopPlayer,
     PlayerStats
@@ -14,8 +26,25 @@ from ..schemas.dashboard import (
 
 router = APIRouter()
 
+def _parse_ids(player_ids: str) -> List[int]:
+    """Parse a comma-separated player_ids query parameter."""
+    try:
+        return [int(player_id) for player_id in player_ids.split(",") if player_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="player_ids must be comma-separated integers")
+
+def _with_averages(leaderboard):
+    return [
+        {
+            **entry,
+            "average_points_per_match": entry["total_points"] / entry["matches_played"] if entry["matches_played"] > 0 else 0
+        }
+        for entry in leaderboard
+    ]
+
 @router.get("/leaderboard", response_model=List[TeamLeaderboard])
 def get_team_leaderboard(
+    as_of_match: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -24,38 +53,117 @@ def get_team_leaderboard(
     1. Total points (desc)
     2. Number of matches played (asc) - to account for teams with fewer matches
     3. Team name (asc) - for consistent ordering
+    
+    Served from a cache that score, auction and player writes invalidate
+    (see services/leaderboard.py). Includes live points of in-progress
+    matches that have not been flushed yet.
+    
+    Parameters:
+    - as_of_match: Standings after this match number, counting only scores of
+      matches up to it (with the current squads, without live points)
     """
-    # Subquery to get total points and matches played for each team
-    team_stats = (
-        db.query(
-            Team.id,
-            Team.name,
-            Team.owner_name,
-            func.count(func.distinct(PlayerScore.match_id)).label('matches_played'),
-            func.sum(PlayerScore.points).label('total_points')
-        )
-        .join(Team.players)
-        .join(Player.scores)
-        .group_by(Team.id)
-        .order_by(
-            desc('total_points'),
-            'matches_played',
-            Team.name
-        )
-        .all()
-    )
+    if as_of_match is not None:
+        if as_of_match < 1:
+            raise HTTPException(status_code=400, detail="as_of_match must be a positive match number")
+        return _with_averages(points_series.standings(db, as_of_match))
     
-    return [
-        {
-            "team_id": stats.id,
-            "team_name": stats.name,
-            "owner_name": stats.owner_name,
-            "matches_played": stats.matches_played,
-            "total_points": float(stats.total_points or 0),
-            "average_points_per_match": float(stats.total_points or 0) / stats.matches_played if stats.matches_played > 0 else 0
-        }
-        for stats in team_stats
-    ]
+    leaderboard = leaderboard_service.get_leaderboard(db)
+    
+    # Add live points scored since the last flush of in-progress matches
+    live_points = live_scoring.unflushed_team_points()
+    if live_points:
+        listed = {entry["team_id"]: entry for entry in leaderboard}
+        missing = [team_id for team_id in live_points if team_id not in listed]
+        if missing:
+            for team in db.query(Team).filter(Team.id.in_(missing)).all():
+                listed[team.id] = {
+                    "team_id": team.id,
+                    "team_name": team.name,
+                    "owner_name": team.owner_name,
+                    "matches_played": 0,
+                    "total_points": 0.0
+                }
+        for team_id, points in live_points.items():
+            if team_id in listed:
+                listed[team_id]["total_points"] += points
+        leaderboard = sorted(listed.values(), key=leaderboard_service.sort_key)
+    
+    return _with_averages(leaderboard)
+
+@router.get("/leaderboard/movement", response_model=LeaderboardMovement)
+def get_leaderboard_movement(
+    from_match: int,
+    to_match: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Compare the standings after two match numbers.
+    Returns every team ranked after to_match (or after from_match only) with
+    its rank and points at both points in time. movement is positive when the
+    team climbed; it is null for teams unranked after either match.
+    """
+    if from_match < 1 or to_match < 1:
+        raise HTTPException(status_code=400, detail="Match numbers must be positive")
+    before = points_series.standings(db, from_match)
+    after = points_series.standings(db, to_match)
+    ranks_before = {entry["team_id"]: (rank, entry) for rank, entry in enumerate(before, start=1)}
+    ranks_after = {entry["team_id"]: (rank, entry) for rank, entry in enumerate(after, start=1)}
+    
+    teams = []
+    for entry in after + [entry for entry in before if entry["team_id"] not in ranks_after]:
+        rank_before, entry_before = ranks_before.get(entry["team_id"], (None, None))
+        rank_after, entry_after = ranks_after.get(entry["team_id"], (None, None))
+        points_before = entry_before["total_points"] if entry_before else 0.0
+        points_after = entry_after["total_points"] if entry_after else 0.0
+        teams.append({
+            "team_id": entry["team_id"],
+            "team_name": entry["team_name"],
+            "owner_name": entry["owner_name"],
+            "rank_before": rank_before,
+            "rank_after": rank_after,
+            "movement": rank_before - rank_after if rank_before and rank_after else None,
+            "points_before": points_before,
+            "points_after": points_after,
+            "points_gained": points_after - points_before
+        })
+    
+    return {"from_match": from_match, "to_match": to_match, "teams": teams}
+
+@router.get("/cache-stats", response_model=List[CacheStats])
+def get_cache_stats():
+    """
+    Hit/miss counters of the in-process response caches (leaderboard and
+    match scorecards) of this worker.
+    """
+    return [leaderboard_service.leaderboard_cache.stats(), scorecard_cache.stats()]
+
+@router.get("/series/teams", response_model=PointsSeries)
+def get_team_points_series(
+    db: Session = Depends(get_db)
+):
+    """
+    Cumulative points of every team after each match, in match number order,
+    for race charts. Teams are credited with the scores of their current
+    squads, as on the leaderboard; unflushed live points are not included.
+    """
+    return points_series.team_series(db)
+
+@router.get("/series/players", response_model=PointsSeries)
+def get_player_points_series(
+    player_ids: Optional[str] = None,
+    team_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Cumulative points of players after each match, in match number order.
+    
+    Parameters:
+    - player_ids: Comma-separated player IDs
+    - team_id: Players currently in this fantasy team
+    Without either, every player who has scored is returned.
+    """
+    ids = _parse_ids(player_ids) if player_ids else None
+    return points_series.player_series(db, ids, team_id)
 
 @router.get("/top-players", response_model=List[TopPlayer])
 def get_top_players(
@@ -66,6 +174,7 @@ def get_top_players(
 ):
     """
     Get top performing players based on average points per match.
+    Read from player_aggregates through its (role, average_points) index.
     
     Parameters:
     - limit: Number of players to return
@@ -79,21 +188,21 @@ def get_top_players(
             Player.role,
             Player.ipl_team,
             Team.name.label('fantasy_team'),
-            func.count(func.distinct(PlayerScore.match_id)).label('matches_played'),
-            func.sum(PlayerScore.points).label('total_points'),
-            (func.sum(PlayerScore.points) / func.count(func.distinct(PlayerScore.match_id))).label('avg_points')
+            PlayerAggregate.matches_played,
+            PlayerAggregate.total_points,
+            PlayerAggregate.average_points.label('avg_points')
         )
-        .outerjoin(Team)
-        .join(PlayerScore)
-        .group_by(Player.id)
-        .having(func.count(func.distinct(PlayerScore.match_id)) >= min_matches)
+        .select_from(PlayerAggregate)
+        .join(Player, Player.id == PlayerAggregate.player_id)
+        .outerjoin(Team, Team.id == Player.team_id)
+        .filter(PlayerAggregate.matches_played >= min_matches)
     )
     
     if role:
-        query = query.filter(Player.role == role)
+        query = query.filter(PlayerAggregate.role == role)
     
     players = (
-        query.order_by(desc('avg_points'))
+        query.order_by(desc(PlayerAggregate.average_points))
         .limit(limit)
         .all()
     )
@@ -112,75 +221,216 @@ def get_top_players(
         for p in players
     ]
 
-@router.get("/player-stats/{player_id}", response_model=PlayerStats)
-def get_player_stats(
-    player_id: int,
+@router.get("/distribution/roles", response_model=List[RoleScoreDistribution])
+def get_role_distributions(
+    bins: int = 10,
     db: Session = Depends(get_db)
 ):
     """
-    Get comprehensive statistics for a specific player.
+    Distribution of individual scores for each player role: count, mean,
+    standard deviation, percentiles and a histogram. All roles share the
+    same bin edges. Served from an in-memory copy of the scores that is
+    rebuilt after score writes.
+    
+    Parameters:
+    - bins: Number of histogram bins (1-100)
     """
-    # Get player base info
-    player = db.query(Player).filter(Player.id == player_id).first()
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
+    if not 1 <= bins <= 100:
+        raise HTTPException(status_code=400, detail="bins must be between 1 and 100")
+    return role_distribution.snapshot(db).roles_summary(bins)
+
+@router.get("/distribution/players", response_model=List[PlayerRoleStanding])
+def get_player_role_standings(
+    player_ids: Optional[str] = None,
+    role: str | None = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Where players' average points sit within their role: percentile rank and
+    z-score among the players of the same role. Sorted by percentile (desc).
+    
+    Parameters:
+    - player_ids: Comma-separated player IDs (all players with scores if omitted)
+    - role: Filter by player role (BAT/BOWL/AR/WK)
+    """
+    ids = _parse_ids(player_ids) if player_ids else None
+    standings = role_distribution.snapshot(db).player_standings(ids, role)
+    return sorted(standings, key=lambda standing: (-standing["percentile"], standing["player_id"]))
+
+FORM_SORT_FIELDS = Literal[
+    "form_3", "form_5", "form_10", "season_average", "std_dev",
+    "best_streak", "worst_streak", "matches_played"
+]
+
+@router.get("/form", response_model=List[PlayerForm])
+def get_player_form(
+    sort_by: FORM_SORT_FIELDS = "form_5",
+    ascending: bool = False,
+    limit: int = 20,
+    role: str | None = None,
+    min_matches: int = 1,
+    db: Session = Depends(get_db)
+):
+    """
+    Get recent form of players: last 3/5/10 match averages, standard deviation
+    and best/worst streaks relative to their own average.
+    Metrics are precomputed and refreshed only for players whose scores change.
+    
+    Parameters:
+    - sort_by: Metric to sort by (form_5 by default)
+    - ascending: Sort ascending instead of descending
+    - limit: Number of players to return
+    - role: Filter by player role (BAT/BOWL/AR/WK)
+    - min_matches: Minimum matches played to be considered
+    """
+    metrics = form_tracker.metrics(db)
+    candidates = [
+        player_id for player_id, player_metrics in metrics.items()
+        if player_metrics["matches_played"] >= min_matches
+    ]
+    if not candidates:
+        return []
+    
+    query = (
+        db.query(
+            Player.id,
+            Player.name,
+            Player.role,
+            Player.ipl_team,
+            Team.name.label('fantasy_team')
+        )
+        .outerjoin(Team, Team.id == Player.team_id)
+        .filter(Player.id.in_(candidates))
+    )
+    if role:
+        query = query.filter(Player.role == role)
+    players = query.all()
     
-    # Get match statistics
-    match_stats = (
+    players.sort(key=lambda p: p.id)
+    players.sort(key=lambda p: metrics[p.id][sort_by], reverse=not ascending)
+    return [
+        {
+            "player_id": p.id,
+            "name": p.name,
+            "role": p.role,
+            "ipl_team": p.ipl_team,
+            "fantasy_team": p.fantasy_team,
+            **metrics[p.id]
+        }
+        for p in players[:limit]
+    ]
+
+# Recent performances listed per player
+RECENT_MATCHES = 5
+
+def _player_stats(db: Session, player_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    PlayerStats of the given players keyed by id (unknown ids are left out),
+    with two queries whatever the number of players: players joined to their
+    summary rows, and the last RECENT_MATCHES scores per player ranked with
+    ROW_NUMBER over match_date.
+    """
+    players = (
         db.query(
-            func.count(func.distinct(PlayerScore.match_id)).label('total_matches'),
-            func.sum(PlayerScore.points).label('total_points'),
-            func.avg(PlayerScore.points).label('avg_points'),
-            func.max(PlayerScore.points).label('highest_score'),
-            func.min(PlayerScore.points).label('lowest_score')
+            Player.id,
+            Player.name,
+            Player.role,
+            Player.ipl_team,
+            Player.base_price,
+            Player.sold_price,
+            Team.name.label('fantasy_team'),
+            PlayerAggregate.matches_played,
+            PlayerAggregate.score_count,
+            PlayerAggregate.total_points,
+            PlayerAggregate.highest_score,
+            PlayerAggregate.lowest_score
         )
-        .filter(PlayerScore.player_id == player_id)
-        .first()
+        .outerjoin(Team, Team.id == Player.team_id)
+        .outerjoin(PlayerAggregate, PlayerAggregate.player_id == Player.id)
+        .filter(Player.id.in_(player_ids))
+        .all()
     )
     
-    # Get recent performances
-    recent_matches = (
+    ranked = (
         db.query(
+            PlayerScore.player_id,
             Match.match_number,
             Match.team1,
             Match.team2,
             Match.match_date,
-            PlayerScore.points
+            PlayerScore.points,
+            func.row_number().over(
+                partition_by=PlayerScore.player_id,
+                order_by=(desc(Match.match_date), desc(Match.match_number))
+            ).label('recency')
         )
-        .join(PlayerScore)
-        .filter(PlayerScore.player_id == player_id)
-        .order_by(desc(Match.match_date))
-        .limit(5)
-        .all()
+        .join(Match, Match.id == PlayerScore.match_id)
+        .filter(PlayerScore.player_id.in_(player_ids))
+        .subquery()
     )
+    recent: Dict[int, List[Dict[str, Any]]] = {}
+    for match in db.query(ranked).filter(ranked.c.recency <= RECENT_MATCHES).order_by(
+        ranked.c.player_id, ranked.c.recency
+    ).all():
+        recent.setdefault(match.player_id, []).append({
+            "match_number": match.match_number,
+            "teams": f"{match.team1} vs {match.team2}",
+            "date": match.match_date,
+            "points": float(match.points)
+        })
+    
+    stats = {}
+    for player in players:
+        # Players without scores have no summary row
+        total_points = float(player.total_points or 0)
+        stats[player.id] = {
+            "player_id": player.id,
+            "name": player.name,
+            "role": player.role,
+            "ipl_team": player.ipl_team,
+            "fantasy_team": player.fantasy_team,
+            "base_price": player.base_price,
+            "sold_price": player.sold_price,
+            "matches_played": player.matches_played or 0,
+            "total_points": total_points,
+            # Mean per score row, as avg(points) would give
+            "average_points": total_points / player.score_count if player.score_count else 0.0,
+            "highest_score": float(player.highest_score or 0),
+            "lowest_score": float(player.lowest_score or 0),
+            "recent_performances": recent.get(player.id, [])
+        }
+    return stats
+
+@router.get("/player-stats", response_model=List[PlayerStats])
+def get_players_stats(
+    player_ids: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get comprehensive statistics for several players at once, e.g. a squad.
+    Runs the same two queries however many players are requested.
     
-    # Handle case where match_stats might be None
-    total_matches = getattr(match_stats, 'total_matches', 0)
-    total_points = float(getattr(match_stats, 'total_points', 0) or 0)
-    avg_points = float(getattr(match_stats, 'avg_points', 0) or 0)
-    highest_score = float(getattr(match_stats, 'highest_score', 0) or 0)
-    lowest_score = float(getattr(match_stats, 'lowest_score', 0) or 0)
-    
-    return {
-        "player_id": player.id,
-        "name": player.name,
-        "role": player.role,
-        "ipl_team": player.ipl_team,
-        "fantasy_team": player.team.name if player.team else None,
-        "base_price": player.base_price,
-        "sold_price": player.sold_price,
-        "matches_played": total_matches,
-        "total_points": total_points,
-        "average_points": avg_points,
-        "highest_score": highest_score,
-        "lowest_score": lowest_score,
-        "recent_performances": [
-            {
-                "match_number": match.match_number,
-                "teams": f"{match.team1} vs {match.team2}",
-                "date": match.match_date,
-                "points": float(match.points)
-            }
-            for match in recent_matches
-        ]
-    } 
\ No newline at end of file
+    Parameters:
+    - player_ids: Comma-separated player IDs; results follow this order
+    """
+    ids = _parse_ids(player_ids)
+    if not ids:
+        raise HTTPException(status_code=400, detail="At least one player ID must be provided")
+    ids = list(dict.fromkeys(ids))
+    stats = _player_stats(db, ids)
+    if len(stats) != len(ids):
+        raise HTTPException(status_code=404, detail="One or more players not found")
+    return [stats[player_id] for player_id in ids]
+
+@router.get("/player-stats/{player_id}", response_model=PlayerStats)
+def get_player_stats(
+    player_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get comprehensive statistics for a specific player.
+    """
+    stats = _player_stats(db, [player_id])
+    if player_id not in stats:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return stats[player_id]
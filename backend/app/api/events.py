@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, Any
+import asyncio
+import json
+
+from ..services.events import broker
+
+router = APIRouter()
+
+# Send a comment line this often so proxies keep idle streams open
+KEEPALIVE_SECONDS = 15
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    payload = json.dumps(jsonable_encoder(event))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    types: Optional[str] = None
+):
+    """
+    Stream auction events to the client as Server-Sent Events.
+    Events are published once the change has been committed:
+    - purchase, reset, player_update, player_create, restore: data has the player row and
+      its previous ownership state
+    - team_create, team_update: data has the team row
+    - scores_recorded: data has the match_id and the scored player_ids
+    - match_create, match_update: data has the match_id and the match row
+    - matches_imported: data has the match_ids of the fixtures created by one imported chunk
+    - scores_recomputed: data has the match_ids whose points changed
+    - scores_flushed: data has the match_id and the player_ids whose live scores were written
+    - scores_imported: data has the match_ids and player_ids of one imported chunk of scores
+    - score_correction: data has the match_id, player_ids and per-player corrections
+      (previous_points, new_points, delta)
+    
+    Parameters:
+    - types: Comma-separated event types to receive (all types if omitted)
+    
+    Each client has a bounded buffer. A client that falls too far behind loses its
+    oldest events and receives a `resync` event telling it to refetch state.
+    """
+    event_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    subscription = broker.subscribe(event_types)
+    
+    async def event_source():
+        dropped_reported = 0
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscription.dropped > dropped_reported:
+                    missed = subscription.dropped - dropped_reported
+                    dropped_reported = subscription.dropped
+                    yield f"event: resync\ndata: {json.dumps({'missed_events': missed})}\n\n"
+                yield _format_sse(event)
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
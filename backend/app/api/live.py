@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..db.database import get_db
+from ..services.live_scoring import live_scoring, LiveMatchError
+from ..schemas.scores import PointsRules
+from ..schemas.live import (
+    DeliveryBatch,
+    DeliveryIngestResult,
+    LiveMatchState
+)
+
+router = APIRouter()
+
+@router.post("/matches/{match_id}/deliveries", response_model=DeliveryIngestResult)
+def ingest_deliveries(
+    match_id: int,
+    batch: DeliveryBatch,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply ball-by-ball deliveries to an in-progress match.
+    Running stats and fantasy points (default rules) are updated in memory and
+    flushed to the match's player scores every few seconds, so team totals and
+    the leaderboard move as deliveries arrive.
+    Validates:
+    - Match exists and is not completed
+    - All batters, bowlers and fielders exist
+    Deliveries whose sequence was already applied are ignored, so a scorer can
+    safely resend a batch.
+    """
+    try:
+        return live_scoring.ingest(
+            db,
+            match_id,
+            [delivery.model_dump(mode="json") for delivery in batch.deliveries],
+            PointsRules().model_dump()
+        )
+    except LiveMatchError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.get("/matches/{match_id}", response_model=LiveMatchState)
+def get_live_match(match_id: int):
+    """
+    Get the running scorecard and fantasy team totals of a match being scored live.
+    """
+    live = live_scoring.get(match_id)
+    if live is None:
+        raise HTTPException(status_code=404, detail="Match is not being scored live")
+    return live_scoring.state(live)
+
+@router.post("/matches/{match_id}/flush", response_model=LiveMatchState)
+def flush_live_match(
+    match_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Write the running scores of a live match to the database now.
+    """
+    live = live_scoring.flush(db, match_id)
+    if live is None:
+        raise HTTPException(status_code=404, detail="Match is not being scored live")
+    return live_scoring.state(live)
+
+@router.post("/matches/{match_id}/complete", response_model=LiveMatchState)
+def complete_live_match(
+    match_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Flush the final scores of a live match and mark it completed.
+    """
+    try:
+        live = live_scoring.complete(db, match_id)
+    except LiveMatchError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return live_scoring.state(live)
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import date
+import io
+import tempfile
 
 from ..db.database import get_db
 from ..models import Match
-from ..schemas.matches import MatchCreate, MatchResponse, MatchUpdate
+from ..services.events import broker, model_to_dict
+from ..services import season_import
+from ..schemas.matches import MatchCreate, MatchResponse, MatchUpdate, SeasonImportResult
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
 
 router = APIRouter()
 
@@ -86,6 +94,7 @@ def update_match(
     db.query(Match).filter(Match.id == match_id).update(update_data)
     db.commit()
     db.refresh(db_match)
+    broker.publish("match_update", {"match_id": match_id, "match": model_to_dict(db_match)})
     return db_match
 
 @router.post("", response_model=MatchResponse)
@@ -124,5 +133,37 @@ def create_match(
     db.add(db_match)
     db.commit()
     db.refresh(db_match)
+    broker.publish("match_create", {"match_id": db_match.id, "match": model_to_dict(db_match)})
     
-    return db_match 
\ No newline at end of file
+    return db_match 
+
+@router.post("/import", response_model=SeasonImportResult)
+async def import_season(
+    request: Request,
+    format: Literal["jsonl", "csv"] = "jsonl",
+    chunk_size: int = season_import.DEFAULT_CHUNK_SIZE,
+    stop_on_error: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Backfill fixtures and scores from a JSONL or CSV request body.
+    See services/season_import.py for the record format. The body is spooled
+    to disk as it arrives and imported in chunks of chunk_size records, each
+    committed separately; invalid records are reported in errors. A body
+    that is not valid UTF-8 ends the import with stopped set, keeping the
+    chunks committed before the bad bytes.
+    """
+    if not 1 <= chunk_size <= 10000:
+        raise HTTPException(status_code=400, detail="chunk_size must be between 1 and 10000")
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        try:
+            return await run_in_threadpool(
+                season_import.import_stream, db, stream, format, chunk_size, stop_on_error
+            )
+        finally:
+            stream.detach()
@@ -3,9 +3,15 @@ from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy import update, func, and_, or_
+import base64
+import json
 
-from ..db.database import get_db
+from ..core.config import MAX_SQUAD_SIZE
+from ..db.database import get_db, begin_immediate
 from ..models import Player, Team
+from ..services import ledger, player_aggregates, team_budget
+from ..services.events import publish_player_event, player_state, model_to_dict
+from ..services.player_search import search_player_ids
 from ..schemas.player import (
     PlayerCreate, 
     PlayerUpdate, 
@@ -17,6 +23,68 @@ from ..schemas.player import (
 
 router = APIRouter()
 
+def _player_with_team_query(db: Session):
+    """
+    Select every player column alongside the owning team's name and owner.
+    Unsold players come back with NULL team details via the outer join.
+    """
+    return db.query(
+        *Player.__table__.columns,
+        Team.name.label('team_name'),
+        Team.owner_name.label('team_owner')
+    ).outerjoin(Team, Player.team_id == Team.id)
+
+def _serialize_player_row(row) -> Dict[str, Any]:
+    """
+    Build a PlayerWithTeam payload directly from a joined result row.
+    """
+    player_dict = dict(row._mapping)
+    player_dict['is_sold'] = player_dict['team_id'] is not None
+    return player_dict
+
+# Columns that cursor pagination can sort by (ties are broken by player id)
+KEYSET_SORT_FIELDS = ("name", "base_price", "sold_price")
+
+def _encode_cursor(sort_by: Optional[str], sort_desc: bool, row) -> str:
+    """
+    Encode the sort key and id of the last row on a page into an opaque cursor.
+    """
+    value = row._mapping[sort_by] if sort_by else None
+    payload = json.dumps([sort_by, sort_desc, value, row.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def _decode_cursor(cursor: str, sort_by: Optional[str], sort_desc: bool):
+    """
+    Decode a cursor into (sort value, last id), checking it was issued for the
+    same ordering as the current request.
+    """
+    try:
+        cursor_sort_by, cursor_sort_desc, value, last_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        last_id = int(last_id)
+        if not isinstance(value, (str, int, float, type(None))):
+            raise ValueError("sort value must be a scalar")
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort_by != sort_by or cursor_sort_desc != sort_desc:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort order")
+    return value, last_id
+
+def _keyset_filter(column, value, last_id: int, sort_desc: bool):
+    """
+    Build the WHERE clause selecting rows after (value, last_id) when ordering by
+    (column, id), both ascending or both descending.
+    SQLite sorts NULLs first in ascending order and last in descending order.
+    """
+    if not sort_desc:
+        if value is None:
+            return or_(and_(column.is_(None), Player.id > last_id), column.isnot(None))
+        return or_(column > value, and_(column == value, Player.id > last_id))
+    if value is None:
+        return and_(column.is_(None), Player.id < last_id)
+    return or_(column < value, and_(column == value, Player.id < last_id), column.is_(None))
+
 @router.get("/", response_model=PaginatedPlayerResponse)
 def get_players(
     skip: int = 0,
@@ -28,6 +96,9 @@ def get_players(
     max_price: Optional[float] = None,
     sort_by: Optional[str] = None,  # name, base_price, sold_price
     sort_desc: bool = False,
+    use_cursor: bool = False,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -41,9 +112,14 @@ def get_players(
     - max_price: Filter by maximum base price
     - sort_by: Sort by field (name, base_price, sold_price)
     - sort_desc: Sort in descending order if True
+    - use_cursor: Page with a keyset cursor instead of skip (implied when cursor is given)
+    - cursor: The next_cursor returned by the previous page
+    - include_total: Count all matching players; defaults to true except on pages requested
+      with a cursor, which only need the total from the first page
     """
-    # Base query for filtering
-    base_query = db.query(Player)
+    # Base query for filtering, joined with the owning team so that team details
+    # come back in the same round-trip
+    base_query = _player_with_team_query(db)
     
     # Apply filters
     if role:
@@ -61,7 +137,12 @@ def get_players(
         base_query = base_query.filter(Player.base_price <= max_price)
     
     # Count total matching records for pagination
-    total_count = base_query.count()
+    if include_total is None:
+        include_total = cursor is None
+    total_count = base_query.count() if include_total else None
+    
+    if use_cursor or cursor is not None:
+        return _get_players_page_by_cursor(base_query, limit, sort_by, sort_desc, cursor, total_count)
     
     # Apply sorting
     query = base_query
@@ -71,35 +152,79 @@ def get_players(
             query = query.order_by(sort_column.desc() if sort_desc else sort_column.asc())
     
     # Apply pagination
-    players = query.offset(skip).limit(limit).all()
-    
-    # Enhance player data with team information
-    result = []
-    for player in players:
-        # Convert SQLAlchemy model to dict first
-        player_dict = {
-            column.name: getattr(player, column.name)
-            for column in Player.__table__.columns
-        }
-        # Add is_sold field
-        player_dict['is_sold'] = player.team_id is not None
-        
-        player_data = PlayerWithTeam.model_validate(player_dict)
-        
-        if player.team_id is not None:
-            team = db.query(Team).filter(Team.id == player.team_id).first()
-            if team:
-                player_data.team_name = str(team.name)
-                player_data.team_owner = str(team.owner_name)
-        result.append(player_data)
+    rows = query.offset(skip).limit(limit).all()
     
     # Return paginated response
-    return PaginatedPlayerResponse(
-        items=result,
-        total=total_count,
-        skip=skip,
-        limit=limit
-    )
+    return {
+        "items": [_serialize_player_row(row) for row in rows],
+        "total": total_count,
+        "skip": skip,
+        "limit": limit
+    }
+
+def _get_players_page_by_cursor(
+    base_query,
+    limit: int,
+    sort_by: Optional[str],
+    sort_desc: bool,
+    cursor: Optional[str],
+    total_count: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Fetch one page ordered by (sort_by, id), starting after the cursor position.
+    Each page costs O(limit) regardless of how deep into the catalogue it is.
+    """
+    if sort_by is not None and sort_by not in KEYSET_SORT_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cursor pagination supports sort_by: {', '.join(KEYSET_SORT_FIELDS)}"
+        )
+    
+    sort_column = getattr(Player, sort_by) if sort_by else None
+    query = base_query
+    if cursor is not None:
+        value, last_id = _decode_cursor(cursor, sort_by, sort_desc)
+        if sort_column is not None:
+            query = query.filter(_keyset_filter(sort_column, value, last_id, sort_desc))
+        else:
+            query = query.filter(Player.id < last_id if sort_desc else Player.id > last_id)
+    
+    order_columns = ([sort_column] if sort_column is not None else []) + [Player.id]
+    query = query.order_by(*[c.desc() if sort_desc else c.asc() for c in order_columns])
+    
+    # Fetch one extra row to find out whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(sort_by, sort_desc, rows[-1])
+    
+    return {
+        "items": [_serialize_player_row(row) for row in rows],
+        "total": total_count,
+        "skip": 0,
+        "limit": limit,
+        "next_cursor": next_cursor
+    }
+
+@router.get("/search", response_model=List[PlayerWithTeam])
+def search_players(
+    q: str = Query(..., min_length=1, description="Name or partial name to search for"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Search players by name for autocomplete.
+    Matches name prefixes and substrings first, then falls back to
+    typo-tolerant matches when there is room left in the result.
+    """
+    player_ids = search_player_ids(db, q, limit)
+    if not player_ids:
+        return []
+    
+    rows = _player_with_team_query(db).filter(Player.id.in_(player_ids)).all()
+    rows_by_id = {row.id: row for row in rows}
+    return [_serialize_player_row(rows_by_id[player_id]) for player_id in player_ids if player_id in rows_by_id]
 
 @router.post("/", response_model=PlayerSchema)
 def create_player(
@@ -113,6 +238,7 @@ def create_player(
     db.add(db_player)
     db.commit()
     db.refresh(db_player)
+    publish_player_event("player_create", model_to_dict(db_player))
     return db_player
 
 @router.get("/{player_id}", response_model=PlayerWithTeam)
@@ -123,27 +249,11 @@ def get_player(
     """
     Get detailed information about a specific player.
     """
-    player = db.query(Player).filter(Player.id == player_id).first()
-    if not player:
+    row = _player_with_team_query(db).filter(Player.id == player_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    # Convert SQLAlchemy model to dict first
-    player_dict = {
-        column.name: getattr(player, column.name)
-        for column in Player.__table__.columns
-    }
-    # Add is_sold field
-    player_dict['is_sold'] = player.team_id is not None
-    
-    player_data = PlayerWithTeam.model_validate(player_dict)
-    
-    if player.team_id is not None:
-        team = db.query(Team).filter(Team.id == player.team_id).first()
-        if team:
-            player_data.team_name = str(team.name)
-            player_data.team_owner = str(team.owner_name)
-    
-    return player_data
+    return _serialize_player_row(row)
 
 @router.put("/{player_id}", response_model=PlayerSchema)
 def update_player(
@@ -154,6 +264,8 @@ def update_player(
     """
     Update a player's information.
     """
+    begin_immediate(db)
+    
     db_player = db.query(Player).filter(Player.id == player_id).first()
     if not db_player:
         raise HTTPException(status_code=404, detail="Player not found")
@@ -167,28 +279,25 @@ def update_player(
         if 'sold_price' not in update_data or update_data['sold_price'] is None:
             raise HTTPException(status_code=400, detail="sold_price is required when assigning a player to a team")
         
-        # Get the team and verify sufficient purse
-        team = db.query(Team).filter(Team.id == update_data['team_id']).first()
-        if not team:
+        # Get the team budget and verify sufficient purse
+        budget = team_budget.get_budget(db, update_data['team_id'])
+        if budget is None:
             raise HTTPException(status_code=404, detail="Team not found")
         
         # Check team size limit
-        team_players = db.query(Player).filter(Player.team_id == team.id).all()
-        if len(team_players) >= 16:
-            raise HTTPException(status_code=400, detail="Team has reached maximum size of 16 players")
-        
-        # Calculate total spent by the team
-        total_spent = sum(float(getattr(p, 'sold_price', 0) or 0) for p in team_players)
+        if budget["player_count"] >= MAX_SQUAD_SIZE:
+            raise HTTPException(status_code=400, detail=f"Team has reached maximum size of {MAX_SQUAD_SIZE} players")
         
-        # Calculate remaining purse
-        remaining_purse = team.initial_purse - total_spent
-        if remaining_purse < update_data['sold_price']:
+        if budget["remaining_purse"] < update_data['sold_price']:
             raise HTTPException(status_code=400, detail="Team does not have sufficient purse")
     
-    # If player is being removed from a team
-    elif 'team_id' in update_data and update_data['team_id'] is None and db_player.team_id is not None:
-        # No need to update team's purse since we calculate it dynamically
-        pass
+    # Ownership state before and after the update, for the budget summary
+    previous_state = player_state(db_player)
+    previous = (db_player.team_id, db_player.sold_price, db_player.role)
+    current = tuple(
+        update_data.get(field, value)
+        for field, value in zip(('team_id', 'sold_price', 'role'), previous)
+    )
     
     # Update the player
     player_stmt = (
@@ -197,8 +306,19 @@ def update_player(
         .values(**update_data, updated_at=datetime.utcnow())
     )
     db.execute(player_stmt)
+    
+    if current != previous:
+        if previous[0] is not None:
+            team_budget.remove_player(db, *previous)
+        if current[0] is not None:
+            team_budget.add_player(db, *current)
+    if current[:2] != previous[:2]:
+        ledger.record(db, "player_update", player_id, current[0], current[1], previous[0], previous[1])
+    if current[2] != previous[2]:
+        player_aggregates.set_role(db, player_id, current[2])
     db.commit()
     
     # Refresh and return the player
     db.refresh(db_player)
+    publish_player_event("player_update", model_to_dict(db_player), previous_state)
     return db_player 
\ No newline at end of file
@@ -1,124 +1,250 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import List, Optional
+from sqlalchemy import func, and_, insert, update
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
+import numpy as np
 
-from ..db.database import get_db
-from ..models import Match, Player, PlayerScore, Team
+from ..db.database import get_db, begin_immediate
+from ..models import Match, Player, PlayerScore, Team, PlayerMatchStats, ScoreCorrection
+from ..services import leaderboard, player_aggregates, points_engine
+from ..services.cache import scorecard_cache
+from ..services.events import broker
+from ..services.live_scoring import live_scoring
 from ..schemas.scores import (
     BatchScoreCreate,
     BatchScoreResponse,
-    PlayerScoreResponse
+    PlayerScoreResponse,
+    PointsRules,
+    RawScorecardCreate,
+    PointsRecomputeRequest,
+    PointsRecomputeResult,
+    ScoreCorrectionRequest,
+    ScoreCorrectionResponse,
+    ScoreCorrectionResult
 )
 
 router = APIRouter()
 
-@router.post("/batch", response_model=BatchScoreResponse)
-def record_match_scores(
-    scores: BatchScoreCreate,
-    db: Session = Depends(get_db)
-):
+def _player_details_query(db: Session):
     """
-    Record scores for multiple players in a match.
-    Validates:
-    - Match exists and is not already completed
-    - All players exist
-    - No duplicate scores for the same player in the match
+    Select the player fields shown next to a score, with the owning fantasy
+    team's name (NULL for unsold players) via an outer join.
+    """
+    return db.query(
+        Player.id,
+        Player.name,
+        Player.ipl_team,
+        Player.role,
+        Team.name.label('team_name')
+    ).outerjoin(
+        Team, Player.team_id == Team.id
+    )
+
+def _score_response(score, player) -> PlayerScoreResponse:
+    """Build a PlayerScoreResponse from a score row and a player details row."""
+    return PlayerScoreResponse(
+        id=int(score.id),
+        player_id=int(score.player_id),
+        match_id=int(score.match_id),
+        points=float(score.points or 0.0),
+        created_at=score.created_at,
+        updated_at=score.updated_at,
+        player_name=str(player.name or ''),
+        player_team=player.team_name,
+        player_ipl_team=str(player.ipl_team or ''),
+        player_role=str(player.role or '')
+    )
+
+def _validate_new_scores(db: Session, match_id: int, player_ids: List[int]) -> Dict[int, Any]:
+    """
+    Check that scores can be recorded for these players in the match and
+    return their details rows keyed by player id.
     """
     # Validate match exists and is not completed
-    match = db.query(Match).filter(Match.id == scores.match_id).first()
+    match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     if bool(match.is_completed):
         raise HTTPException(status_code=400, detail="Cannot add scores for completed match")
+    if live_scoring.owns(match):
+        raise HTTPException(status_code=409, detail="Match is being scored live")
     
-    # Get all players
-    player_ids = [score.player_id for score in scores.scores]
-    players = db.query(Player).filter(Player.id.in_(player_ids)).all()
+    # Get all players with their fantasy team in one joined lookup
+    players = {
+        row.id: row
+        for row in _player_details_query(db).filter(Player.id.in_(player_ids)).all()
+    }
     if len(players) != len(player_ids):
         raise HTTPException(status_code=400, detail="One or more players not found")
     
     # Check for existing scores
-    existing_scores = db.query(PlayerScore).filter(
+    existing_score = db.query(PlayerScore.id).filter(
         and_(
-            PlayerScore.match_id == scores.match_id,
+            PlayerScore.match_id == match_id,
             PlayerScore.player_id.in_(player_ids)
         )
-    ).all()
-    if existing_scores:
+    ).first()
+    if existing_score:
         raise HTTPException(
             status_code=400,
             detail="Scores already exist for some players in this match"
         )
-    
-    # Create scores
-    db_scores = []
-    for score in scores.scores:
-        db_score = PlayerScore(
-            player_id=score.player_id,
-            match_id=scores.match_id,
-            points=score.fantasy_points
-        )
-        db.add(db_score)
-        db_scores.append(db_score)
+    return players
+
+def _record_scores(
+    db: Session,
+    match_id: int,
+    points: List[Tuple[int, float]],
+    players: Dict[int, Any]
+) -> BatchScoreResponse:
+    """
+    Insert validated (player_id, points) scores, mark the match completed,
+    commit and build the batch response.
+    """
+    # Create all scores in one multi-row INSERT, returning the new rows. Ids are
+    # assigned in request order, so sort by id rather than asking for ordered
+    # RETURNING (which SQLite can only do one row at a time)
+    now = datetime.utcnow()
+    db_scores = sorted(db.execute(
+        insert(PlayerScore).returning(*PlayerScore.__table__.columns),
+        [
+            {
+                "player_id": player_id,
+                "match_id": match_id,
+                "points": player_points,
+                "created_at": now,
+                "updated_at": now
+            }
+            for player_id, player_points in points
+        ]
+    ).all(), key=lambda score: score.id)
     
     # Mark match as completed using update
-    db.query(Match).filter(Match.id == scores.match_id).update({"is_completed": True})
+    db.query(Match).filter(Match.id == match_id).update({"is_completed": True})
+    player_aggregates.refresh(db, [player_id for player_id, _ in points])
     
     db.commit()
+    broker.publish("scores_recorded", {"match_id": match_id, "player_ids": [player_id for player_id, _ in points]})
     
-    # Refresh all scores to get their IDs
-    for score in db_scores:
-        db.refresh(score)
-    
-    # Prepare response with player details
-    response_scores = []
-    for score in db_scores:
-        player = next(p for p in players if p.id == score.player_id)
-        team_name = None
-        if player and getattr(player, 'team_id', None) is not None:
-            team = db.query(Team).filter(Team.id == player.team_id).first()
-            team_name = getattr(team, 'name', None)
-        
-        # Convert SQLAlchemy column values to Python types
-        score_dict = {
-            'id': int(getattr(score, 'id', 0)),
-            'player_id': int(getattr(score, 'player_id', 0)),
-            'match_id': int(getattr(score, 'match_id', 0)),
-            'points': float(getattr(score, 'points', 0.0)),
-            'created_at': getattr(score, 'created_at', datetime.utcnow()),
-            'updated_at': getattr(score, 'updated_at', datetime.utcnow())
-        }
-        
-        player_dict = {
-            'name': str(getattr(player, 'name', '')),
-            'ipl_team': str(getattr(player, 'ipl_team', '')),
-            'role': str(getattr(player, 'role', ''))
-        }
-        
-        response_scores.append(
-            PlayerScoreResponse(
-                **score_dict,
-                player_name=player_dict['name'],
-                player_team=team_name,
-                player_ipl_team=player_dict['ipl_team'],
-                player_role=player_dict['role']
-            )
-        )
+    response_scores = [_score_response(score, players[score.player_id]) for score in db_scores]
     
     # Calculate statistics
-    points_list = [float(getattr(score, 'points', 0.0)) for score in db_scores]
-    total_points = sum(points_list)
-    avg_points = total_points / len(db_scores) if db_scores else 0.0
+    total_points = sum(score.points for score in response_scores)
+    avg_points = total_points / len(response_scores) if response_scores else 0.0
     
     return BatchScoreResponse(
-        match_id=scores.match_id,
+        match_id=match_id,
         scores=response_scores,
-        total_players_scored=len(db_scores),
+        total_players_scored=len(response_scores),
         average_points=avg_points
     )
 
+@router.post("/batch", response_model=BatchScoreResponse)
+def record_match_scores(
+    scores: BatchScoreCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Record scores for multiple players in a match.
+    Validates:
+    - Match exists, is not already completed and is not being scored live
+    - All players exist
+    - No duplicate scores for the same player in the match
+    """
+    begin_immediate(db)
+    
+    players = _validate_new_scores(db, scores.match_id, [score.player_id for score in scores.scores])
+    return _record_scores(
+        db,
+        scores.match_id,
+        [(score.player_id, score.fantasy_points) for score in scores.scores],
+        players
+    )
+
+@router.post("/batch/raw", response_model=BatchScoreResponse)
+def record_raw_match_scores(
+    scorecard: RawScorecardCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Record a match from raw scorecard lines (runs, balls, boundaries, wickets,
+    maidens, fielding). Fantasy points are computed by the points engine under
+    the given rule set (default rules if omitted) and recorded like /batch.
+    The raw lines are stored so points can be recomputed if the rules change.
+    Validates the same as /batch.
+    """
+    begin_immediate(db)
+    
+    player_ids = [line.player_id for line in scorecard.players]
+    players = _validate_new_scores(db, scorecard.match_id, player_ids)
+    
+    rules = (scorecard.rules or PointsRules()).model_dump()
+    points = points_engine.score_lines(scorecard.players, rules)
+    
+    now = datetime.utcnow()
+    db.execute(insert(PlayerMatchStats), [
+        {**line.model_dump(), "match_id": scorecard.match_id, "created_at": now, "updated_at": now}
+        for line in scorecard.players
+    ])
+    return _record_scores(db, scorecard.match_id, list(zip(player_ids, points)), players)
+
+@router.post("/recompute", response_model=PointsRecomputeResult)
+def recompute_points(
+    request: PointsRecomputeRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute fantasy points from the stored raw scorecards under a rule set,
+    e.g. after a scoring rule changes. Scores recorded without raw stats are
+    left untouched.
+    Parameters:
+    - rules: Rule set to apply
+    - match_ids: Only recompute these matches (all matches if omitted)
+    """
+    begin_immediate(db)
+    
+    # Raw lines with the score each one produced, in one query
+    query = db.query(
+        *[getattr(PlayerMatchStats, field) for field in points_engine.STAT_FIELDS],
+        PlayerMatchStats.match_id,
+        PlayerMatchStats.player_id,
+        PlayerScore.id.label('score_id'),
+        PlayerScore.points
+    ).join(
+        PlayerScore,
+        and_(
+            PlayerScore.match_id == PlayerMatchStats.match_id,
+            PlayerScore.player_id == PlayerMatchStats.player_id
+        )
+    )
+    if request.match_ids is not None:
+        query = query.filter(PlayerMatchStats.match_id.in_(request.match_ids))
+    rows = query.all()
+    
+    new_points = points_engine.compute_points(points_engine.stats_matrix(rows), request.rules.model_dump())
+    old_points = np.array([row.points or 0.0 for row in rows], dtype=np.float64)
+    changed = np.flatnonzero(np.abs(new_points - old_points) > 1e-9)
+    
+    now = datetime.utcnow()
+    if len(changed):
+        db.execute(update(PlayerScore), [
+            {"id": rows[i].score_id, "points": float(new_points[i]), "updated_at": now}
+            for i in changed
+        ])
+        player_aggregates.refresh(db, [rows[i].player_id for i in changed])
+    db.commit()
+    
+    changed_matches = sorted({rows[i].match_id for i in changed})
+    if changed_matches:
+        broker.publish("scores_recomputed", {"match_ids": changed_matches})
+    
+    return {
+        "matches": len({row.match_id for row in rows}),
+        "scores_recomputed": len(rows),
+        "scores_changed": len(changed)
+    }
+
 @router.get("/matches/{match_id}", response_model=BatchScoreResponse)
 def get_match_scores(
     match_id: int,
@@ -126,67 +252,179 @@ def get_match_scores(
 ):
     """
     Get all player scores for a specific match.
+    Scorecards of completed matches are cached until a score, match or
+    ownership change invalidates them.
     """
+    cached = scorecard_cache.get(match_id)
+    if cached is not None:
+        return cached
+    generation = scorecard_cache.generation
+    
     # Validate match exists
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = db.query(Match.id, Match.is_completed).filter(Match.id == match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
-    # Get all scores for the match with player details
-    scores = db.query(PlayerScore).filter(PlayerScore.match_id == match_id).all()
+    # Get all scores for the match with player and fantasy team details in one query
+    rows = db.query(
+        *PlayerScore.__table__.columns,
+        Player.name,
+        Player.ipl_team,
+        Player.role,
+        Team.name.label('team_name')
+    ).join(
+        Player, PlayerScore.player_id == Player.id
+    ).outerjoin(
+        Team, Player.team_id == Team.id
+    ).filter(
+        PlayerScore.match_id == match_id
+    ).order_by(PlayerScore.id).all()
     
-    if not scores:
+    if not rows:
         raise HTTPException(status_code=404, detail="No scores found for this match")
     
-    # Prepare response with player details
-    response_scores = []
-    for score in scores:
-        player = db.query(Player).filter(Player.id == score.player_id).first()
-        if not player:
-            continue
-            
-        team_name = None
-        if getattr(player, 'team_id', None) is not None:
-            team = db.query(Team).filter(Team.id == player.team_id).first()
-            team_name = getattr(team, 'name', None)
-        
-        # Convert SQLAlchemy column values to Python types
-        score_dict = {
-            'id': int(getattr(score, 'id', 0)),
-            'player_id': int(getattr(score, 'player_id', 0)),
-            'match_id': int(getattr(score, 'match_id', 0)),
-            'points': float(getattr(score, 'points', 0.0)),
-            'created_at': getattr(score, 'created_at', datetime.utcnow()),
-            'updated_at': getattr(score, 'updated_at', datetime.utcnow())
-        }
-        
-        player_dict = {
-            'name': str(getattr(player, 'name', '')),
-            'ipl_team': str(getattr(player, 'ipl_team', '')),
-            'role': str(getattr(player, 'role', ''))
-        }
-        
-        response_scores.append(
-            PlayerScoreResponse(
-                **score_dict,
-                player_name=player_dict['name'],
-                player_team=team_name,
-                player_ipl_team=player_dict['ipl_team'],
-                player_role=player_dict['role']
-            )
-        )
+    response_scores = [_score_response(row, row) for row in rows]
     
     # Calculate statistics
-    points_list = [float(getattr(score, 'points', 0.0)) for score in scores]
-    total_points = sum(points_list)
-    avg_points = total_points / len(scores) if scores else 0.0
+    total_points = sum(score.points for score in response_scores)
+    avg_points = total_points / len(response_scores) if response_scores else 0.0
     
-    return BatchScoreResponse(
+    scorecard = BatchScoreResponse(
         match_id=match_id,
         scores=response_scores,
-        total_players_scored=len(scores),
+        total_players_scored=len(response_scores),
         average_points=avg_points
     )
+    if bool(match.is_completed):
+        scorecard_cache.put(match_id, scorecard, generation)
+    return scorecard
+
+@router.post("/matches/{match_id}/corrections", response_model=ScoreCorrectionResult)
+def correct_match_scores(
+    match_id: int,
+    request: ScoreCorrectionRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Correct (or add) player scores for a match, including completed matches.
+    Each correction gives either the new points or a delta to apply, and is
+    recorded in score_corrections for auditing. The cached team leaderboard
+    is adjusted by the per-player deltas without a recompute, and the deltas
+    are published for other consumers.
+    Recomputing from raw scorecards later replaces corrected points.
+    Validates:
+    - Match exists and is not being scored live
+    - Each player exists and appears once
+    - Exactly one of points or delta is given, and no score ends up negative
+    """
+    begin_immediate(db)
+    
+    match = db.query(Match.id, Match.is_completed, Match.live_sequence).filter(Match.id == match_id).first()
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    if live_scoring.owns(match):
+        raise HTTPException(status_code=409, detail="Match is being scored live")
+    
+    player_ids = [correction.player_id for correction in request.corrections]
+    if len(set(player_ids)) != len(player_ids):
+        raise HTTPException(status_code=400, detail="Each player can only be corrected once per request")
+    for correction in request.corrections:
+        if (correction.points is None) == (correction.delta is None):
+            raise HTTPException(status_code=400, detail="Give either points or delta for each correction")
+    found = {row.id for row in db.query(Player.id).filter(Player.id.in_(player_ids)).all()}
+    if len(found) != len(player_ids):
+        raise HTTPException(status_code=400, detail="One or more players not found")
+    
+    # Current scores of the corrected players, in one query
+    existing = {}
+    for score in db.query(PlayerScore.id, PlayerScore.player_id, PlayerScore.points).filter(
+        PlayerScore.match_id == match_id,
+        PlayerScore.player_id.in_(player_ids)
+    ).order_by(PlayerScore.id).all():
+        existing.setdefault(score.player_id, score)
+    
+    changes = []
+    for correction in request.corrections:
+        score = existing.get(correction.player_id)
+        previous = float(score.points or 0.0) if score is not None else None
+        points = correction.points if correction.points is not None else (previous or 0.0) + correction.delta
+        if points < 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Correction would make points negative for player {correction.player_id}"
+            )
+        changes.append({
+            "player_id": correction.player_id,
+            "score_id": score.id if score is not None else None,
+            "previous_points": previous,
+            "new_points": points,
+            "delta": points - (previous or 0.0)
+        })
+    
+    now = datetime.utcnow()
+    updates = [change for change in changes if change["score_id"] is not None]
+    if updates:
+        db.execute(update(PlayerScore), [
+            {"id": change["score_id"], "points": change["new_points"], "updated_at": now}
+            for change in updates
+        ])
+    inserts = [change for change in changes if change["score_id"] is None]
+    if inserts:
+        new_ids = {
+            player_id: score_id
+            for score_id, player_id in db.execute(
+                insert(PlayerScore).returning(PlayerScore.id, PlayerScore.player_id),
+                [
+                    {"player_id": change["player_id"], "match_id": match_id, "points": change["new_points"],
+                     "created_at": now, "updated_at": now}
+                    for change in inserts
+                ]
+            ).all()
+        }
+        for change in inserts:
+            change["score_id"] = new_ids[change["player_id"]]
+    
+    player_aggregates.refresh(db, player_ids)
+    
+    audit = sorted(db.execute(
+        insert(ScoreCorrection).returning(*ScoreCorrection.__table__.columns),
+        [{**change, "match_id": match_id, "reason": request.reason, "created_at": now} for change in changes]
+    ).all(), key=lambda correction: correction.id)
+    corrections = [
+        {key: change[key] for key in ("player_id", "previous_points", "new_points", "delta")}
+        for change in changes
+    ]
+    leaderboard.commit_correction(db, corrections)
+    
+    broker.publish("score_correction", {
+        "match_id": match_id,
+        "player_ids": player_ids,
+        "corrections": corrections
+    })
+    
+    return {"match_id": match_id, "corrections": [dict(row._mapping) for row in audit]}
+
+@router.get("/corrections", response_model=List[ScoreCorrectionResponse])
+def list_score_corrections(
+    match_id: Optional[int] = None,
+    player_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """
+    List recorded score corrections, newest first.
+    Parameters:
+    - match_id: Only corrections for this match
+    - player_id: Only corrections for this player
+    - skip/limit: Pagination
+    """
+    query = db.query(ScoreCorrection)
+    if match_id is not None:
+        query = query.filter(ScoreCorrection.match_id == match_id)
+    if player_id is not None:
+        query = query.filter(ScoreCorrection.player_id == player_id)
+    return query.order_by(ScoreCorrection.id.desc()).offset(skip).limit(limit).all()
 
 @router.get("/players/{player_id}", response_model=List[PlayerScoreResponse])
 def get_player_scores(
@@ -2,15 +2,56 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy import update
+from sqlalchemy import update, func
 
+from ..core.config import PLAYER_ROLES
 from ..db.database import get_db
-from ..models import Team, Player
-from ..schemas.team import TeamCreate, TeamUpdate, Team as TeamSchema, TeamWithStats
+from ..models import Team, Player, TeamBudget
+from ..schemas.team import (
+    TeamCreate,
+    TeamUpdate,
+    Team as TeamSchema,
+    TeamWithStats,
+    BudgetConsistencyReport,
+    BudgetRebuildResult
+)
+from ..services import team_budget
+from ..services.events import broker, model_to_dict
 from ..schemas.player import Player as PlayerSchema
 
 router = APIRouter()
 
+def _team_stats_query(db: Session):
+    """
+    Select every team column with its squad statistics read from the
+    maintained team_budgets summary (one row per team, no scan over players).
+    """
+    return db.query(
+        *Team.__table__.columns,
+        func.coalesce(TeamBudget.player_count, 0).label('total_players'),
+        func.coalesce(TeamBudget.total_spent, 0.0).label('total_spent'),
+        *[
+            func.coalesce(getattr(TeamBudget, column), 0).label(f'role_{role}')
+            for role, column in team_budget.ROLE_COUNT_COLUMNS.items()
+        ]
+    ).outerjoin(
+        TeamBudget, TeamBudget.team_id == Team.id
+    )
+
+def _team_with_stats(row) -> TeamWithStats:
+    """
+    Build a TeamWithStats response from a _team_stats_query row.
+    """
+    team_dict = {column.name: getattr(row, column.name) for column in Team.__table__.columns}
+    total_spent = float(row.total_spent or 0)
+    return TeamWithStats(
+        **team_dict,
+        total_players=row.total_players,
+        total_spent=total_spent,
+        remaining_purse=team_dict['initial_purse'] - total_spent,
+        players_by_role={role: int(getattr(row, f'role_{role}')) for role in PLAYER_ROLES}
+    )
+
 @router.get("/", response_model=List[TeamWithStats])
 def get_teams(
     skip: int = 0,
@@ -20,40 +61,8 @@ def get_teams(
     """
     Retrieve all fantasy league teams with their stats.
     """
-    teams = db.query(Team).offset(skip).limit(limit).all()
-    result = []
-    
-    for team in teams:
-        # Get team statistics
-        players = db.query(Player).filter(Player.team_id == team.id).all()
-        
-        # Calculate statistics
-        total_players = len(players)
-        total_spent = sum(float(getattr(p, 'sold_price', 0) or 0) for p in players)
-        players_by_role = {"BAT": 0, "BOWL": 0, "AR": 0, "WK": 0}
-        
-        for player in players:
-            role = str(getattr(player, 'role', ''))
-            if role in players_by_role:
-                players_by_role[role] += 1
-        
-        # Convert SQLAlchemy model to dict first
-        team_dict = {}
-        for column in Team.__table__.columns:
-            value = getattr(team, column.name)
-            team_dict[column.name] = value
-        
-        # Create response
-        response = TeamWithStats(
-            **team_dict,
-            total_players=total_players,
-            total_spent=total_spent,
-            remaining_purse=team_dict['initial_purse'] - total_spent,
-            players_by_role=players_by_role
-        )
-        result.append(response)
-    
-    return result
+    rows = _team_stats_query(db).order_by(Team.id).offset(skip).limit(limit).all()
+    return [_team_with_stats(row) for row in rows]
 
 @router.post("/", response_model=TeamSchema)
 def create_team(
@@ -65,10 +74,37 @@ def create_team(
     """
     db_team = Team(**team.model_dump())
     db.add(db_team)
+    db.flush()
+    team_budget.ensure_team(db, db_team.id)
     db.commit()
     db.refresh(db_team)
+    broker.publish("team_create", {"team": model_to_dict(db_team)})
     return db_team
 
+@router.get("/budgets/check", response_model=BudgetConsistencyReport)
+def check_team_budgets(
+    db: Session = Depends(get_db)
+):
+    """
+    Verify the team_budgets summary against the players table.
+    """
+    mismatches = team_budget.check_consistency(db)
+    return {
+        "consistent": not mismatches,
+        "mismatches": mismatches
+    }
+
+@router.post("/budgets/rebuild", response_model=BudgetRebuildResult)
+def rebuild_team_budgets(
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute the team_budgets summary from the players table.
+    """
+    teams_rebuilt = team_budget.rebuild(db)
+    db.commit()
+    return {"teams_rebuilt": teams_rebuilt}
+
 @router.get("/{team_id}", response_model=TeamWithStats)
 def get_team(
     team_id: int,
@@ -77,38 +113,11 @@ def get_team(
     """
     Get detailed information about a specific team, including statistics.
     """
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
+    row = _team_stats_query(db).filter(Team.id == team_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    # Get team statistics
-    players = db.query(Player).filter(Player.team_id == team_id).all()
-    
-    # Calculate statistics
-    total_players = len(players)
-    total_spent = sum(float(getattr(p, 'sold_price', 0) or 0) for p in players)
-    players_by_role: Dict[str, int] = {"BAT": 0, "BOWL": 0, "AR": 0, "WK": 0}
-    
-    for player in players:
-        role = str(getattr(player, 'role', ''))
-        if role in players_by_role:
-            players_by_role[role] += 1
-    
-    # Convert SQLAlchemy model to dict first
-    team_dict = {}
-    for column in Team.__table__.columns:
-        value = getattr(team, column.name)
-        team_dict[column.name] = value
-    
-    # Create response
-    response = TeamWithStats(
-        **team_dict,
-        total_players=total_players,
-        total_spent=total_spent,
-        remaining_purse=team_dict['initial_purse'] - total_spent,
-        players_by_role=players_by_role
-    )
-    return response
+    return _team_with_stats(row)
 
 @router.put("/{team_id}", response_model=TeamSchema)
 def update_team(
@@ -137,6 +146,7 @@ def update_team(
     
     # Refresh and return the team
     db.refresh(db_team)
+    broker.publish("team_update", {"team": model_to_dict(db_team)})
     return db_team
 
 @router.get("/{team_id}/players", response_model=List[PlayerSchema])
@@ -0,0 +1,10 @@
+# Auction rules shared by the purchase, validation and analytics code paths
+
+# Maximum number of players a fantasy team may own
+MAX_SQUAD_SIZE = 16
+
+# Players a fantasy team must be able to field by the end of the auction
+MIN_SQUAD_SIZE = 11
+
+# Player roles, in the order they are reported
+PLAYER_ROLES = ("BAT", "BOWL", "AR", "WK")
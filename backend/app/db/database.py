@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -6,15 +6,35 @@ from pathlib import Path
 
 # Get the absolute path to the database file
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-DATABASE_URL = f"sqlite:///{BASE_DIR}/fantasy_league.db"
+# DATABASE_URL can be overridden, e.g. to point benchmarks at a scratch database
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/fantasy_league.db")
 
 engine = create_engine(
     DATABASE_URL, 
     connect_args={"check_same_thread": False}  # SQLite-specific argument
 )
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed while an auction write is in flight
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def begin_immediate(db):
+    """
+    Start the session's transaction with BEGIN IMMEDIATE so that it holds the
+    SQLite write lock from its first read. Use this for read-validate-write
+    sequences; otherwise a concurrent writer can invalidate what was read.
+    Must be called before the session has executed anything.
+    """
+    connection = db.connection()
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -1,11 +1,25 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api import teams, players, auction, matches, scores, dashboard
-from .db.database import Base, engine
+from .api import teams, players, auction, matches, scores, dashboard, events, live
+from .db.database import Base, engine, SessionLocal
+from .services.player_search import ensure_search_index
+from .services import ledger, player_aggregates, team_budget
+from .services.auction_stats import accumulator as auction_stats
+from .services.bid_limits import pool as unsold_pool
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+ensure_search_index(engine)
+
+# Populate derived tables that databases created before them are missing
+with SessionLocal() as db:
+    team_budget.ensure_populated(db)
+    player_aggregates.ensure_populated(db)
+    ledger.ensure_baseline(db)
+    # Seed in-process accumulators kept current by auction events
+    auction_stats.seed(db)
+    unsold_pool.seed(db)
 
 app = FastAPI(
     title="IPL Fantasy League API",
@@ -29,6 +43,8 @@ app.include_router(auction.router, prefix="/api/auction", tags=["auction"])
 app.include_router(matches.router, prefix="/api/matches", tags=["matches"])
 app.include_router(scores.router, prefix="/api/scores", tags=["scores"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
+app.include_router(live.router, prefix="/api/live", tags=["live"])
 
 @app.get("/")
 async def root():
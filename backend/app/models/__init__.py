@@ -2,3 +2,8 @@ from .team import Team
 from .player import Player
 from .match import Match
 from .player_score import PlayerScore
+from .team_budget import TeamBudget
+from .auction_event import AuctionEvent, AuctionSnapshot
+from .player_match_stats import PlayerMatchStats
+from .score_correction import ScoreCorrection
+from .player_aggregate import PlayerAggregate
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey
+from datetime import datetime
+
+from app.db.database import Base
+
+class AuctionEvent(Base):
+    """
+    Append-only record of every change to a player's ownership
+    (players.team_id / sold_price). Rows are never updated or deleted.
+    """
+    __tablename__ = "auction_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String, nullable=False)  # purchase, reset, player_update, restore
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
+    team_id = Column(Integer, nullable=True)  # Owner after the event, null when unsold
+    sold_price = Column(Float, nullable=True)
+    previous_team_id = Column(Integer, nullable=True)
+    previous_sold_price = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class AuctionSnapshot(Base):
+    """
+    Ownership of every sold player after applying all events up to event_id,
+    stored as JSON {player_id: [team_id, sold_price]}.
+    """
+    __tablename__ = "auction_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, nullable=False, unique=True)
+    state = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
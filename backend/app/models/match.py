@@ -14,6 +14,7 @@ class Match(Base):
     match_date = Column(Date)
     venue = Column(String)
     is_completed = Column(Boolean, default=False)
+    live_sequence = Column(Integer, nullable=True)  # Last delivery included in the flushed live scores
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -11,9 +11,9 @@ class Player(Base):
     name = Column(String, index=True)
     ipl_team = Column(String, index=True)  # e.g., CSK, MI, RCB
     role = Column(String)  # Batsman, Bowler, All-rounder, Wicket-keeper
-    base_price = Column(Float)
-    sold_price = Column(Float, nullable=True)  # Non-null value indicates player is sold
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)  # Non-null value indicates player is sold
+    base_price = Column(Float, index=True)
+    sold_price = Column(Float, nullable=True, index=True)  # Non-null value indicates player is sold
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)  # Non-null value indicates player is sold
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
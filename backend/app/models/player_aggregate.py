@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.db.database import Base
+
+class PlayerAggregate(Base):
+    """
+    Denormalized per-player score summary, recomputed from player_scores in the
+    same transaction as every score write, so the dashboard reads one row per
+    player instead of grouping score rows. Players without scores have no row.
+    """
+    __tablename__ = "player_aggregates"
+    __table_args__ = (
+        # Top players overall and by role, highest average first
+        Index("ix_player_aggregates_average_points", "average_points"),
+        Index("ix_player_aggregates_role_average_points", "role", "average_points"),
+    )
+
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    role = Column(String)  # Copy of players.role
+    matches_played = Column(Integer, nullable=False)  # Distinct matches scored in
+    score_count = Column(Integer, nullable=False)  # Score rows
+    total_points = Column(Float)
+    average_points = Column(Float)  # total_points per match played
+    highest_score = Column(Float)
+    lowest_score = Column(Float)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    player = relationship("Player")
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.db.database import Base
+
+class PlayerMatchStats(Base):
+    """
+    Raw scorecard line of a player in a match. Fantasy points in player_scores
+    are derived from these by the points engine, so they can be recomputed
+    when the scoring rules change.
+    """
+    __tablename__ = "player_match_stats"
+    __table_args__ = (UniqueConstraint("match_id", "player_id", name="uq_player_match_stats_match_player"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
+    match_id = Column(Integer, ForeignKey("matches.id"), nullable=False, index=True)
+    runs = Column(Integer, nullable=False, default=0)
+    balls = Column(Integer, nullable=False, default=0)
+    fours = Column(Integer, nullable=False, default=0)
+    sixes = Column(Integer, nullable=False, default=0)
+    wickets = Column(Integer, nullable=False, default=0)
+    maidens = Column(Integer, nullable=False, default=0)
+    catches = Column(Integer, nullable=False, default=0)
+    stumpings = Column(Integer, nullable=False, default=0)
+    run_outs = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    player = relationship("Player")
+    match = relationship("Match")
@@ -8,8 +8,8 @@ class PlayerScore(Base):
     __tablename__ = "player_scores"
 
     id = Column(Integer, primary_key=True, index=True)
-    player_id = Column(Integer, ForeignKey("players.id"))
-    match_id = Column(Integer, ForeignKey("matches.id"))
+    player_id = Column(Integer, ForeignKey("players.id"), index=True)
+    match_id = Column(Integer, ForeignKey("matches.id"), index=True)
     points = Column(Float, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from datetime import datetime
+
+from app.db.database import Base
+
+class ScoreCorrection(Base):
+    """
+    Audit record of a change to a player's points in a match after they were
+    recorded. previous_points is null when the correction created the score.
+    """
+    __tablename__ = "score_corrections"
+
+    id = Column(Integer, primary_key=True, index=True)
+    match_id = Column(Integer, ForeignKey("matches.id"), nullable=False, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
+    score_id = Column(Integer, ForeignKey("player_scores.id"), nullable=False)
+    previous_points = Column(Float, nullable=True)
+    new_points = Column(Float, nullable=False)
+    delta = Column(Float, nullable=False)
+    reason = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -15,4 +15,5 @@ class Team(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    players = relationship("Player", back_populates="team") 
\ No newline at end of file
+    players = relationship("Player", back_populates="team")
+    budget = relationship("TeamBudget", back_populates="team", uselist=False) 
\ No newline at end of file
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.db.database import Base
+
+class TeamBudget(Base):
+    """
+    Denormalized per-team squad summary, maintained in the same transaction as
+    every change to players.team_id / sold_price / role.
+    """
+    __tablename__ = "team_budgets"
+
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+    total_spent = Column(Float, nullable=False, default=0.0)
+    player_count = Column(Integer, nullable=False, default=0)
+    bat_count = Column(Integer, nullable=False, default=0)
+    bowl_count = Column(Integer, nullable=False, default=0)
+    ar_count = Column(Integer, nullable=False, default=0)
+    wk_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    team = relationship("Team", back_populates="budget")
@@ -21,6 +21,58 @@ class PlayerPurchaseResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+class BatchPurchaseRequest(BaseModel):
+    purchases: List[AuctionPurchase] = Field(..., description="Sales in the order they happened")
+    all_or_nothing: bool = Field(False, description="Apply no sales at all if any sale fails validation")
+
+class BatchPurchaseFailure(BaseModel):
+    index: int = Field(..., description="Position of the sale in the request")
+    player_id: int
+    team_id: int
+    status_code: int
+    detail: str
+
+class BatchPurchaseResponse(BaseModel):
+    applied: bool = Field(..., description="Whether the valid sales were written")
+    purchased: List[PlayerPurchaseResponse]
+    failures: List[BatchPurchaseFailure]
+
+class AuctionEventResponse(BaseModel):
+    id: int
+    event_type: str
+    player_id: int
+    team_id: Optional[int] = None
+    sold_price: Optional[float] = None
+    previous_team_id: Optional[int] = None
+    previous_sold_price: Optional[float] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+class LedgerPlayerState(BaseModel):
+    player_id: int
+    team_id: int
+    sold_price: Optional[float] = None
+
+class LedgerTeamState(BaseModel):
+    team_id: int
+    team_name: str
+    players_bought: int
+    total_spent: float
+    remaining_purse: float
+
+class LedgerState(BaseModel):
+    event_id: int = Field(..., description="Event the state was rebuilt up to")
+    snapshot_event_id: int = Field(..., description="Snapshot the replay started from")
+    replayed_events: int = Field(..., description="Events applied on top of the snapshot")
+    sold_players: List[LedgerPlayerState]
+    teams: List[LedgerTeamState]
+
+class LedgerRestoreResult(BaseModel):
+    restored_to: int = Field(..., description="Event whose state was restored")
+    players_changed: int
+    last_event_id: int = Field(..., description="Latest event after the restore events were appended")
+
 class TeamStats(BaseModel):
     team_id: int
     team_name: str
@@ -37,6 +89,22 @@ class RoleStats(BaseModel):
     highest_price: float
     lowest_price: float
 
+class TeamMaxBid(BaseModel):
+    team_id: int
+    team_name: str
+    players_bought: int
+    remaining_purse: float
+    slots_to_fill: int = Field(..., description="Players still needed after this one to reach the minimum squad")
+    reserve: Optional[float] = Field(None, description="Cheapest cost of filling those slots, null if too few players are unsold")
+    max_bid: float = Field(..., description="Highest bid that still leaves the reserve in the purse")
+    can_bid: bool = Field(..., description="Whether max_bid reaches the player's base price")
+
+class MaxBidResponse(BaseModel):
+    player_id: int
+    base_price: float
+    min_squad_size: int
+    teams: List[TeamMaxBid]
+
 class AuctionStats(BaseModel):
     total_players_sold: int = Field(..., description="Total number of players sold")
     total_money_spent: float = Field(..., description="Total money spent across all teams")
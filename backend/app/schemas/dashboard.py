@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 
 class TeamLeaderboard(BaseModel):
@@ -12,6 +12,51 @@ class TeamLeaderboard(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class CacheStats(BaseModel):
+    name: str
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    invalidations: int
+    updates: int = Field(..., description="Cached values adjusted in place instead of being invalidated")
+
+class TeamRankMovement(BaseModel):
+    team_id: int
+    team_name: str
+    owner_name: str
+    rank_before: Optional[int] = None  # None if the team had no scores yet
+    rank_after: Optional[int] = None
+    movement: Optional[int] = Field(None, description="Places climbed (negative if the team dropped)")
+    points_before: float
+    points_after: float
+    points_gained: float
+
+class LeaderboardMovement(BaseModel):
+    from_match: int
+    to_match: int
+    teams: List[TeamRankMovement]
+
+class ScoreHistogram(BaseModel):
+    bin_edges: List[float] = Field(..., description="Shared by all roles; one more edge than counts")
+    counts: List[int]
+
+class RoleScoreDistribution(BaseModel):
+    role: str
+    scores: int = Field(..., description="Number of individual scores")
+    players: int
+    mean: float
+    std_dev: float
+    percentiles: Dict[str, float] = Field(..., description="Score percentiles, keyed p10, p25, ...")
+    histogram: ScoreHistogram
+
+class PlayerRoleStanding(BaseModel):
+    player_id: int
+    role: str
+    average_points: float = Field(..., description="Average points per appearance")
+    percentile: float = Field(..., description="Percent of players in the role averaging at most as much")
+    z_score: float = Field(..., description="Standard deviations above the role's average player")
+
 class TopPlayer(BaseModel):
     player_id: int
     name: str
@@ -24,6 +69,21 @@ class TopPlayer(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class PlayerForm(BaseModel):
+    player_id: int
+    name: str
+    role: str
+    ipl_team: str
+    fantasy_team: Optional[str] = None
+    matches_played: int
+    season_average: float
+    form_3: float = Field(..., description="Average points over the last 3 matches played")
+    form_5: float = Field(..., description="Average points over the last 5 matches played")
+    form_10: float = Field(..., description="Average points over the last 10 matches played")
+    std_dev: float = Field(..., description="Standard deviation of the player's points")
+    best_streak: int = Field(..., description="Longest run of matches at or above the player's average")
+    worst_streak: int = Field(..., description="Longest run of matches below the player's average")
+
 class RecentPerformance(BaseModel):
     match_number: int
     teams: str
@@ -47,4 +107,13 @@ class PlayerStats(BaseModel):
     lowest_score: float
     recent_performances: List[RecentPerformance]
     
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class PointsSeriesLine(BaseModel):
+    id: int  # Team or player ID
+    name: str
+    cumulative_points: List[float] = Field(..., description="Running total after each match, aligned with match_numbers")
+
+class PointsSeries(BaseModel):
+    match_numbers: List[int]
+    series: List[PointsSeriesLine]
@@ -0,0 +1,74 @@
+from pydantic import BaseModel, Field, validator
+from datetime import datetime
+from typing import List, Optional
+from enum import Enum
+
+class ExtraType(str, Enum):
+    WIDE = "wide"
+    NO_BALL = "noball"
+    BYE = "bye"
+    LEG_BYE = "legbye"
+
+class WicketKind(str, Enum):
+    BOWLED = "bowled"
+    CAUGHT = "caught"
+    LBW = "lbw"
+    STUMPED = "stumped"
+    HIT_WICKET = "hit_wicket"
+    RUN_OUT = "run_out"
+    OTHER = "other"  # retired, obstructing the field, etc. - not credited to the bowler
+
+class Delivery(BaseModel):
+    sequence: int = Field(..., description="Position of the delivery in the match; repeats are ignored", ge=1)
+    over: int = Field(..., description="Over number (0-based) within the innings", ge=0)
+    innings: int = Field(1, description="Innings number", ge=1)
+    batter_id: int = Field(..., description="ID of the batter on strike")
+    bowler_id: int = Field(..., description="ID of the bowler")
+    runs: int = Field(0, description="Runs credited to the batter", ge=0, le=7)
+    extras: int = Field(0, description="Extra runs on the delivery", ge=0)
+    extra_type: Optional[ExtraType] = None
+    wicket_kind: Optional[WicketKind] = None
+    fielder_id: Optional[int] = Field(None, description="Catcher, wicket-keeper or run-out fielder")
+
+class DeliveryBatch(BaseModel):
+    deliveries: List[Delivery] = Field(..., description="Deliveries in the order they were bowled")
+
+    @validator('deliveries')
+    def validate_deliveries(cls, v):
+        if not v:
+            raise ValueError("At least one delivery must be provided")
+        return v
+
+class DeliveryIngestResult(BaseModel):
+    match_id: int
+    accepted: int = Field(..., description="Deliveries applied")
+    duplicates: int = Field(..., description="Deliveries ignored because their sequence was already applied")
+    last_sequence: int
+    flushed: bool = Field(..., description="Whether this request flushed the running scores to the database")
+
+class LivePlayerLine(BaseModel):
+    player_id: int
+    team_id: Optional[int] = None  # Fantasy team owning the player
+    runs: int
+    balls: int
+    fours: int
+    sixes: int
+    wickets: int
+    maidens: int
+    catches: int
+    stumpings: int
+    run_outs: int
+    points: float
+
+class LiveTeamTotal(BaseModel):
+    team_id: int
+    points: float
+
+class LiveMatchState(BaseModel):
+    match_id: int
+    last_sequence: int
+    deliveries: int
+    unflushed_players: int = Field(..., description="Players whose running score is not yet in player_scores")
+    last_flushed_at: Optional[datetime] = None
+    players: List[LivePlayerLine]
+    team_totals: List[LiveTeamTotal]
@@ -44,4 +44,17 @@ class MatchResponse(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class SeasonImportError(BaseModel):
+    line: int = Field(..., description="Line of the input file (CSV: the row's last line)")
+    detail: str
+
+class SeasonImportResult(BaseModel):
+    records_read: int
+    matches_created: int
+    scores_created: int
+    chunks_committed: int = Field(..., description="Chunks written, each in its own transaction")
+    error_count: int = Field(..., description="Invalid records; only the first 100 are listed in errors")
+    errors: List[SeasonImportError]
+    stopped: bool = Field(..., description="Whether the import ended early, on an error with stop_on_error or on bytes that are not UTF-8")
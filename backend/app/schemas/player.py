@@ -61,6 +61,7 @@ class PlayerWithTeam(Player):
 # Paginated response for players
 class PaginatedPlayerResponse(BaseModel):
     items: List[PlayerWithTeam]
-    total: int
+    total: Optional[int] = Field(None, description="Total matching players, omitted when include_total is false")
     skip: int
-    limit: int 
\ No newline at end of file
+    limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page when paging with use_cursor") 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class PlayerScoreCreate(BaseModel):
     player_id: int = Field(..., description="ID of the player")
@@ -16,6 +16,110 @@ class BatchScoreCreate(BaseModel):
             raise ValueError("At least one player score must be provided")
         return v
 
+class StrikeRateBand(BaseModel):
+    min: float = Field(..., description="Lowest strike rate in the band (inclusive)")
+    max: Optional[float] = Field(None, description="Strike rate the band stops below, unbounded if omitted")
+    points: float = Field(..., description="Points added (or deducted if negative) for a strike rate in the band")
+
+class PointsRules(BaseModel):
+    """Fantasy points rule set. Defaults follow the usual T20 scoring."""
+    run: float = 1
+    four: float = 1
+    six: float = 2
+    wicket: float = 25
+    maiden: float = 12
+    catch: float = 8
+    stumping: float = 12
+    run_out: float = 6
+    run_milestones: Dict[int, float] = Field(
+        default_factory=lambda: {30: 4, 50: 8, 100: 16},
+        description="Runs threshold -> bonus; only the highest reached counts"
+    )
+    wicket_milestones: Dict[int, float] = Field(
+        default_factory=lambda: {3: 4, 4: 8, 5: 16},
+        description="Wickets threshold -> bonus; only the highest reached counts"
+    )
+    catch_milestones: Dict[int, float] = Field(
+        default_factory=lambda: {3: 4},
+        description="Catches threshold -> bonus; only the highest reached counts"
+    )
+    strike_rate_min_balls: int = Field(10, description="Balls faced before strike-rate bands apply", ge=1)
+    strike_rate_bands: List[StrikeRateBand] = Field(
+        default_factory=lambda: [
+            StrikeRateBand(min=170, points=6),
+            StrikeRateBand(min=150, max=170, points=4),
+            StrikeRateBand(min=130, max=150, points=2),
+            StrikeRateBand(min=60, max=70, points=-2),
+            StrikeRateBand(min=50, max=60, points=-4),
+            StrikeRateBand(min=0, max=50, points=-6),
+        ]
+    )
+
+class PlayerMatchStatsCreate(BaseModel):
+    player_id: int = Field(..., description="ID of the player")
+    runs: int = Field(0, ge=0)
+    balls: int = Field(0, ge=0)
+    fours: int = Field(0, ge=0)
+    sixes: int = Field(0, ge=0)
+    wickets: int = Field(0, ge=0)
+    maidens: int = Field(0, ge=0)
+    catches: int = Field(0, ge=0)
+    stumpings: int = Field(0, ge=0)
+    run_outs: int = Field(0, ge=0)
+
+class RawScorecardCreate(BaseModel):
+    match_id: int = Field(..., description="ID of the match")
+    players: List[PlayerMatchStatsCreate] = Field(..., description="Raw scorecard line of each player")
+    rules: Optional[PointsRules] = Field(None, description="Rule set to score with (default rules if omitted)")
+
+    @validator('players')
+    def validate_players(cls, v):
+        if not v:
+            raise ValueError("At least one player scorecard must be provided")
+        return v
+
+class PointsRecomputeRequest(BaseModel):
+    rules: PointsRules = Field(default_factory=PointsRules)
+    match_ids: Optional[List[int]] = Field(None, description="Only recompute these matches (all matches with raw stats if omitted)")
+
+class PointsRecomputeResult(BaseModel):
+    matches: int = Field(..., description="Matches whose scores were recomputed")
+    scores_recomputed: int
+    scores_changed: int
+
+class ScoreCorrectionItem(BaseModel):
+    player_id: int = Field(..., description="ID of the player")
+    points: Optional[float] = Field(None, description="Corrected fantasy points", ge=0)
+    delta: Optional[float] = Field(None, description="Points to add (or subtract if negative)")
+
+class ScoreCorrectionRequest(BaseModel):
+    corrections: List[ScoreCorrectionItem] = Field(..., description="Per-player corrections; give either points or delta")
+    reason: Optional[str] = Field(None, description="Why the scores are being corrected")
+
+    @validator('corrections')
+    def validate_corrections(cls, v):
+        if not v:
+            raise ValueError("At least one correction must be provided")
+        return v
+
+class ScoreCorrectionResponse(BaseModel):
+    id: int
+    match_id: int
+    player_id: int
+    score_id: int
+    previous_points: Optional[float] = None
+    new_points: float
+    delta: float
+    reason: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ScoreCorrectionResult(BaseModel):
+    match_id: int
+    corrections: List[ScoreCorrectionResponse]
+
 class PlayerScoreResponse(BaseModel):
     id: int
     player_id: int
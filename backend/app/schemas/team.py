@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any
 from app.schemas.player import Player
 
 # Shared properties
@@ -43,4 +43,18 @@ class TeamWithStats(Team):
     total_players: int = 0
     total_spent: float = 0
     remaining_purse: float = Field(..., description="Remaining purse amount in lakhs")
-    players_by_role: Dict[str, int] = Field(default_factory=lambda: {"BAT": 0, "BOWL": 0, "AR": 0, "WK": 0}) 
\ No newline at end of file
+    players_by_role: Dict[str, int] = Field(default_factory=lambda: {"BAT": 0, "BOWL": 0, "AR": 0, "WK": 0}) 
+
+# Properties for a team whose budget summary is out of sync with its players
+class TeamBudgetMismatch(BaseModel):
+    team_id: int
+    fields: List[str] = Field(..., description="Summary fields that differ from the players table")
+    stored: Optional[Dict[str, Any]] = None
+    actual: Optional[Dict[str, Any]] = None
+
+class BudgetConsistencyReport(BaseModel):
+    consistent: bool
+    mismatches: List[TeamBudgetMismatch]
+
+class BudgetRebuildResult(BaseModel):
+    teams_rebuilt: int
\ No newline at end of file
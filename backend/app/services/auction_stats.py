@@ -0,0 +1,187 @@
+"""
+Incrementally maintained auction statistics.
+
+The accumulator is seeded from the database once and then kept current from
+the events published by the auction, player and team endpoints, so
+GET /api/auction/stats never has to aggregate the players table. Per-role
+prices are kept in sorted lists so min/max stay exact after resets, and sums
+are kept as Decimals so they match the Numeric aggregates and never drift.
+
+State lives in this process: run a single worker, or reseed after writes made
+by other processes.
+"""
+import threading
+from bisect import bisect_left, insort
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import Player, Team
+from .events import broker
+
+def _decimal(value: Optional[float]) -> Decimal:
+    return Decimal(str(value)) if value is not None else Decimal(0)
+
+class _RoleAccumulator:
+    """Count, sum and sorted prices of the sold players in one role."""
+    def __init__(self):
+        self.players_sold = 0
+        self.total_spent = Decimal(0)
+        self.prices: List[float] = []  # sorted, NULL prices excluded
+
+    def add(self, price: Optional[float]) -> None:
+        self.players_sold += 1
+        if price is not None:
+            self.total_spent += _decimal(price)
+            insort(self.prices, price)
+
+    def remove(self, price: Optional[float]) -> None:
+        self.players_sold -= 1
+        if price is not None:
+            self.total_spent -= _decimal(price)
+            index = bisect_left(self.prices, price)
+            if index < len(self.prices) and self.prices[index] == price:
+                del self.prices[index]
+
+class AuctionStatsAccumulator:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.seeded = False
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        # player_id -> (team_id, sold_price, role)
+        self._players: Dict[int, Tuple[Optional[int], Optional[float], Optional[str]]] = {}
+        # team_id -> {"name", "initial_purse", "players_bought", "total_spent"}
+        self._teams: Dict[int, Dict[str, Any]] = {}
+        self._roles: Dict[str, _RoleAccumulator] = {}
+        self._available: Dict[str, int] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def seed(self, db: Session) -> None:
+        """(Re)load the full state from the database."""
+        players = db.query(Player.id, Player.team_id, Player.sold_price, Player.role).all()
+        teams = db.query(Team.id, Team.name, Team.initial_purse).all()
+        with self._lock:
+            self._reset_state()
+            for team in teams:
+                self._set_team(team.id, team.name, team.initial_purse)
+            for player in players:
+                self._apply(player.id, (player.team_id, player.sold_price, player.role))
+            self.seeded = True
+
+    def _set_team(self, team_id: int, name: str, initial_purse: Optional[float]) -> None:
+        team = self._teams.setdefault(team_id, {"players_bought": 0, "total_spent": Decimal(0)})
+        team["name"] = name
+        team["initial_purse"] = float(initial_purse or 0)
+
+    def _apply(self, player_id: int, state: Tuple[Optional[int], Optional[float], Optional[str]]) -> None:
+        """Move a player from its recorded state to the given one."""
+        self._snapshot = None
+        previous = self._players.get(player_id)
+        if previous is not None:
+            self._account(previous, -1)
+        self._players[player_id] = state
+        self._account(state, 1)
+
+    def _account(self, state: Tuple[Optional[int], Optional[float], Optional[str]], sign: int) -> None:
+        team_id, price, role = state
+        role_key = str(role)
+        if team_id is None:
+            self._available[role_key] = self._available.get(role_key, 0) + sign
+            if self._available[role_key] == 0:
+                del self._available[role_key]
+            return
+
+        team = self._teams.get(team_id)
+        if team is not None:
+            team["players_bought"] += sign
+            team["total_spent"] += sign * _decimal(price)
+
+        role_stats = self._roles.setdefault(role_key, _RoleAccumulator())
+        if sign > 0:
+            role_stats.add(price)
+        else:
+            role_stats.remove(price)
+            if role_stats.players_sold == 0:
+                del self._roles[role_key]
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Broker listener applying committed changes."""
+        if not self.seeded:
+            return
+        data = event["data"]
+        with self._lock:
+            if "player" in data:
+                player = data["player"]
+                self._apply(player["id"], (player["team_id"], player["sold_price"], player["role"]))
+            elif event["type"] in ("team_create", "team_update"):
+                team = data["team"]
+                self._snapshot = None
+                self._set_team(team["id"], team["name"], team["initial_purse"])
+
+    def team_squads(self) -> List[Dict[str, Any]]:
+        """Per-team squad size and remaining purse, ordered by team id."""
+        with self._lock:
+            return [
+                {
+                    "team_id": team_id,
+                    "team_name": team["name"],
+                    "players_bought": team["players_bought"],
+                    "remaining_purse": team["initial_purse"] - float(team["total_spent"]),
+                }
+                for team_id, team in sorted(self._teams.items())
+            ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the AuctionStats payload, cached until the next change."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._build_snapshot()
+            return self._snapshot
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        total_players_sold = sum(r.players_sold for r in self._roles.values())
+        total_spent = float(sum(r.total_spent for r in self._roles.values()))
+        all_prices = [price for r in self._roles.values() for price in (r.prices[:1] + r.prices[-1:])]
+
+        teams_data = []
+        for team_id in sorted(self._teams):
+            team = self._teams[team_id]
+            initial_purse = team["initial_purse"]
+            team_spent = float(team["total_spent"])
+            teams_data.append({
+                "team_id": team_id,
+                "team_name": team["name"],
+                "players_bought": team["players_bought"],
+                "total_spent": team_spent,
+                "remaining_purse": initial_purse - team_spent,
+                "purse_utilization": (team_spent / initial_purse) * 100 if initial_purse > 0 else 0
+            })
+
+        roles_data = []
+        for role in sorted(self._roles):
+            stats = self._roles[role]
+            roles_data.append({
+                "role": role,
+                "players_sold": stats.players_sold,
+                "total_spent": float(stats.total_spent),
+                "avg_price": float(stats.total_spent / len(stats.prices)) if stats.prices else 0.0,
+                "highest_price": stats.prices[-1] if stats.prices else 0.0,
+                "lowest_price": stats.prices[0] if stats.prices else 0.0
+            })
+
+        return {
+            "total_players_sold": total_players_sold,
+            "total_money_spent": total_spent,
+            "average_price": total_spent / total_players_sold if total_players_sold > 0 else 0.0,
+            "highest_purchase": max(all_prices) if all_prices else 0.0,
+            "lowest_purchase": min(all_prices) if all_prices else 0.0,
+            "available_players": dict(self._available),
+            "team_stats": teams_data,
+            "role_stats": roles_data
+        }
+
+accumulator = AuctionStatsAccumulator()
+broker.add_listener(accumulator.handle_event)
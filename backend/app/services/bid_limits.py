@@ -0,0 +1,110 @@
+"""
+Maximum affordable bids.
+
+A team's purse must cover not only the current bid but also the cheapest way
+to fill the rest of its squad up to the minimum size. With the unsold base
+prices sorted ascending, the cheapest k fills cost prefix[k] (prefix sums of
+the sorted array), so the limit for every team is one vectorized lookup:
+
+    max_bid = remaining_purse - prefix[slots_to_fill]
+
+The unsold price pool is kept current from auction events and its sorted
+array and prefix sums are rebuilt lazily, only after a change. Like the stats
+accumulator it lives in this process.
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..core.config import MAX_SQUAD_SIZE
+from ..models import Player
+from .events import broker
+
+class UnsoldPricePool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seeded = False
+        self._prices: Dict[int, float] = {}  # unsold player_id -> base_price
+        self._sorted: Optional[np.ndarray] = None
+        self._prefix: Optional[np.ndarray] = None
+
+    def seed(self, db: Session) -> None:
+        """(Re)load the unsold players from the database."""
+        rows = db.query(Player.id, Player.base_price).filter(Player.team_id.is_(None)).all()
+        with self._lock:
+            self._prices = {row.id: float(row.base_price or 0) for row in rows}
+            self._sorted = self._prefix = None
+            self.seeded = True
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Broker listener tracking which players are unsold."""
+        if not self.seeded or "player" not in event["data"]:
+            return
+        player = event["data"]["player"]
+        with self._lock:
+            if player["team_id"] is None:
+                self._prices[player["id"]] = float(player["base_price"] or 0)
+            else:
+                self._prices.pop(player["id"], None)
+            self._sorted = self._prefix = None
+
+    def base_price(self, player_id: int) -> Optional[float]:
+        """Base price of an unsold player, or None if sold or unknown."""
+        return self._prices.get(player_id)
+
+    def arrays(self):
+        """Sorted unsold base prices and their prefix sums (prefix[k] = cheapest k)."""
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = np.sort(np.fromiter(self._prices.values(), dtype=np.float64, count=len(self._prices)))
+                self._prefix = np.concatenate(([0.0], np.cumsum(self._sorted)))
+            return self._sorted, self._prefix
+
+def compute_max_bids(
+    teams: List[Dict[str, Any]],
+    sorted_prices: np.ndarray,
+    prefix: np.ndarray,
+    player_price: float,
+    min_squad_size: int
+) -> List[Dict[str, Any]]:
+    """
+    Maximum bid each team can place on a player with base price player_price
+    while still being able to reach min_squad_size at the cheapest remaining
+    base prices. The player being bid on is excluded from the fill pool.
+
+    teams carries players_bought and remaining_purse per team. sorted_prices
+    and prefix must include the player being bid on.
+    """
+    counts = np.array([team["players_bought"] for team in teams], dtype=np.int64)
+    purses = np.array([team["remaining_purse"] for team in teams], dtype=np.float64)
+
+    # Slots still to fill after winning this player, from a pool without them
+    slots = np.clip(min_squad_size - counts - 1, 0, None)
+    available = len(sorted_prices) - 1
+    fillable = slots <= available
+
+    # Cheapest `slots` prices with the target removed: below its position the
+    # prefix is unchanged, from its position on skip over it
+    target = int(np.searchsorted(sorted_prices, player_price))
+    k = np.minimum(slots, available)
+    reserve = np.where(k <= target, prefix[k], prefix[k + 1] - player_price)
+
+    has_room = counts < MAX_SQUAD_SIZE
+    max_bids = np.where(fillable & has_room, np.maximum(purses - reserve, 0.0), 0.0)
+    can_bid = fillable & has_room & (max_bids >= player_price)
+
+    return [
+        {
+            **team,
+            "slots_to_fill": int(slots[i]),
+            "reserve": float(reserve[i]) if fillable[i] else None,
+            "max_bid": float(max_bids[i]),
+            "can_bid": bool(can_bid[i]),
+        }
+        for i, team in enumerate(teams)
+    ]
+
+pool = UnsoldPricePool()
+broker.add_listener(pool.handle_event)
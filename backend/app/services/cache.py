@@ -0,0 +1,111 @@
+"""
+In-process response caches invalidated by events.
+
+Each cache holds fully built responses keyed by request parameters. Entries are
+never expired by time: a broker listener drops them when an event shows the
+underlying data changed, so a cached response is always what a fresh query
+would return. Like the other in-process state it is per worker.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .events import broker
+
+# Player events that can change a player's fantasy team, name or role
+PLAYER_EVENTS = frozenset({"purchase", "reset", "player_update", "player_create", "restore"})
+
+class ResponseCache:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.updates = 0
+        # Bumped on every invalidation, so a response built from data read
+        # before a concurrent change is not stored afterwards
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None, counting the hit or miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store value. Pass the generation read before loading the data; the value
+        is discarded if an invalidation happened since.
+        """
+        with self._lock:
+            if generation is None or generation == self.generation:
+                self._entries[key] = value
+
+    def commit_update(self, key: Hashable, commit: Callable[[], None], fn: Callable[[Any], Optional[Any]]) -> None:
+        """
+        Run commit() and then replace the value for key with fn(value) (dropped
+        if fn returns None), holding the cache lock throughout. The generation
+        is bumped before the commit, so no load that read the data on either
+        side of the commit can store its value over the adjusted one.
+        """
+        with self._lock:
+            self.generation += 1
+            commit()
+            value = self._entries.get(key)
+            if value is not None:
+                value = fn(value)
+                if value is None:
+                    del self._entries[key]
+                    self.invalidations += 1
+                else:
+                    self._entries[key] = value
+                    self.updates += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self.generation += 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            if self._entries:
+                self.invalidations += 1
+            self._entries = {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "updates": self.updates,
+            }
+
+# Scorecards of completed matches, keyed by match id
+scorecard_cache = ResponseCache("scorecards")
+
+def _invalidate_scorecards(event: Dict[str, Any]) -> None:
+    """
+    Scorecards show each player's fantasy team, so any ownership or team name
+    change clears them all; score and match changes clear that match only.
+    """
+    if event["type"] in PLAYER_EVENTS or event["type"] == "team_update":
+        scorecard_cache.clear()
+    elif "match_id" in event["data"]:
+        scorecard_cache.invalidate(event["data"]["match_id"])
+    elif "match_ids" in event["data"]:
+        for match_id in event["data"]["match_ids"]:
+            scorecard_cache.invalidate(match_id)
+
+broker.add_listener(_invalidate_scorecards)
@@ -0,0 +1,137 @@
+"""
+Score distributions by player role.
+
+A columnar copy of player_scores (player id, points) with each row's player
+role is loaded into NumPy arrays with one query, and everything is computed
+from it with array operations:
+- per role: score count, mean, standard deviation, percentiles and a
+  histogram of individual scores, on bin edges shared by all roles so the
+  histograms are comparable
+- per player: average points per appearance, its percentile rank among the
+  players of the same role and its z-score against them
+
+The copy is dropped by every score write and by player updates (which can
+change a role), and rebuilt on the next read. Like the other in-process state
+it is per worker.
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models import Player, PlayerScore
+from .events import broker
+
+PERCENTILES = (10, 25, 50, 75, 90, 95)
+
+# Events after which the copy is stale
+INVALIDATING_EVENTS = frozenset({
+    "scores_recorded", "scores_recomputed", "scores_flushed", "scores_imported", "score_correction",
+    "player_update", "player_create",
+})
+
+class RoleSnapshot:
+    """Columnar scores of one load, with per-player averages by role."""
+
+    def __init__(self, player_ids: np.ndarray, points: np.ndarray, roles: np.ndarray):
+        self.points = points
+        self.roles = roles
+        self.role_names = sorted(set(roles.tolist()))
+        self._histograms: Dict[int, List[Dict[str, Any]]] = {}  # summaries by bin count
+
+        # Average per player, then each player's standing within their role
+        self.players, inverse = np.unique(player_ids, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(self.players))
+        self.player_averages = np.bincount(inverse, weights=points, minlength=len(self.players)) / np.maximum(counts, 1)
+        self.player_roles = np.empty(len(self.players), dtype=object)
+        self.player_roles[inverse] = roles
+        self.percentile_ranks = np.zeros(len(self.players))
+        self.z_scores = np.zeros(len(self.players))
+        for role in self.role_names:
+            members = self.player_roles == role
+            averages = self.player_averages[members]
+            ordered = np.sort(averages)
+            # Percent of the role's players averaging at most as much
+            self.percentile_ranks[members] = np.searchsorted(ordered, averages, side="right") * 100.0 / len(ordered)
+            std = averages.std()
+            self.z_scores[members] = (averages - averages.mean()) / std if std > 0 else 0.0
+
+    def roles_summary(self, bins: int) -> List[Dict[str, Any]]:
+        """Per-role score statistics and histograms with the given number of bins."""
+        if bins not in self._histograms:
+            edges = np.histogram_bin_edges(self.points, bins=bins) if len(self.points) else np.zeros(bins + 1)
+            summary = []
+            for role in self.role_names:
+                scores = self.points[self.roles == role]
+                counts, _ = np.histogram(scores, bins=edges)
+                summary.append({
+                    "role": role,
+                    "scores": len(scores),
+                    "players": int((self.player_roles == role).sum()),
+                    "mean": float(scores.mean()),
+                    "std_dev": float(scores.std()),
+                    "percentiles": {
+                        f"p{pct}": value
+                        for pct, value in zip(PERCENTILES, np.percentile(scores, PERCENTILES).tolist())
+                    },
+                    "histogram": {"bin_edges": edges.tolist(), "counts": counts.tolist()},
+                })
+            self._histograms[bins] = summary
+        return self._histograms[bins]
+
+    def player_standings(self, player_ids: Optional[List[int]] = None, role: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Average, percentile rank and z-score of players with scores."""
+        selected = np.ones(len(self.players), dtype=bool)
+        if player_ids is not None:
+            selected &= np.isin(self.players, player_ids)
+        if role is not None:
+            selected &= self.player_roles == role
+        rows = np.flatnonzero(selected)
+        return [
+            {
+                "player_id": player_id,
+                "role": player_role,
+                "average_points": average,
+                "percentile": percentile,
+                "z_score": z_score,
+            }
+            for player_id, player_role, average, percentile, z_score in zip(
+                self.players[rows].tolist(),
+                self.player_roles[rows].tolist(),
+                self.player_averages[rows].tolist(),
+                self.percentile_ranks[rows].tolist(),
+                self.z_scores[rows].tolist(),
+            )
+        ]
+
+class RoleDistribution:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[RoleSnapshot] = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Broker listener dropping the copy after score writes and role changes."""
+        if event["type"] in INVALIDATING_EVENTS:
+            self.invalidate()
+
+    def snapshot(self, db: Session) -> RoleSnapshot:
+        """The current columnar copy, loading it if a write dropped it."""
+        with self._lock:
+            if self._snapshot is None:
+                rows = db.query(PlayerScore.player_id, PlayerScore.points, Player.role).join(
+                    Player, Player.id == PlayerScore.player_id
+                ).filter(Player.role.isnot(None)).all()
+                self._snapshot = RoleSnapshot(
+                    np.array([row.player_id for row in rows], dtype=np.int64),
+                    np.array([float(row.points or 0) for row in rows], dtype=np.float64),
+                    np.array([row.role for row in rows], dtype=object),
+                )
+            return self._snapshot
+
+role_distribution = RoleDistribution()
+broker.add_listener(role_distribution.handle_event)
@@ -0,0 +1,124 @@
+"""
+In-process pub/sub for auction events.
+
+Write endpoints publish an event after their transaction commits. Two kinds of
+consumers receive it:
+- listeners: plain callables run synchronously in the publishing thread, used to
+  keep in-process caches and accumulators current
+- subscriptions: per-client bounded asyncio queues drained by the streaming
+  endpoint. A full queue drops its oldest event instead of blocking the
+  publisher, so one slow client cannot stall the others.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per client before the oldest are dropped
+DEFAULT_QUEUE_SIZE = 256
+
+PLAYER_STATE_FIELDS = ("team_id", "sold_price", "role", "base_price")
+
+class Subscription:
+    """
+    A single client's view of the event stream.
+    Must be created and drained on the client's event loop.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int, event_types: Optional[Iterable[str]]):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.event_types = frozenset(event_types) if event_types else None
+        self.dropped = 0
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        return self.event_types is None or event["type"] in self.event_types
+
+    def _offer(self, event: Dict[str, Any]) -> None:
+        # Runs on the subscription's loop
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+class EventBroker:
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: List[Subscription] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._sequence = itertools.count(1)
+
+    def subscribe(self, event_types: Optional[Iterable[str]] = None) -> Subscription:
+        """Register a streaming client. Call from within the client's event loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size, event_types)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callable invoked synchronously for every published event."""
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        with self._lock:
+            self._listeners = [l for l in self._listeners if l is not listener]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Deliver an event to all listeners and subscriptions. Call after the
+        change it describes has been committed. Safe to call from any thread.
+        """
+        event = {
+            "id": next(self._sequence),
+            "type": event_type,
+            "timestamp": datetime.utcnow(),
+            "data": data,
+        }
+        # Lists are replaced rather than mutated, so these snapshots are stable
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Event listener failed for %s event", event_type)
+        for subscription in self._subscriptions:
+            if not subscription.wants(event):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._offer, event)
+            except RuntimeError:
+                # The client's loop has shut down
+                self.unsubscribe(subscription)
+        return event
+
+broker = EventBroker()
+
+def model_to_dict(instance) -> Dict[str, Any]:
+    """Column values of a SQLAlchemy model instance."""
+    return {column.name: getattr(instance, column.name) for column in instance.__table__.columns}
+
+def player_state(player) -> Dict[str, Any]:
+    """Ownership-relevant fields of a player, from a model, result row or dict."""
+    if isinstance(player, dict):
+        return {field: player[field] for field in PLAYER_STATE_FIELDS}
+    return {field: getattr(player, field) for field in PLAYER_STATE_FIELDS}
+
+def publish_player_event(event_type: str, player: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Publish a purchase / reset / player_update / player_create / restore event.
+    player is the committed player row; previous holds its PLAYER_STATE_FIELDS
+    before the change (None for newly created players).
+    """
+    broker.publish(event_type, {"player": player, "previous": previous})
@@ -0,0 +1,142 @@
+"""
+Recent form metrics per player.
+
+For every player with scores this keeps, over their appearances in match
+number order:
+- form_3 / form_5 / form_10: average points of the last 3, 5 and 10 matches
+  (of all matches if the player has played fewer)
+- std_dev: population standard deviation of their points
+- best_streak / worst_streak: longest run of consecutive appearances at or
+  above / below their own season average
+
+Metrics are computed for many players at once: histories are packed into a
+right-aligned matrix padded with NaN, so "last N" is the last N columns, and
+streak lengths come from cumulative sums along each row.
+
+Score events name the players whose history changed (a recompute names
+matches, resolved to players on the next read); only those players are
+recomputed, with one query for their histories. Like the other in-process
+state it is per worker.
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import Match, PlayerScore
+from .events import broker
+
+FORM_WINDOWS = (3, 5, 10)
+
+# Score write events carrying the player ids they wrote
+PLAYER_SCORE_EVENTS = frozenset({"scores_recorded", "scores_flushed", "scores_imported", "score_correction"})
+
+def _longest_runs(flags: np.ndarray) -> np.ndarray:
+    """Length of the longest run of True in each row of a boolean matrix."""
+    if flags.shape[1] == 0:
+        return np.zeros(len(flags), dtype=np.int64)
+    counts = np.cumsum(flags, axis=1)
+    # Count reached at the most recent False, carried forward along the row
+    at_break = np.maximum.accumulate(np.where(flags, 0, counts), axis=1)
+    return (counts - at_break).max(axis=1)
+
+def compute_form(histories: List[List[float]]) -> Dict[str, np.ndarray]:
+    """
+    Form metrics for each history (points in match order, at least one each).
+    Returns arrays aligned with histories.
+    """
+    length = max(len(history) for history in histories)
+    points = np.full((len(histories), length), np.nan)
+    for row, history in enumerate(histories):
+        points[row, length - len(history):] = history
+    played = ~np.isnan(points)
+
+    average = np.nanmean(points, axis=1)
+    metrics = {
+        "matches_played": played.sum(axis=1),
+        "season_average": average,
+        "std_dev": np.nanstd(points, axis=1),
+        "best_streak": _longest_runs(played & (points >= average[:, None])),
+        "worst_streak": _longest_runs(played & (points < average[:, None])),
+    }
+    for window in FORM_WINDOWS:
+        metrics[f"form_{window}"] = np.nanmean(points[:, -window:], axis=1)
+    return metrics
+
+class FormTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._metrics: Dict[int, Dict[str, Any]] = {}
+        self._dirty_players: Set[int] = set()
+        self._dirty_matches: Set[int] = set()
+
+    def reset(self) -> None:
+        """Drop everything; the next read recomputes every player."""
+        with self._lock:
+            self._loaded = False
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Broker listener marking the players whose score history changed."""
+        with self._lock:
+            if not self._loaded:
+                return
+            if event["type"] in PLAYER_SCORE_EVENTS:
+                self._dirty_players.update(event["data"]["player_ids"])
+            elif event["type"] == "scores_recomputed":
+                self._dirty_matches.update(event["data"]["match_ids"])
+
+    def _compute(self, db: Session, player_ids: Optional[Iterable[int]]) -> None:
+        """Recompute the given players (all players if None) from their scores."""
+        query = db.query(
+            PlayerScore.player_id,
+            func.sum(PlayerScore.points).label('points')
+        ).join(
+            Match, Match.id == PlayerScore.match_id
+        ).group_by(
+            PlayerScore.player_id, Match.match_number
+        ).order_by(PlayerScore.player_id, Match.match_number)
+        if player_ids is not None:
+            query = query.filter(PlayerScore.player_id.in_(player_ids))
+            for player_id in player_ids:
+                self._metrics.pop(player_id, None)
+        else:
+            self._metrics = {}
+
+        histories: Dict[int, List[float]] = {}
+        for row in query.all():
+            histories.setdefault(row.player_id, []).append(float(row.points or 0))
+        if not histories:
+            return
+        ids = list(histories)
+        metrics = compute_form([histories[player_id] for player_id in ids])
+        columns = {name: values.tolist() for name, values in metrics.items()}
+        for index, player_id in enumerate(ids):
+            self._metrics[player_id] = {name: values[index] for name, values in columns.items()}
+
+    def _refresh(self, db: Session) -> None:
+        if not self._loaded:
+            self._dirty_players, self._dirty_matches = set(), set()
+            self._compute(db, None)
+            self._loaded = True
+            return
+        if self._dirty_matches:
+            self._dirty_players.update(
+                player_id for (player_id,) in db.query(PlayerScore.player_id)
+                .filter(PlayerScore.match_id.in_(self._dirty_matches)).distinct().all()
+            )
+            self._dirty_matches = set()
+        if self._dirty_players:
+            self._compute(db, sorted(self._dirty_players))
+            self._dirty_players = set()
+
+    def metrics(self, db: Session) -> Dict[int, Dict[str, Any]]:
+        """Current metrics keyed by player id (a copy)."""
+        with self._lock:
+            self._refresh(db)
+            return dict(self._metrics)
+
+form_tracker = FormTracker()
+broker.add_listener(form_tracker.handle_event)
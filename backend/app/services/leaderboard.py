@@ -0,0 +1,129 @@
+"""
+Cached team leaderboard.
+
+The leaderboard aggregates every score of every owned player, but it only
+changes when scores are written or players change hands, so the aggregated
+rows are built once and kept in a ResponseCache until a write event arrives:
+- ownership changes (purchase, reset, player update/create, restore) and team
+  renames clear it
+- score writes (batch, recompute, live flush, import) clear it
+- score corrections to existing scores are applied as per-team deltas without
+  a query; corrections that add a score can change matches played, so they
+  clear it instead
+
+Deltas are applied as the correction commits (commit_correction), not when its
+event arrives: a rebuild running between the commit and the event would
+already count the new points.
+
+Live points not yet flushed are not cached; the endpoint adds them per request.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import desc, func
+from sqlalchemy.orm import Session
+
+from ..models import Player, PlayerScore, Team
+from .cache import PLAYER_EVENTS, ResponseCache
+from .events import broker
+
+CACHE_KEY = "leaderboard"
+
+# Events whose writes can change any team's total points or matches played
+SCORE_EVENTS = frozenset({"scores_recorded", "scores_recomputed", "scores_flushed", "scores_imported"})
+
+leaderboard_cache = ResponseCache("leaderboard")
+
+def sort_key(entry: Dict[str, Any]):
+    """Total points (desc), matches played (asc), team name (asc)."""
+    return (-entry["total_points"], entry["matches_played"], entry["team_name"])
+
+def _build(db: Session) -> List[Dict[str, Any]]:
+    team_stats = (
+        db.query(
+            Team.id,
+            Team.name,
+            Team.owner_name,
+            func.count(func.distinct(PlayerScore.match_id)).label('matches_played'),
+            func.sum(PlayerScore.points).label('total_points')
+        )
+        .join(Team.players)
+        .join(Player.scores)
+        .group_by(Team.id)
+        .order_by(
+            desc('total_points'),
+            'matches_played',
+            Team.name
+        )
+        .all()
+    )
+    return [
+        {
+            "team_id": stats.id,
+            "team_name": stats.name,
+            "owner_name": stats.owner_name,
+            "matches_played": stats.matches_played,
+            "total_points": float(stats.total_points or 0)
+        }
+        for stats in team_stats
+    ]
+
+def get_leaderboard(db: Session) -> List[Dict[str, Any]]:
+    """
+    Leaderboard rows (team_id, team_name, owner_name, matches_played,
+    total_points) from flushed scores, sorted. Returns fresh dicts.
+    """
+    cached = leaderboard_cache.get(CACHE_KEY)
+    if cached is None:
+        generation = leaderboard_cache.generation
+        cached = _build(db)
+        leaderboard_cache.put(CACHE_KEY, cached, generation)
+    return [dict(entry) for entry in cached]
+
+def _apply_deltas(entries: List[Dict[str, Any]], deltas: Dict[int, float]) -> Optional[List[Dict[str, Any]]]:
+    """Entries with team point deltas added, re-sorted; None if a team has no entry yet."""
+    if not deltas.keys() <= {entry["team_id"] for entry in entries}:
+        return None
+    return sorted(
+        (
+            {**entry, "total_points": entry["total_points"] + deltas[entry["team_id"]]}
+            if entry["team_id"] in deltas else entry
+            for entry in entries
+        ),
+        key=sort_key
+    )
+
+def commit_correction(db: Session, corrections: List[Dict[str, Any]]) -> None:
+    """
+    Commit a score correction (corrections as published in its event) and add
+    its per-team deltas to the cached leaderboard in the same step, so no
+    reader can cache totals that miss or double count it.
+    """
+    if any(correction["previous_points"] is None for correction in corrections):
+        # New scores can change matches played; the event clears the cache
+        db.commit()
+        return
+    # Owners as of this transaction, which holds the write lock
+    owners = dict(db.query(Player.id, Player.team_id).filter(
+        Player.id.in_([correction["player_id"] for correction in corrections]),
+        Player.team_id.isnot(None)
+    ).all())
+    deltas: Dict[int, float] = {}
+    for correction in corrections:
+        team_id = owners.get(correction["player_id"])
+        if team_id is not None:
+            deltas[team_id] = deltas.get(team_id, 0.0) + correction["delta"]
+    if not deltas:
+        db.commit()
+        return
+    leaderboard_cache.commit_update(CACHE_KEY, db.commit, lambda entries: _apply_deltas(entries, deltas))
+
+def _handle_event(event: Dict[str, Any]) -> None:
+    event_type = event["type"]
+    if event_type in PLAYER_EVENTS or event_type == "team_update" or event_type in SCORE_EVENTS:
+        leaderboard_cache.clear()
+    elif event_type == "score_correction":
+        # Deltas to existing scores were applied by commit_correction
+        if any(correction["previous_points"] is None for correction in event["data"]["corrections"]):
+            leaderboard_cache.clear()
+
+broker.add_listener(_handle_event)
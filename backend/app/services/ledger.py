@@ -0,0 +1,230 @@
+"""
+Append-only auction ledger with periodic snapshots.
+
+Every change to a player's ownership is appended to auction_events in the same
+transaction as the change. Every SNAPSHOT_INTERVAL events the full ownership
+state is written to auction_snapshots, so the state as of any event id can be
+rebuilt from the nearest earlier snapshot plus the events after it, in time
+proportional to that tail rather than the whole history.
+
+The ledger covers ownership (team and sold price); team summaries rebuilt from
+it use the players' current roles.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from ..core.config import MAX_SQUAD_SIZE
+from ..models import AuctionEvent, AuctionSnapshot, Player, Team
+from . import team_budget
+
+# Write a snapshot whenever the event id reaches a multiple of this
+SNAPSHOT_INTERVAL = 100
+
+# player_id -> (team_id, sold_price) for every sold player
+OwnershipState = Dict[int, Tuple[int, Optional[float]]]
+
+def record(
+    db: Session,
+    event_type: str,
+    player_id: int,
+    team_id: Optional[int],
+    sold_price: Optional[float],
+    previous_team_id: Optional[int] = None,
+    previous_sold_price: Optional[float] = None
+) -> int:
+    """
+    Append an ownership change. Call after the players row has been updated,
+    inside the same transaction. Returns the event id.
+    """
+    return record_many(db, [{
+        "event_type": event_type,
+        "player_id": player_id,
+        "team_id": team_id,
+        "sold_price": sold_price,
+        "previous_team_id": previous_team_id,
+        "previous_sold_price": previous_sold_price,
+    }])[-1]
+
+def record_many(db: Session, events: List[Dict[str, Any]]) -> List[int]:
+    """
+    Append several ownership changes in order with one INSERT. Takes a snapshot
+    if the batch crosses a SNAPSHOT_INTERVAL boundary. Returns the event ids.
+    """
+    if not events:
+        return []
+    now = datetime.utcnow()
+    # Ids are assigned in parameter order; RETURNING order is not guaranteed,
+    # and requesting it would make SQLite fall back to one INSERT per row
+    ids = sorted(db.scalars(
+        insert(AuctionEvent).returning(AuctionEvent.id),
+        [{**event, "created_at": now} for event in events]
+    ))
+    last_id = ids[-1]
+    if last_id // SNAPSHOT_INTERVAL > (ids[0] - 1) // SNAPSHOT_INTERVAL:
+        # The players table already reflects every event in this transaction
+        take_snapshot(db, last_id)
+    return ids
+
+def current_state(db: Session) -> OwnershipState:
+    rows = db.query(Player.id, Player.team_id, Player.sold_price).filter(Player.team_id.isnot(None)).all()
+    return {row.id: (row.team_id, row.sold_price) for row in rows}
+
+def take_snapshot(db: Session, event_id: int) -> None:
+    """Store the current ownership as the state after event_id."""
+    db.add(AuctionSnapshot(
+        event_id=event_id,
+        state=json.dumps({str(player_id): list(owner) for player_id, owner in current_state(db).items()})
+    ))
+    db.flush()
+
+def last_event_id(db: Session) -> int:
+    return db.query(func.coalesce(func.max(AuctionEvent.id), 0)).scalar()
+
+def ensure_baseline(db: Session) -> bool:
+    """
+    Snapshot the current state if no snapshot exists yet, so that replay has a
+    starting point for databases created before the ledger. Returns True if
+    a snapshot was taken.
+    """
+    if db.query(AuctionSnapshot.id).first() is not None:
+        return False
+    take_snapshot(db, last_event_id(db))
+    db.commit()
+    return True
+
+def state_as_of(db: Session, event_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild ownership as it was right after event_id.
+    Returns None if no snapshot exists at or before event_id.
+    """
+    snapshot = (
+        db.query(AuctionSnapshot)
+        .filter(AuctionSnapshot.event_id <= event_id)
+        .order_by(AuctionSnapshot.event_id.desc())
+        .first()
+    )
+    if snapshot is None:
+        return None
+
+    state: OwnershipState = {
+        int(player_id): (owner[0], owner[1]) for player_id, owner in json.loads(snapshot.state).items()
+    }
+    tail = (
+        db.query(AuctionEvent.player_id, AuctionEvent.team_id, AuctionEvent.sold_price)
+        .filter(AuctionEvent.id > snapshot.event_id, AuctionEvent.id <= event_id)
+        .order_by(AuctionEvent.id)
+        .all()
+    )
+    for event in tail:
+        if event.team_id is None:
+            state.pop(event.player_id, None)
+        else:
+            state[event.player_id] = (event.team_id, event.sold_price)
+
+    return {
+        "event_id": event_id,
+        "snapshot_event_id": snapshot.event_id,
+        "replayed_events": len(tail),
+        "state": state,
+    }
+
+def summarize_teams(db: Session, state: OwnershipState) -> List[Dict[str, Any]]:
+    """Per-team squad size and spend for an ownership state."""
+    teams = db.query(Team.id, Team.name, Team.initial_purse).order_by(Team.id).all()
+    summary = {team.id: {"players_bought": 0, "total_spent": 0.0} for team in teams}
+    for team_id, sold_price in state.values():
+        if team_id in summary:
+            summary[team_id]["players_bought"] += 1
+            summary[team_id]["total_spent"] += float(sold_price or 0)
+    return [
+        {
+            "team_id": team.id,
+            "team_name": team.name,
+            "players_bought": summary[team.id]["players_bought"],
+            "total_spent": summary[team.id]["total_spent"],
+            "remaining_purse": float(team.initial_purse or 0) - summary[team.id]["total_spent"],
+        }
+        for team in teams
+    ]
+
+def limit_violations(db: Session, target: OwnershipState) -> List[str]:
+    """
+    Check an ownership state against the auction limits before restoring it:
+    every owning team must exist, own at most MAX_SQUAD_SIZE players and have
+    spent no more than its initial purse. Players deleted since are ignored,
+    as restore skips them. Returns one message per violation.
+    """
+    existing = {
+        player_id for (player_id,) in db.query(Player.id).filter(Player.id.in_(target.keys())).all()
+    } if target else set()
+    state = {player_id: owner for player_id, owner in target.items() if player_id in existing}
+    teams = summarize_teams(db, state)
+    known_teams = {team["team_id"] for team in teams}
+
+    violations = [
+        f"Team {team_id} no longer exists"
+        for team_id in sorted({team_id for team_id, _ in state.values()} - known_teams)
+    ]
+    for team in teams:
+        if team["players_bought"] > MAX_SQUAD_SIZE:
+            violations.append(
+                f"{team['team_name']} would own {team['players_bought']} players (maximum {MAX_SQUAD_SIZE})"
+            )
+        if team["remaining_purse"] < 0:
+            violations.append(
+                f"{team['team_name']} would spend {team['total_spent']:g}, "
+                f"{-team['remaining_purse']:g} over its purse"
+            )
+    return violations
+
+def restore(db: Session, target: OwnershipState) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Bring players back to the target ownership. Every player that changes is
+    updated, its team budgets adjusted and a restore event appended, so the
+    restore itself is part of the auditable history. The caller commits.
+    Returns (player row, previous state) pairs for the changed players.
+    """
+    current = current_state(db)
+    changed_ids = [
+        player_id for player_id in set(current) | set(target)
+        if current.get(player_id) != target.get(player_id)
+    ]
+    if not changed_ids:
+        return []
+
+    now = datetime.utcnow()
+    players = {p.id: p for p in db.query(Player).filter(Player.id.in_(changed_ids)).all()}
+    changes = []
+    events = []
+    for player_id in sorted(changed_ids):
+        player = players.get(player_id)
+        if player is None:
+            continue
+        previous = {field: getattr(player, field) for field in ("team_id", "sold_price", "role", "base_price")}
+        team_id, sold_price = target.get(player_id, (None, None))
+
+        if previous["team_id"] is not None:
+            team_budget.remove_player(db, previous["team_id"], previous["sold_price"], player.role)
+        if team_id is not None:
+            team_budget.add_player(db, team_id, sold_price, player.role)
+
+        player.team_id = team_id
+        player.sold_price = sold_price
+        player.updated_at = now
+        events.append({
+            "event_type": "restore",
+            "player_id": player_id,
+            "team_id": team_id,
+            "sold_price": sold_price,
+            "previous_team_id": previous["team_id"],
+            "previous_sold_price": previous["sold_price"],
+        })
+        changes.append((player, previous))
+
+    db.flush()
+    record_many(db, events)
+    return changes
@@ -0,0 +1,376 @@
+"""
+Ball-by-ball live scoring.
+
+Deliveries for an in-progress match are applied to an in-memory stats matrix
+(one row per player, columns as points_engine.STAT_FIELDS); after each batch
+the whole match is rescored in one vectorized pass. Running stats and points
+are flushed to player_match_stats / player_scores at most every
+FLUSH_INTERVAL_SECONDS, writing only the players whose score changed, so the
+database sees a few small upserts per interval instead of one write per ball.
+
+The flush also records the last applied delivery sequence on the match, so if
+the worker restarts the match is reloaded from the flushed stats and the
+scorer resends deliveries after that sequence. An over in progress at the
+restart cannot be credited as a maiden.
+
+Live state lives in this process: run a single worker.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..db.database import begin_immediate
+from ..models import Match, Player, PlayerMatchStats, PlayerScore
+from . import player_aggregates, points_engine
+from .events import broker, model_to_dict
+
+# Longest time running scores stay only in memory
+FLUSH_INTERVAL_SECONDS = 2.0
+
+# Dismissals credited to the bowler as a wicket
+BOWLER_WICKETS = frozenset({"bowled", "caught", "lbw", "stumped", "hit_wicket"})
+
+# Fielding stat credited to the fielder for each dismissal
+FIELDING_STATS = {"caught": "catches", "stumped": "stumpings", "run_out": "run_outs"}
+
+_COLUMN = {field: index for index, field in enumerate(points_engine.STAT_FIELDS)}
+
+class LiveMatchError(Exception):
+    """A delivery batch or state request that cannot be applied."""
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+class LiveMatch:
+    def __init__(self, match_id: int, last_sequence: int = 0):
+        self.match_id = match_id
+        self.lock = threading.Lock()
+        self.last_sequence = last_sequence
+        self.deliveries = 0
+        self.player_ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+        self.stats = np.zeros((32, len(points_engine.STAT_FIELDS)), dtype=np.int64)
+        self.points = np.zeros(0, dtype=np.float64)
+        self.owners: Dict[int, Optional[int]] = {}
+        self.score_ids: Dict[int, int] = {}
+        self.flushed_points: Dict[int, float] = {}
+        self.dirty: Set[int] = set()
+        # (innings, bowler_id, over) -> [legal balls, runs conceded]
+        self.overs: Dict[Tuple[int, int, int], List[int]] = {}
+        self.last_flushed_at: Optional[datetime] = None
+        self.next_flush = time.monotonic() + FLUSH_INTERVAL_SECONDS
+
+    def add_player(self, player_id: int, team_id: Optional[int]) -> int:
+        if len(self.player_ids) == len(self.stats):
+            self.stats = np.vstack([self.stats, np.zeros_like(self.stats)])
+        self.rows[player_id] = len(self.player_ids)
+        self.player_ids.append(player_id)
+        self.owners[player_id] = team_id
+        return self.rows[player_id]
+
+    def credit(self, player_id: int, field: str, amount: int = 1) -> None:
+        self.stats[self.rows[player_id], _COLUMN[field]] += amount
+        self.dirty.add(player_id)
+
+    def apply(self, delivery: Dict[str, Any]) -> None:
+        """Apply one delivery's runs, balls, wickets and fielding credits."""
+        batter, bowler = delivery["batter_id"], delivery["bowler_id"]
+        extra_type = delivery.get("extra_type")
+        runs = delivery.get("runs", 0)
+
+        self.credit(batter, "runs", runs)
+        if extra_type != "wide":
+            self.credit(batter, "balls")
+        if runs == 4:
+            self.credit(batter, "fours")
+        elif runs == 6:
+            self.credit(batter, "sixes")
+
+        # Byes and leg byes are not charged to the bowler; a maiden is a
+        # completed over of six legal balls conceding nothing
+        conceded = runs + (delivery.get("extras", 0) if extra_type in ("wide", "noball") else 0)
+        over = self.overs.setdefault((delivery.get("innings", 1), bowler, delivery["over"]), [0, 0])
+        over[1] += conceded
+        if extra_type not in ("wide", "noball"):
+            over[0] += 1
+            if over[0] == 6 and over[1] == 0:
+                self.credit(bowler, "maidens")
+
+        kind = delivery.get("wicket_kind")
+        if kind in BOWLER_WICKETS:
+            self.credit(bowler, "wickets")
+        fielder = delivery.get("fielder_id")
+        if kind in FIELDING_STATS and fielder is not None:
+            self.credit(fielder, FIELDING_STATS[kind])
+        self.dirty.add(bowler)
+
+    def rescore(self, rules: Dict[str, Any]) -> None:
+        self.points = points_engine.compute_points(self.stats[:len(self.player_ids)], rules)
+
+    def unflushed_deltas(self) -> Dict[int, float]:
+        """Points not yet in player_scores, per player."""
+        return {
+            player_id: float(self.points[self.rows[player_id]]) - self.flushed_points.get(player_id, 0.0)
+            for player_id in self.dirty
+            if self.rows[player_id] < len(self.points)
+        }
+
+    def lines(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "player_id": player_id,
+                "team_id": self.owners.get(player_id),
+                **{field: int(self.stats[row, column]) for field, column in _COLUMN.items()},
+                "points": float(self.points[row]) if row < len(self.points) else 0.0,
+            }
+            for player_id, row in self.rows.items()
+        ]
+
+class LiveScoring:
+    """Registry of the matches currently being scored live."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matches: Dict[int, LiveMatch] = {}
+
+    def get(self, match_id: int) -> Optional[LiveMatch]:
+        return self._matches.get(match_id)
+
+    def owns(self, match) -> bool:
+        """
+        Whether live scoring owns the match's score rows: it is loaded in this
+        worker, or (after a restart) has flushed live progress and is not completed.
+        match needs id, is_completed and live_sequence.
+        """
+        if match.id in self._matches:
+            return True
+        return (match.live_sequence or 0) > 0 and not bool(match.is_completed)
+
+    def _load(self, db: Session, match_id: int) -> LiveMatch:
+        """Return the live match, loading any flushed progress from the database."""
+        with self._lock:
+            live = self._matches.get(match_id)
+            if live is not None:
+                return live
+
+            match = db.query(Match.id, Match.is_completed, Match.live_sequence).filter(Match.id == match_id).first()
+            if match is None:
+                raise LiveMatchError(404, "Match not found")
+            if bool(match.is_completed):
+                raise LiveMatchError(400, "Cannot add deliveries for completed match")
+
+            live = LiveMatch(match_id, match.live_sequence or 0)
+            stats = db.query(
+                PlayerMatchStats,
+                Player.team_id
+            ).join(
+                Player, PlayerMatchStats.player_id == Player.id
+            ).filter(PlayerMatchStats.match_id == match_id).all()
+            for line, team_id in stats:
+                row = live.add_player(line.player_id, team_id)
+                live.stats[row] = [getattr(line, field) for field in points_engine.STAT_FIELDS]
+            for score_id, player_id, points in db.query(
+                PlayerScore.id, PlayerScore.player_id, PlayerScore.points
+            ).filter(PlayerScore.match_id == match_id).all():
+                live.score_ids[player_id] = score_id
+                live.flushed_points[player_id] = float(points or 0.0)
+            live.points = np.array(
+                [live.flushed_points.get(player_id, 0.0) for player_id in live.player_ids], dtype=np.float64
+            )
+            self._matches[match_id] = live
+            return live
+
+    def ingest(
+        self,
+        db: Session,
+        match_id: int,
+        deliveries: List[Dict[str, Any]],
+        rules: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Apply deliveries in order, skipping sequences already applied, then
+        rescore the match and flush if the interval has elapsed.
+        """
+        live = self._load(db, match_id)
+        # A batch that will flush reads and then writes, so it takes the write
+        # lock first. Like flush and complete, it does so before live.lock:
+        # waiting for the database while holding live.lock would deadlock with them
+        flush_due = time.monotonic() >= live.next_flush
+        if flush_due:
+            begin_immediate(db)
+        with live.lock:
+            new_ids = {
+                player_id
+                for delivery in deliveries
+                for player_id in (delivery["batter_id"], delivery["bowler_id"], delivery.get("fielder_id"))
+                if player_id is not None and player_id not in live.rows
+            }
+            if new_ids:
+                owners = dict(db.query(Player.id, Player.team_id).filter(Player.id.in_(new_ids)).all())
+                if len(owners) != len(new_ids):
+                    raise LiveMatchError(400, "One or more players not found")
+                for player_id in sorted(new_ids):
+                    live.add_player(player_id, owners[player_id])
+
+            accepted = duplicates = 0
+            for delivery in deliveries:
+                if delivery["sequence"] <= live.last_sequence:
+                    duplicates += 1
+                    continue
+                live.apply(delivery)
+                live.last_sequence = delivery["sequence"]
+                accepted += 1
+            live.deliveries += accepted
+            if accepted:
+                live.rescore(rules)
+
+            flushed = False
+            if live.dirty and flush_due:
+                self._flush(db, live)
+                flushed = True
+
+            return {
+                "match_id": match_id,
+                "accepted": accepted,
+                "duplicates": duplicates,
+                "last_sequence": live.last_sequence,
+                "flushed": flushed,
+            }
+
+    def _flush(self, db: Session, live: LiveMatch) -> None:
+        """
+        Write the changed players' stats and points. Caller has opened the
+        transaction with begin_immediate and then taken live.lock, in that order.
+        """
+        now = datetime.utcnow()
+        player_ids = sorted(live.dirty)
+        new_score_ids: Dict[int, int] = {}
+        if player_ids:
+            stats_stmt = sqlite_insert(PlayerMatchStats).values([
+                {
+                    "match_id": live.match_id,
+                    "player_id": player_id,
+                    **{field: int(live.stats[live.rows[player_id], column]) for field, column in _COLUMN.items()},
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for player_id in player_ids
+            ])
+            db.execute(stats_stmt.on_conflict_do_update(
+                index_elements=[PlayerMatchStats.match_id, PlayerMatchStats.player_id],
+                set_={
+                    **{field: getattr(stats_stmt.excluded, field) for field in points_engine.STAT_FIELDS},
+                    "updated_at": stats_stmt.excluded.updated_at,
+                }
+            ))
+
+            points = {player_id: float(live.points[live.rows[player_id]]) for player_id in player_ids}
+            existing = [player_id for player_id in player_ids if player_id in live.score_ids]
+            missing = [player_id for player_id in player_ids if player_id not in live.score_ids]
+            if existing:
+                db.execute(update(PlayerScore), [
+                    {"id": live.score_ids[player_id], "points": points[player_id], "updated_at": now}
+                    for player_id in existing
+                ])
+            if missing:
+                for score_id, player_id in db.execute(
+                    insert(PlayerScore).returning(PlayerScore.id, PlayerScore.player_id),
+                    [
+                        {"player_id": player_id, "match_id": live.match_id, "points": points[player_id],
+                         "created_at": now, "updated_at": now}
+                        for player_id in missing
+                    ]
+                ).all():
+                    new_score_ids[player_id] = score_id
+            player_aggregates.refresh(db, player_ids)
+
+        db.query(Match).filter(Match.id == live.match_id).update(
+            {"live_sequence": live.last_sequence}, synchronize_session=False
+        )
+        db.commit()
+
+        # Only committed rows may be updated by later flushes
+        live.score_ids.update(new_score_ids)
+        if player_ids:
+            live.flushed_points.update(points)
+        live.dirty.clear()
+        live.last_flushed_at = now
+        live.next_flush = time.monotonic() + FLUSH_INTERVAL_SECONDS
+        if player_ids:
+            broker.publish("scores_flushed", {"match_id": live.match_id, "player_ids": player_ids})
+
+    def flush(self, db: Session, match_id: int) -> Optional[LiveMatch]:
+        """Flush a live match now. Returns None if it is not being scored."""
+        live = self.get(match_id)
+        if live is not None:
+            begin_immediate(db)
+            with live.lock:
+                self._flush(db, live)
+        return live
+
+    def complete(self, db: Session, match_id: int) -> LiveMatch:
+        """
+        Flush the final scores, mark the match completed and drop its live
+        state. Returns the final live match.
+        """
+        begin_immediate(db)
+        live = self._load(db, match_id)
+        with live.lock:
+            self._flush(db, live)
+            db.query(Match).filter(Match.id == match_id).update({"is_completed": True}, synchronize_session=False)
+            db.commit()
+            with self._lock:
+                self._matches.pop(match_id, None)
+        match = db.query(Match).filter(Match.id == match_id).first()
+        broker.publish("match_update", {"match_id": match_id, "match": model_to_dict(match)})
+        return live
+
+    def state(self, live: LiveMatch) -> Dict[str, Any]:
+        with live.lock:
+            lines = live.lines()
+            team_totals: Dict[int, float] = {}
+            for line in lines:
+                if line["team_id"] is not None:
+                    team_totals[line["team_id"]] = team_totals.get(line["team_id"], 0.0) + line["points"]
+            return {
+                "match_id": live.match_id,
+                "last_sequence": live.last_sequence,
+                "deliveries": live.deliveries,
+                "unflushed_players": len(live.dirty),
+                "last_flushed_at": live.last_flushed_at,
+                "players": sorted(lines, key=lambda line: -line["points"]),
+                "team_totals": [
+                    {"team_id": team_id, "points": points}
+                    for team_id, points in sorted(team_totals.items(), key=lambda item: -item[1])
+                ],
+            }
+
+    def unflushed_team_points(self) -> Dict[int, float]:
+        """Live points not yet flushed to player_scores, per owning fantasy team."""
+        totals: Dict[int, float] = {}
+        for live in list(self._matches.values()):
+            with live.lock:
+                for player_id, delta in live.unflushed_deltas().items():
+                    team_id = live.owners.get(player_id)
+                    if team_id is not None and delta:
+                        totals[team_id] = totals.get(team_id, 0.0) + delta
+        return totals
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Broker listener keeping the owners of live players current."""
+        player = event["data"].get("player")
+        if player is None:
+            return
+        for live in list(self._matches.values()):
+            if player["id"] in live.owners:
+                with live.lock:
+                    live.owners[player["id"]] = player["team_id"]
+
+live_scoring = LiveScoring()
+broker.add_listener(live_scoring.handle_event)
@@ -0,0 +1,155 @@
+"""
+Maintenance of the player_aggregates summary table.
+
+Every code path that writes player_scores must call refresh with the affected
+player ids in the same transaction, and a role change must call set_role.
+Each refresh re-aggregates only those players' score rows (found through the
+player_id index), so the stored values are exactly what grouping the whole
+table would give, including min/max after a score goes down.
+
+Run as a module to verify or rebuild the table:
+    python -m app.services.player_aggregates check
+    python -m app.services.player_aggregates rebuild
+"""
+from sqlalchemy import func, delete, distinct, literal, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime
+
+from ..models import Player, PlayerAggregate, PlayerScore
+
+SUMMARY_FIELDS = [
+    "role", "matches_played", "score_count", "total_points",
+    "average_points", "highest_score", "lowest_score",
+]
+
+def _aggregate_select(player_ids: Optional[Iterable[int]] = None):
+    """Summary rows of PlayerAggregate, grouped from player_scores."""
+    matches_played = func.count(distinct(PlayerScore.match_id))
+    query = select(
+        PlayerScore.player_id,
+        Player.role,
+        matches_played,
+        func.count(PlayerScore.id),
+        func.sum(PlayerScore.points),
+        func.sum(PlayerScore.points) / matches_played,
+        func.max(PlayerScore.points),
+        func.min(PlayerScore.points),
+        literal(datetime.utcnow()),
+    ).join(
+        Player, Player.id == PlayerScore.player_id
+    )
+    if player_ids is not None:
+        query = query.where(PlayerScore.player_id.in_(player_ids))
+    return query.group_by(PlayerScore.player_id)
+
+INSERT_COLUMNS = ["player_id"] + SUMMARY_FIELDS + ["updated_at"]
+
+def refresh(db: Session, player_ids: Iterable[int]) -> None:
+    """Recompute the summary rows of the given players from their scores."""
+    player_ids = sorted(set(player_ids))
+    if not player_ids:
+        return
+    stmt = insert(PlayerAggregate).from_select(INSERT_COLUMNS, _aggregate_select(player_ids))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlayerAggregate.player_id],
+        set_={field: getattr(stmt.excluded, field) for field in SUMMARY_FIELDS + ["updated_at"]}
+    )
+    db.execute(stmt)
+
+def set_role(db: Session, player_id: int, role: Optional[str]) -> None:
+    """Copy a player's new role to their summary row, if they have one."""
+    db.execute(
+        update(PlayerAggregate)
+        .where(PlayerAggregate.player_id == player_id)
+        .values(role=role, updated_at=datetime.utcnow())
+    )
+
+def compute_from_scores(db: Session) -> Dict[int, Dict[str, Any]]:
+    """
+    Aggregate the authoritative per-player summary from the player_scores table.
+    """
+    return {
+        row[0]: dict(zip(SUMMARY_FIELDS, row[1:-1]))
+        for row in db.execute(_aggregate_select()).all()
+    }
+
+def check_consistency(db: Session) -> List[Dict[str, Any]]:
+    """
+    Compare player_aggregates against the player_scores table.
+    Returns one entry per player whose stored summary differs from the actual one.
+    """
+    expected = compute_from_scores(db)
+    stored = {aggregate.player_id: aggregate for aggregate in db.query(PlayerAggregate).all()}
+
+    def differs(recorded, actual):
+        if recorded is None or actual is None or isinstance(actual, str):
+            return recorded != actual
+        return abs(float(recorded) - float(actual)) > 1e-6
+
+    mismatches = []
+    for player_id, actual in expected.items():
+        aggregate = stored.get(player_id)
+        recorded = {
+            field: (getattr(aggregate, field) if aggregate is not None else None)
+            for field in SUMMARY_FIELDS
+        }
+        differing = [field for field in SUMMARY_FIELDS if differs(recorded[field], actual[field])]
+        if differing:
+            mismatches.append({
+                "player_id": player_id,
+                "fields": differing,
+                "stored": recorded,
+                "actual": actual,
+            })
+    for player_id in stored.keys() - expected.keys():
+        mismatches.append({"player_id": player_id, "fields": ["player_id"], "stored": None, "actual": None})
+    return mismatches
+
+def rebuild(db: Session) -> int:
+    """
+    Recompute player_aggregates from the player_scores table. The caller commits.
+    Returns the number of players written.
+    """
+    db.execute(delete(PlayerAggregate))
+    db.execute(insert(PlayerAggregate).from_select(INSERT_COLUMNS, _aggregate_select()))
+    return db.query(func.count(PlayerAggregate.player_id)).scalar()
+
+def ensure_populated(db: Session) -> bool:
+    """
+    Build player_aggregates from player_scores if it is empty but scores exist,
+    e.g. for a database whose tables were created before the summary existed.
+    Returns True if rebuilt.
+    """
+    if db.query(PlayerAggregate.player_id).first() is not None:
+        return False
+    if db.query(PlayerScore.id).first() is None:
+        return False
+    rebuild(db)
+    db.commit()
+    return True
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from ..db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild the player_aggregates table")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            count = rebuild(session)
+            session.commit()
+            print(f"Rebuilt aggregates for {count} players")
+        else:
+            mismatches = check_consistency(session)
+            for mismatch in mismatches:
+                print(f"Player {mismatch['player_id']}: {', '.join(mismatch['fields'])} out of sync")
+            print("player_aggregates is consistent" if not mismatches else f"{len(mismatches)} players out of sync")
+            sys.exit(1 if mismatches else 0)
+    finally:
+        session.close()
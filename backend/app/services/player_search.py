@@ -0,0 +1,156 @@
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from typing import List
+
+FTS_TABLE = "players_fts"
+
+# Fuzzy matches need at least this trigram similarity (see _similarity)
+FUZZY_MIN_SIMILARITY = 0.25
+
+# External-content FTS5 table over players.name, kept in sync by triggers so that
+# every insert/update/delete on players (ORM or raw SQL) is reflected immediately.
+# The trigram tokenizer supports substring matching and trigram-overlap fuzzy search.
+SCHEMA_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, content='players', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON players BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON players BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name ON players BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+]
+
+_fts_available = True
+
+def ensure_search_index(engine, rebuild: bool = False) -> bool:
+    """
+    Create the player name search index and its sync triggers if missing.
+    The index is (re)built from the players table when first created or when
+    rebuild is True. Returns False if this SQLite build lacks FTS5, in which
+    case search falls back to LIKE matching.
+    """
+    global _fts_available
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE}
+            ).first() is not None
+            for statement in SCHEMA_STATEMENTS:
+                conn.execute(text(statement))
+            if rebuild or not exists:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError:
+        _fts_available = False
+        return False
+    _fts_available = True
+    return True
+
+def _trigrams(value: str) -> set:
+    value = value.lower()
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+def _word_trigrams(value: str) -> set:
+    """Trigrams of each word padded like pg_trgm ("  w", " wo", ..., "rd "), so word starts and ends count."""
+    return {trigram for word in value.lower().split() for trigram in _trigrams(f"  {word} ")}
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def _similarity(query_trigrams: set, name: str) -> float:
+    """
+    Jaccard similarity |q & n| / |q | n| of padded trigrams, against the whole
+    name or its best matching word, so a surname alone is not penalised for
+    the length of the full name.
+    """
+    words = [_word_trigrams(word) for word in name.split()]
+    return max([_jaccard(query_trigrams, _word_trigrams(name))] + [_jaccard(query_trigrams, w) for w in words])
+
+def _quote(term: str) -> str:
+    """Quote a term as an FTS5 string literal."""
+    return '"' + term.replace('"', '""') + '"'
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def search_player_ids(db: Session, q: str, limit: int = 10) -> List[int]:
+    """
+    Return ids of players whose name matches q, best matches first:
+    1. Names containing q, ranked name-prefix, then word-prefix, then substring
+    2. If that leaves room, names sharing enough trigrams with q (typo tolerance)
+    """
+    q = " ".join(q.split())
+    if not q:
+        return []
+    
+    like_params = {
+        "prefix": f"{_escape_like(q)}%",
+        "word_prefix": f"% {_escape_like(q)}%",
+        "limit": limit
+    }
+    ranking = (
+        "CASE WHEN p.name LIKE :prefix ESCAPE '\\' THEN 0 "
+        "WHEN p.name LIKE :word_prefix ESCAPE '\\' THEN 1 ELSE 2 END"
+    )
+    
+    # The trigram tokenizer needs at least three characters to use the index
+    if not _fts_available or len(q) < 3:
+        rows = db.execute(
+            text(
+                f"SELECT p.id FROM players p "
+                f"WHERE p.name LIKE :prefix ESCAPE '\\' OR p.name LIKE :word_prefix ESCAPE '\\' "
+                f"ORDER BY {ranking}, p.name LIMIT :limit"
+            ),
+            like_params
+        ).all()
+        return [row.id for row in rows]
+    
+    rows = db.execute(
+        text(
+            f"SELECT p.id FROM {FTS_TABLE} f JOIN players p ON p.id = f.rowid "
+            f"WHERE {FTS_TABLE} MATCH :phrase "
+            f"ORDER BY {ranking}, p.name LIMIT :limit"
+        ),
+        {**like_params, "phrase": _quote(q)}
+    ).all()
+    player_ids = [row.id for row in rows]
+    if len(player_ids) >= limit:
+        return player_ids
+    
+    # Fuzzy fallback: candidates sharing any trigram (in FTS rank order),
+    # re-ranked by trigram similarity with ties kept in rank order
+    candidates = db.execute(
+        text(
+            f"SELECT p.id, p.name FROM {FTS_TABLE} f JOIN players p ON p.id = f.rowid "
+            f"WHERE {FTS_TABLE} MATCH :terms ORDER BY f.rank LIMIT :candidates"
+        ),
+        {"terms": " OR ".join(_quote(t) for t in sorted(_trigrams(q))), "candidates": max(limit * 5, 50)}
+    ).all()
+    
+    query_trigrams = _word_trigrams(q)
+    seen = set(player_ids)
+    scored = []
+    for position, candidate in enumerate(candidates):
+        if candidate.id in seen:
+            continue
+        similarity = _similarity(query_trigrams, candidate.name)
+        if similarity >= FUZZY_MIN_SIMILARITY:
+            scored.append((-similarity, position, candidate.id))
+    scored.sort()
+    player_ids.extend(player_id for _, _, player_id in scored[:limit - len(player_ids)])
+    return player_ids
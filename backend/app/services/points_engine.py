@@ -0,0 +1,86 @@
+"""
+Vectorized fantasy points engine.
+
+Raw scorecard lines are packed into an (n_players, len(STAT_FIELDS)) integer
+matrix and scored with whole-array NumPy operations, so a season of lines
+costs the same handful of array passes as a single match:
+
+- per-unit points: stats @ weights
+- milestone bonuses (runs, wickets, catches): only the highest threshold
+  reached counts, applied with one np.where per threshold
+- strike-rate bands: for batters who faced at least strike_rate_min_balls
+
+Totals are clipped at zero because player_scores holds non-negative points.
+
+Rules are plain dicts shaped like schemas.scores.PointsRules.
+"""
+from typing import Any, Dict, Iterable, List, Mapping
+
+import numpy as np
+
+STAT_FIELDS = ("runs", "balls", "fours", "sixes", "wickets", "maidens", "catches", "stumpings", "run_outs")
+
+# Rule key holding the per-unit points of each stat (balls score nothing directly)
+UNIT_RULES = {
+    "runs": "run",
+    "fours": "four",
+    "sixes": "six",
+    "wickets": "wicket",
+    "maidens": "maiden",
+    "catches": "catch",
+    "stumpings": "stumping",
+    "run_outs": "run_out",
+}
+
+# Stat each milestone rule applies to
+MILESTONE_RULES = {
+    "runs": "run_milestones",
+    "wickets": "wicket_milestones",
+    "catches": "catch_milestones",
+}
+
+_COLUMN = {field: index for index, field in enumerate(STAT_FIELDS)}
+
+def stats_matrix(lines: Iterable[Any]) -> np.ndarray:
+    """Pack scorecard lines (objects or dicts with STAT_FIELDS) into an int matrix."""
+    rows = [
+        [line[field] if isinstance(line, Mapping) else getattr(line, field) for field in STAT_FIELDS]
+        for line in lines
+    ]
+    return np.array(rows, dtype=np.int64).reshape(len(rows), len(STAT_FIELDS))
+
+def _milestone_bonus(values: np.ndarray, milestones: Mapping[Any, float]) -> np.ndarray:
+    """Bonus of the highest milestone each value reaches (0 if none)."""
+    bonus = np.zeros(len(values), dtype=np.float64)
+    for threshold, points in sorted((int(t), float(p)) for t, p in milestones.items()):
+        bonus = np.where(values >= threshold, points, bonus)
+    return bonus
+
+def compute_points(stats: np.ndarray, rules: Dict[str, Any]) -> np.ndarray:
+    """Fantasy points for each row of a stats_matrix under the given rules."""
+    if len(stats) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    weights = np.array(
+        [float(rules[UNIT_RULES[field]]) if field in UNIT_RULES else 0.0 for field in STAT_FIELDS]
+    )
+    points = stats @ weights
+
+    for field, rule in MILESTONE_RULES.items():
+        points += _milestone_bonus(stats[:, _COLUMN[field]], rules[rule])
+
+    runs = stats[:, _COLUMN["runs"]]
+    balls = stats[:, _COLUMN["balls"]]
+    eligible = balls >= max(int(rules["strike_rate_min_balls"]), 1)
+    strike_rate = np.divide(runs * 100.0, balls, out=np.zeros(len(stats)), where=balls > 0)
+    for band in rules["strike_rate_bands"]:
+        in_band = eligible & (strike_rate >= band["min"])
+        if band.get("max") is not None:
+            in_band &= strike_rate < band["max"]
+        points += np.where(in_band, float(band["points"]), 0.0)
+
+    return np.maximum(points, 0.0)
+
+def score_lines(lines: List[Any], rules: Dict[str, Any]) -> List[float]:
+    """Convenience wrapper returning plain floats in input order."""
+    return compute_points(stats_matrix(lines), rules).tolist()
@@ -0,0 +1,268 @@
+"""
+Cumulative fantasy points by match, for race charts.
+
+Points are held as a dense player x match matrix (columns in match_number
+order, one per fixture, unplayed ones zero). Team series are the rows of the
+players each team currently owns added together, like the leaderboard, and
+both are turned into running totals with one np.cumsum along the match axis.
+
+The matrix is loaded on first use and then kept current from events:
+- score writes, corrections included, mark their match columns stale; the
+  next read reloads just those columns with one grouped query
+- ownership changes move a player's row to another team without a query
+- anything the matrix does not know yet (a new player, team or match) makes
+  the next read reload everything
+
+Events are published after commit, so a read between a write and its event
+may already see the new scores; re-reading the stale columns (rather than
+applying deltas) keeps them counted once.
+
+The team running totals double as a prefix-sum index for point-in-time
+standings: a team's points after match N are one lookup in its row, and a
+parallel running count of matches in which the squad scored gives matches
+played, so standings as of any match cost O(teams).
+
+Cumulative arrays are cached until the next change. Unflushed live points are
+not included. Like the other in-process state it is per worker.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import Match, Player, PlayerScore, Team
+from .cache import PLAYER_EVENTS
+from .events import broker
+from .leaderboard import sort_key
+
+# Score write events and the key holding their match id(s)
+SCORE_EVENTS = {
+    "scores_recorded": "match_id",
+    "scores_flushed": "match_id",
+    "scores_recomputed": "match_ids",
+    "scores_imported": "match_ids",
+    "score_correction": "match_id",
+}
+
+# Fixture events and the key holding their match id(s)
+MATCH_EVENTS = {
+    "match_create": "match_id",
+    "match_update": "match_id",
+    "matches_imported": "match_ids",
+}
+
+class PointsSeries:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._stale_matches: Set[int] = set()
+        self.match_ids: List[int] = []
+        self.match_numbers: List[int] = []
+        self._columns: Dict[int, int] = {}
+        self.player_ids: List[int] = []
+        self.player_names: List[str] = []
+        self._rows: Dict[int, int] = {}
+        self.team_ids: List[int] = []
+        self.team_names: List[str] = []
+        self.team_owners: List[str] = []
+        self._team_rows: Dict[int, int] = {}
+        self._owners = np.zeros(0, dtype=np.int64)  # team row of each player, -1 if unsold
+        self._points = np.zeros((0, 0), dtype=np.float64)
+        self._scored = np.zeros((0, 0), dtype=bool)  # player has a score row in the match
+        self._player_cumulative: Optional[np.ndarray] = None
+        self._team_cumulative: Optional[np.ndarray] = None
+        self._team_matches_played: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        """Drop everything; the next read reloads from the database."""
+        with self._lock:
+            self._loaded = False
+
+    def _changed(self) -> None:
+        self._player_cumulative = self._team_cumulative = self._team_matches_played = None
+
+    def _load(self, db: Session) -> None:
+        matches = db.query(Match.id, Match.match_number).order_by(Match.match_number).all()
+        players = db.query(Player.id, Player.name, Player.team_id).order_by(Player.id).all()
+        teams = db.query(Team.id, Team.name, Team.owner_name).order_by(Team.id).all()
+
+        self.match_ids = [match.id for match in matches]
+        self.match_numbers = [match.match_number for match in matches]
+        self._columns = {match_id: column for column, match_id in enumerate(self.match_ids)}
+        self.team_ids = [team.id for team in teams]
+        self.team_names = [team.name for team in teams]
+        self.team_owners = [team.owner_name for team in teams]
+        self._team_rows = {team_id: row for row, team_id in enumerate(self.team_ids)}
+        self.player_ids = [player.id for player in players]
+        self.player_names = [player.name for player in players]
+        self._rows = {player_id: row for row, player_id in enumerate(self.player_ids)}
+        self._owners = np.array(
+            [self._team_rows.get(player.team_id, -1) for player in players], dtype=np.int64
+        )
+        self._points = np.zeros((len(players), len(matches)), dtype=np.float64)
+        self._scored = np.zeros((len(players), len(matches)), dtype=bool)
+        self._fill(db, None)
+        self._stale_matches = set()
+        self._loaded = True
+        self._changed()
+
+    def _fill(self, db: Session, match_ids: Optional[Set[int]]) -> bool:
+        """
+        Write per-player match totals into the matrix, for every match or only
+        match_ids. Returns False if a score refers to an unknown player or match.
+        """
+        query = db.query(
+            PlayerScore.player_id,
+            PlayerScore.match_id,
+            func.sum(PlayerScore.points).label('points')
+        ).group_by(PlayerScore.player_id, PlayerScore.match_id)
+        if match_ids is not None:
+            query = query.filter(PlayerScore.match_id.in_(match_ids))
+        rows = query.all()
+        if any(row.player_id not in self._rows or row.match_id not in self._columns for row in rows):
+            return False
+        if rows:
+            cells = (
+                [self._rows[row.player_id] for row in rows],
+                [self._columns[row.match_id] for row in rows]
+            )
+            self._points[cells] = [float(row.points or 0) for row in rows]
+            self._scored[cells] = True
+        return True
+
+    def _refresh(self, db: Session) -> None:
+        if not self._loaded:
+            self._load(db)
+            return
+        if not self._stale_matches:
+            return
+        if not self._stale_matches <= self._columns.keys():
+            self._load(db)
+            return
+        columns = [self._columns[match_id] for match_id in self._stale_matches]
+        self._points[:, columns] = 0.0
+        self._scored[:, columns] = False
+        if not self._fill(db, self._stale_matches):
+            self._load(db)
+            return
+        self._stale_matches = set()
+        self._changed()
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Broker listener keeping the matrix and squads current."""
+        event_type, data = event["type"], event["data"]
+        with self._lock:
+            if not self._loaded:
+                return
+            if event_type in SCORE_EVENTS:
+                match_ids = data[SCORE_EVENTS[event_type]]
+                self._stale_matches.update([match_ids] if isinstance(match_ids, int) else match_ids)
+            elif event_type in MATCH_EVENTS:
+                # Match numbers never change, so only a new fixture needs a column
+                match_ids = data[MATCH_EVENTS[event_type]]
+                if not set([match_ids] if isinstance(match_ids, int) else match_ids) <= self._columns.keys():
+                    self._loaded = False
+            elif event_type in PLAYER_EVENTS:
+                player = data["player"]
+                row = self._rows.get(player["id"])
+                team_row = self._team_rows.get(player["team_id"], -1) if player["team_id"] is not None else -1
+                if row is None or (player["team_id"] is not None and team_row < 0):
+                    self._loaded = False
+                    return
+                self._owners[row] = team_row
+                self.player_names[row] = player["name"]
+                self._changed()
+            elif event_type == "team_create":
+                self._loaded = False
+            elif event_type == "team_update":
+                row = self._team_rows.get(data["team"]["id"])
+                if row is not None:
+                    self.team_names[row] = data["team"]["name"]
+                    self.team_owners[row] = data["team"]["owner_name"]
+
+    def _team_totals(self) -> None:
+        """Build the cached team running totals and matches-played counts."""
+        if self._team_cumulative is None:
+            shape = (len(self.team_ids), len(self.match_ids))
+            team_points = np.zeros(shape, dtype=np.float64)
+            team_scored = np.zeros(shape, dtype=bool)
+            owned = self._owners >= 0
+            np.add.at(team_points, self._owners[owned], self._points[owned])
+            np.logical_or.at(team_scored, self._owners[owned], self._scored[owned])
+            self._team_cumulative = np.cumsum(team_points, axis=1)
+            self._team_matches_played = np.cumsum(team_scored, axis=1)
+
+    def team_series(self, db: Session) -> Dict[str, Any]:
+        """Running team totals: match_numbers plus one (team_id, name, cumulative) per team."""
+        with self._lock:
+            self._refresh(db)
+            self._team_totals()
+            return {
+                "match_numbers": list(self.match_numbers),
+                "series": [
+                    {"id": team_id, "name": name, "cumulative_points": cumulative}
+                    for team_id, name, cumulative in zip(
+                        self.team_ids, self.team_names, self._team_cumulative.tolist()
+                    )
+                ],
+            }
+
+    def player_series(
+        self,
+        db: Session,
+        player_ids: Optional[List[int]] = None,
+        team_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Running player totals for the given players, or the players of team_id,
+        or else every player with points.
+        """
+        with self._lock:
+            self._refresh(db)
+            if self._player_cumulative is None:
+                self._player_cumulative = np.cumsum(self._points, axis=1)
+            if player_ids is not None:
+                rows = np.array([self._rows[p] for p in player_ids if p in self._rows], dtype=np.int64)
+            elif team_id is not None:
+                rows = np.flatnonzero(self._owners == self._team_rows.get(team_id, -2))
+            else:
+                rows = np.flatnonzero(self._points.any(axis=1))
+            return {
+                "match_numbers": list(self.match_numbers),
+                "series": [
+                    {"id": self.player_ids[row], "name": self.player_names[row], "cumulative_points": cumulative}
+                    for row, cumulative in zip(rows.tolist(), self._player_cumulative[rows].tolist())
+                ],
+            }
+
+    def standings(self, db: Session, as_of_match: int) -> List[Dict[str, Any]]:
+        """
+        Leaderboard rows (as services.leaderboard.get_leaderboard) counting only
+        matches numbered up to as_of_match, with the current squads.
+        """
+        with self._lock:
+            self._refresh(db)
+            self._team_totals()
+            column = int(np.searchsorted(self.match_numbers, as_of_match, side="right")) - 1
+            if column < 0:
+                return []
+            totals = self._team_cumulative[:, column].tolist()
+            played = self._team_matches_played[:, column].tolist()
+            entries = [
+                {
+                    "team_id": team_id,
+                    "team_name": self.team_names[row],
+                    "owner_name": self.team_owners[row],
+                    "matches_played": played[row],
+                    "total_points": totals[row],
+                }
+                for row, team_id in enumerate(self.team_ids)
+                # Like the leaderboard, list only teams with at least one score
+                if played[row] > 0
+            ]
+        return sorted(entries, key=sort_key)
+
+points_series = PointsSeries()
+broker.add_listener(points_series.handle_event)
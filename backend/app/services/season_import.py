@@ -0,0 +1,317 @@
+"""
+Streaming backfill of past seasons: fixtures and per-player scores.
+
+Input is JSONL or CSV, one record per line. A `type` field says what each
+record is:
+- match: match_number, team1, team2, match_date (YYYY-MM-DD), venue
+- score: match_number, player_id or player_name, points
+
+CSV files use those names as the header; unused columns may be left empty.
+Scores may refer to matches earlier in the file or already in the database.
+
+Records are read lazily and processed in chunks of chunk_size. Each chunk is
+validated with a few set-based queries and written with bulk INSERTs in its
+own transaction, so memory stays bounded by the chunk size (plus the player
+name index) whatever the file size. Matches that receive scores are marked
+completed, like /api/scores/batch. With stop_on_error the import stops at
+the first chunk containing an invalid record, keeping earlier chunks;
+otherwise invalid records are reported and skipped. Scores for a match that
+is being scored live are rejected. Bytes that are not valid UTF-8 also stop
+the import: the counts in the result then cover the chunks already
+committed.
+
+Run as a module to import a file:
+    python -m app.services.season_import season.jsonl [--format csv] [--chunk-size 1000]
+"""
+import csv
+import json
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from ..db.database import begin_immediate
+from ..models import Match, Player, PlayerScore
+from ..schemas.matches import MatchCreate
+from . import player_aggregates
+from .events import broker
+from .live_scoring import live_scoring
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Errors reported in the result; further errors are only counted
+MAX_REPORTED_ERRORS = 100
+
+Record = Tuple[int, Dict[str, Any]]
+
+def read_jsonl(stream: IO[str]) -> Iterator[Record]:
+    """Yield (line number, record) for each non-blank JSONL line."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            record = {"__error__": f"Invalid JSON: {e.msg}"}
+        yield line_number, record if isinstance(record, dict) else {"__error__": "Expected a JSON object"}
+
+def read_csv(stream: IO[str]) -> Iterator[Record]:
+    """Yield (line number, record) for each CSV row, dropping empty cells."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in (None, "")}
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv}
+
+def _chunks(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    chunk: List[Record] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class SeasonImporter:
+    def __init__(self, db: Session, chunk_size: int = DEFAULT_CHUNK_SIZE, stop_on_error: bool = False):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.stop_on_error = stop_on_error
+        self.result = {
+            "records_read": 0,
+            "matches_created": 0,
+            "scores_created": 0,
+            "chunks_committed": 0,
+            "error_count": 0,
+            "errors": [],
+            "stopped": False,
+        }
+        self._player_names: Optional[Dict[str, Optional[int]]] = None
+
+    def _error(self, line: int, detail: str) -> None:
+        self.result["error_count"] += 1
+        if len(self.result["errors"]) < MAX_REPORTED_ERRORS:
+            self.result["errors"].append({"line": line, "detail": detail})
+
+    def _player_index(self) -> Dict[str, Optional[int]]:
+        """Lower-cased player name -> id (None if ambiguous), loaded on first use."""
+        if self._player_names is None:
+            self._player_names = {}
+            for player_id, name in self.db.query(Player.id, Player.name).all():
+                key = name.strip().lower()
+                self._player_names[key] = None if key in self._player_names else player_id
+        return self._player_names
+
+    def _track_lines(self, records: Iterable[Record]) -> Iterator[Record]:
+        for line, record in records:
+            self._last_line = line
+            yield line, record
+
+    def run(self, records: Iterable[Record]) -> Dict[str, Any]:
+        self._last_line = 0
+        try:
+            for chunk in _chunks(self._track_lines(records), self.chunk_size):
+                self.result["records_read"] += len(chunk)
+                keep_going = self._import_chunk(chunk)
+                # Chunk errors are found in several passes; report them in file order
+                self.result["errors"].sort(key=lambda error: error["line"])
+                if not keep_going:
+                    self.result["stopped"] = True
+                    break
+        except UnicodeDecodeError:
+            # Earlier chunks stay committed; the partly read chunk is dropped
+            self._error(self._last_line + 1, "Invalid UTF-8 at or after this line; the import stopped")
+            self.result["stopped"] = True
+        return self.result
+
+    def _import_chunk(self, chunk: List[Record]) -> bool:
+        """Validate and write one chunk. Returns False if the import should stop."""
+        db = self.db
+        begin_immediate(db)
+        errors_before = self.result["error_count"]
+
+        match_records = [(line, record) for line, record in chunk if record.get("type") == "match"]
+        score_records = [(line, record) for line, record in chunk if record.get("type") == "score"]
+        for line, record in chunk:
+            if "__error__" in record:
+                self._error(line, record["__error__"])
+            elif record.get("type") not in ("match", "score"):
+                self._error(line, "type must be 'match' or 'score'")
+
+        # Fixtures: schema validation, then one query for numbers already taken
+        new_matches = []
+        for line, record in match_records:
+            try:
+                match = MatchCreate(**{key: value for key, value in record.items() if key != "type"})
+                match.validate_teams()
+            except ValidationError as e:
+                error = e.errors()[0]
+                self._error(line, f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}")
+                continue
+            except ValueError as e:
+                self._error(line, str(e))
+                continue
+            new_matches.append((line, match))
+        numbers = [match.match_number for _, match in new_matches]
+        taken = {
+            number for (number,) in db.query(Match.match_number).filter(Match.match_number.in_(numbers)).all()
+        } if numbers else set()
+        seen = set()
+        match_rows = []
+        for line, match in new_matches:
+            if match.match_number in taken or match.match_number in seen:
+                self._error(line, f"Match number {match.match_number} already exists")
+                continue
+            seen.add(match.match_number)
+            match_rows.append({
+                "match_number": match.match_number,
+                "team1": match.team1.value,
+                "team2": match.team2.value,
+                "match_date": match.match_date,
+                "venue": match.venue,
+                "is_completed": False,
+            })
+
+        # Scores: parse, resolve players and matches in bulk
+        parsed_scores = []
+        for line, record in score_records:
+            try:
+                match_number = int(record["match_number"])
+                points = float(record["points"])
+            except (KeyError, TypeError, ValueError):
+                self._error(line, "score records need a numeric match_number and points")
+                continue
+            if points < 0:
+                self._error(line, "points must be greater than or equal to 0")
+                continue
+            if record.get("player_id") not in (None, ""):
+                try:
+                    player_key: Any = int(record["player_id"])
+                except (TypeError, ValueError):
+                    self._error(line, "player_id must be an integer")
+                    continue
+            elif record.get("player_name"):
+                player_key = str(record["player_name"]).strip().lower()
+            else:
+                self._error(line, "score records need a player_id or player_name")
+                continue
+            parsed_scores.append((line, match_number, player_key, points))
+
+        ids = {key for _, _, key, _ in parsed_scores if isinstance(key, int)}
+        known_ids = {
+            player_id for (player_id,) in db.query(Player.id).filter(Player.id.in_(ids)).all()
+        } if ids else set()
+        names = self._player_index() if any(isinstance(key, str) for _, _, key, _ in parsed_scores) else {}
+
+        now = datetime.utcnow()
+        new_match_ids: Dict[int, int] = {}
+        if match_rows:
+            new_match_ids = {
+                number: match_id
+                for match_id, number in db.execute(
+                    insert(Match).returning(Match.id, Match.match_number),
+                    [{**row, "created_at": now, "updated_at": now} for row in match_rows]
+                ).all()
+            }
+        wanted = {number for _, number, _, _ in parsed_scores} - new_match_ids.keys()
+        existing_matches = db.query(
+            Match.id, Match.match_number, Match.is_completed, Match.live_sequence
+        ).filter(Match.match_number.in_(wanted)).all() if wanted else []
+        match_ids = {**{row.match_number: row.id for row in existing_matches}, **new_match_ids}
+        # Score rows of a live match belong to live scoring, as for /api/scores
+        live_numbers = {row.match_number for row in existing_matches if live_scoring.owns(row)}
+
+        resolved = []
+        for line, number, player_key, points in parsed_scores:
+            match_id = match_ids.get(number)
+            player_id = player_key if isinstance(player_key, int) and player_key in known_ids else names.get(player_key)
+            if match_id is None:
+                self._error(line, f"Match number {number} not found")
+            elif number in live_numbers:
+                self._error(line, f"Match number {number} is being scored live")
+            elif player_id is None:
+                problem = "matches several players" if player_key in names else "not found"
+                self._error(line, f"Player {player_key} {problem}")
+            else:
+                resolved.append((line, match_id, player_id, points))
+
+        # One query for (match, player) pairs that already have a score
+        pairs = {(match_id, player_id) for _, match_id, player_id, _ in resolved}
+        scored = set()
+        if pairs:
+            scored = set(db.query(PlayerScore.match_id, PlayerScore.player_id).filter(
+                PlayerScore.match_id.in_({match_id for match_id, _ in pairs}),
+                PlayerScore.player_id.in_({player_id for _, player_id in pairs})
+            ).all())
+        score_rows = []
+        for line, match_id, player_id, points in resolved:
+            if (match_id, player_id) in scored:
+                self._error(line, "A score already exists for this player in this match")
+                continue
+            scored.add((match_id, player_id))
+            score_rows.append({
+                "match_id": match_id, "player_id": player_id, "points": points,
+                "created_at": now, "updated_at": now,
+            })
+
+        if self.stop_on_error and self.result["error_count"] > errors_before:
+            db.rollback()
+            return False
+
+        if score_rows:
+            db.execute(insert(PlayerScore), score_rows)
+            completed = sorted({row["match_id"] for row in score_rows})
+            db.execute(update(Match).where(Match.id.in_(completed)).values(is_completed=True, updated_at=now))
+            player_aggregates.refresh(db, {row["player_id"] for row in score_rows})
+        db.commit()
+
+        self.result["matches_created"] += len(match_rows)
+        self.result["scores_created"] += len(score_rows)
+        self.result["chunks_committed"] += 1
+        if new_match_ids:
+            broker.publish("matches_imported", {"match_ids": sorted(new_match_ids.values())})
+        if score_rows:
+            broker.publish("scores_imported", {
+                "match_ids": completed,
+                "player_ids": sorted({row["player_id"] for row in score_rows}),
+            })
+        return True
+
+def import_stream(
+    db: Session,
+    stream: IO[str],
+    file_format: str = "jsonl",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    stop_on_error: bool = False
+) -> Dict[str, Any]:
+    """Import a JSONL or CSV text stream. Returns the import summary."""
+    return SeasonImporter(db, chunk_size, stop_on_error).run(READERS[file_format](stream))
+
+if __name__ == "__main__":
+    import argparse
+    from ..db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Import a season of fixtures and scores")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(READERS), help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--stop-on-error", action="store_true")
+    args = parser.parse_args()
+
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    session = SessionLocal()
+    try:
+        with open(args.path, newline="", encoding="utf-8") as f:
+            result = import_stream(session, f, file_format, args.chunk_size, args.stop_on_error)
+    finally:
+        session.close()
+    for error in result["errors"]:
+        print(f"line {error['line']}: {error['detail']}")
+    print(
+        f"{result['records_read']} records: {result['matches_created']} matches, "
+        f"{result['scores_created']} scores imported, {result['error_count']} errors"
+        + (" (stopped)" if result["stopped"] else "")
+    )
@@ -0,0 +1,203 @@
+"""
+Maintenance of the team_budgets summary table.
+
+Every code path that changes a player's team_id, sold_price or role must call
+add_player / remove_player in the same transaction, so that purse and squad
+checks become single-row lookups instead of scans over players.
+
+Run as a module to verify or rebuild the table:
+    python -m app.services.team_budget check
+    python -m app.services.team_budget rebuild
+"""
+from sqlalchemy import func, case, delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+from datetime import datetime
+
+from ..core.config import PLAYER_ROLES
+from ..models import Player, Team, TeamBudget
+
+# team_budgets column holding the player count for each role
+ROLE_COUNT_COLUMNS = {role: f"{role.lower()}_count" for role in PLAYER_ROLES}
+
+SUMMARY_FIELDS = ["total_spent", "player_count"] + list(ROLE_COUNT_COLUMNS.values())
+
+def _apply_delta(db: Session, team_id: int, delta: Dict[str, float]) -> None:
+    """Add delta (keyed by SUMMARY_FIELDS) to the team's summary row, creating it if needed."""
+    values = {field: delta.get(field, 0) for field in SUMMARY_FIELDS}
+    stmt = insert(TeamBudget).values(team_id=team_id, updated_at=datetime.utcnow(), **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TeamBudget.team_id],
+        set_={
+            **{
+                field: getattr(TeamBudget, field) + getattr(stmt.excluded, field)
+                for field in SUMMARY_FIELDS
+            },
+            "updated_at": stmt.excluded.updated_at,
+        }
+    )
+    db.execute(stmt)
+
+def _squad_delta(purchases: Iterable[Tuple[Optional[float], Optional[str]]], sign: int) -> Dict[str, float]:
+    delta = {field: 0 for field in SUMMARY_FIELDS}
+    for price, role in purchases:
+        delta["total_spent"] += sign * float(price or 0)
+        delta["player_count"] += sign
+        if role in ROLE_COUNT_COLUMNS:
+            delta[ROLE_COUNT_COLUMNS[role]] += sign
+    return delta
+
+def add_player(db: Session, team_id: int, price: Optional[float], role: Optional[str]) -> None:
+    """Record a player joining team_id at the given price."""
+    _apply_delta(db, team_id, _squad_delta([(price, role)], 1))
+
+def add_players(db: Session, team_id: int, purchases: Iterable[Tuple[Optional[float], Optional[str]]]) -> None:
+    """Record several (price, role) purchases by team_id with a single upsert."""
+    _apply_delta(db, team_id, _squad_delta(purchases, 1))
+
+def remove_player(db: Session, team_id: int, price: Optional[float], role: Optional[str]) -> None:
+    """Record a player leaving team_id, refunding the price they were bought for."""
+    _apply_delta(db, team_id, _squad_delta([(price, role)], -1))
+
+def ensure_team(db: Session, team_id: int) -> None:
+    """Create an empty summary row for a newly created team."""
+    db.execute(
+        insert(TeamBudget)
+        .values(
+            team_id=team_id,
+            total_spent=0.0,
+            player_count=0,
+            **{column: 0 for column in ROLE_COUNT_COLUMNS.values()},
+            updated_at=datetime.utcnow()
+        )
+        .on_conflict_do_nothing(index_elements=[TeamBudget.team_id])
+    )
+
+def get_budget(db: Session, team_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Return the team's initial purse joined with its summary, or None if the
+    team does not exist. Teams without a summary row report an empty squad.
+    """
+    row = db.query(
+        Team.id,
+        Team.initial_purse,
+        func.coalesce(TeamBudget.total_spent, 0.0).label('total_spent'),
+        func.coalesce(TeamBudget.player_count, 0).label('player_count')
+    ).outerjoin(
+        TeamBudget, TeamBudget.team_id == Team.id
+    ).filter(Team.id == team_id).first()
+    if row is None:
+        return None
+    return {
+        "team_id": row.id,
+        "initial_purse": float(row.initial_purse or 0),
+        "total_spent": float(row.total_spent),
+        "player_count": int(row.player_count),
+        "remaining_purse": float(row.initial_purse or 0) - float(row.total_spent),
+    }
+
+def compute_from_players(db: Session) -> Dict[int, Dict[str, Any]]:
+    """
+    Aggregate the authoritative per-team summary from the players table.
+    """
+    rows = db.query(
+        Team.id,
+        func.count(Player.id).label('player_count'),
+        func.coalesce(func.sum(Player.sold_price), 0.0).label('total_spent'),
+        *[
+            func.coalesce(func.sum(case((Player.role == role, 1), else_=0)), 0).label(column)
+            for role, column in ROLE_COUNT_COLUMNS.items()
+        ]
+    ).outerjoin(
+        Player, Player.team_id == Team.id
+    ).group_by(Team.id).all()
+
+    return {
+        row.id: {
+            "total_spent": float(row.total_spent),
+            "player_count": int(row.player_count),
+            **{column: int(getattr(row, column)) for column in ROLE_COUNT_COLUMNS.values()}
+        }
+        for row in rows
+    }
+
+def check_consistency(db: Session) -> List[Dict[str, Any]]:
+    """
+    Compare team_budgets against the players table.
+    Returns one entry per team whose stored summary differs from the actual one.
+    """
+    expected = compute_from_players(db)
+    stored = {budget.team_id: budget for budget in db.query(TeamBudget).all()}
+
+    mismatches = []
+    for team_id, actual in expected.items():
+        budget = stored.get(team_id)
+        recorded = {
+            field: (getattr(budget, field) if budget is not None else None)
+            for field in SUMMARY_FIELDS
+        }
+        differing = [
+            field for field in SUMMARY_FIELDS
+            if recorded[field] is None or abs(float(recorded[field]) - float(actual[field])) > 1e-6
+        ]
+        if differing:
+            mismatches.append({
+                "team_id": team_id,
+                "fields": differing,
+                "stored": recorded,
+                "actual": actual,
+            })
+    for team_id in stored.keys() - expected.keys():
+        mismatches.append({"team_id": team_id, "fields": ["team_id"], "stored": None, "actual": None})
+    return mismatches
+
+def rebuild(db: Session) -> int:
+    """
+    Recompute team_budgets from the players table. The caller commits.
+    Returns the number of teams written.
+    """
+    expected = compute_from_players(db)
+    db.execute(delete(TeamBudget))
+    now = datetime.utcnow()
+    if expected:
+        db.execute(insert(TeamBudget), [
+            {"team_id": team_id, **summary, "updated_at": now}
+            for team_id, summary in expected.items()
+        ])
+    return len(expected)
+
+def ensure_populated(db: Session) -> bool:
+    """
+    Build team_budgets from players if it is empty, e.g. for a database whose
+    tables were created before the summary existed. Returns True if rebuilt.
+    """
+    if db.query(TeamBudget.team_id).first() is not None:
+        return False
+    rebuild(db)
+    db.commit()
+    return True
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from ..db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild the team_budgets table")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            count = rebuild(session)
+            session.commit()
+            print(f"Rebuilt budgets for {count} teams")
+        else:
+            mismatches = check_consistency(session)
+            for mismatch in mismatches:
+                print(f"Team {mismatch['team_id']}: {', '.join(mismatch['fields'])} out of sync")
+            print("team_budgets is consistent" if not mismatches else f"{len(mismatches)} teams out of sync")
+            sys.exit(1 if mismatches else 0)
+    finally:
+        session.close()
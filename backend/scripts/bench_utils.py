@@ -0,0 +1,171 @@
+"""
+Shared helpers for the benchmark and load-test scripts in this directory.
+
+Every script runs the FastAPI app in-process against a scratch SQLite file so
+that it never touches the development database. Import this module before
+anything from ``app`` so that DATABASE_URL is pointed at the scratch file.
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+_scratch_dir = tempfile.mkdtemp(prefix="ipl-fantasy-bench-")
+SCRATCH_DB_PATH = os.path.join(_scratch_dir, "bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{SCRATCH_DB_PATH}")
+
+ROLES = ["BAT", "BOWL", "AR", "WK"]
+IPL_TEAMS = ["RCB", "CSK", "MI", "KKR", "SRH", "PBKS", "RR", "DC", "LSG", "GT"]
+
+
+def get_client():
+    """Return a TestClient bound to the app (tables are created on import)."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+def reset_tables():
+    """
+    Empty every table in the scratch database. Rows are deleted rather than
+    the tables dropped, so triggers on them (the player search index) survive.
+    """
+    from sqlalchemy import text
+    from app.db.database import Base, engine
+    from app.services.player_search import ensure_search_index
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+        # Restart AUTOINCREMENT ids at 1, as on a fresh database
+        if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'")).first():
+            conn.execute(text("DELETE FROM sqlite_sequence"))
+    ensure_search_index(engine, rebuild=True)
+
+
+def seed(num_teams=9, num_players=228, initial_purse=12000.0):
+    """
+    Insert fantasy teams and unsold players with a spread of base prices.
+    Returns (team_ids, player_ids).
+    """
+    from sqlalchemy import insert
+    from app.db.database import engine
+    from app.models import Team, Player
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Team), [
+            {
+                "name": f"Team {i + 1}",
+                "owner_name": f"Owner {i + 1}",
+                "initial_purse": initial_purse,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(num_teams)
+        ])
+        conn.execute(insert(Player), [
+            {
+                "name": f"Player {i + 1}",
+                "ipl_team": IPL_TEAMS[i % len(IPL_TEAMS)],
+                "role": ROLES[i % len(ROLES)],
+                "base_price": float(20 + (i * 37) % 200),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(num_players)
+        ])
+    refresh_caches()
+    return list(range(1, num_teams + 1)), list(range(1, num_players + 1))
+
+
+def seed_matches(num_matches=74, completed=False):
+    """Insert IPL matches numbered 1..num_matches. Returns their ids."""
+    from datetime import date, timedelta
+    from sqlalchemy import insert
+    from app.db.database import engine
+    from app.models import Match
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Match), [
+            {
+                "match_number": i + 1,
+                "team1": IPL_TEAMS[i % len(IPL_TEAMS)],
+                "team2": IPL_TEAMS[(i + 1 + i // len(IPL_TEAMS)) % len(IPL_TEAMS)],
+                "match_date": date(2025, 3, 22) + timedelta(days=i),
+                "venue": "Stadium",
+                "is_completed": completed,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(num_matches)
+        ])
+    return list(range(1, num_matches + 1))
+
+
+def refresh_caches():
+    """Reload in-process state after the scratch tables were written directly."""
+    from app.db.database import SessionLocal
+    from app.services import ledger
+    from app.services.auction_stats import accumulator
+    from app.services.bid_limits import pool
+    from app.services.cache import scorecard_cache
+    from app.services.distribution import role_distribution
+    from app.services.form import form_tracker
+    from app.services.leaderboard import leaderboard_cache
+    from app.services.points_series import points_series
+
+    with SessionLocal() as db:
+        ledger.ensure_baseline(db)
+        accumulator.seed(db)
+        pool.seed(db)
+    scorecard_cache.clear()
+    leaderboard_cache.clear()
+    points_series.reset()
+    form_tracker.reset()
+    role_distribution.invalidate()
+
+
+@contextmanager
+def count_queries():
+    """Count the SQL statements executed inside the block."""
+    from sqlalchemy import event
+    from app.db.database import engine
+
+    counter = {"queries": 0}
+
+    def _on_execute(*args, **kwargs):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+
+
+def time_calls(fn, iterations):
+    """Call fn repeatedly and return per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,62 @@
+"""
+Benchmark replaying a full offline auction through /api/auction/purchase/batch.
+
+Seeds a scratch database, builds an ordered log of sales (including a few
+that must fail validation) and replays it in a single request, then checks
+the resulting squads against team_budgets.
+
+Usage (from the backend directory):
+    python scripts/benchmark_batch_purchase.py [--sales 200] [--runs 5]
+"""
+import argparse
+import random
+import statistics
+import time
+
+import bench_utils
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sales", type=int, default=200)
+    parser.add_argument("--players", type=int, default=228)
+    parser.add_argument("--teams", type=int, default=9)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    from app.db.database import SessionLocal
+    from app.services import team_budget
+
+    client = bench_utils.get_client()
+    timings = []
+    for run in range(args.runs):
+        bench_utils.reset_tables()
+        team_ids, player_ids = bench_utils.seed(num_teams=args.teams, num_players=args.players)
+
+        rng = random.Random(args.seed + run)
+        sold = rng.sample(player_ids, min(args.sales, len(player_ids)))
+        purchases = [
+            {"player_id": player_id, "team_id": team_ids[i % len(team_ids)], "purchase_price": float(rng.randint(20, 900))}
+            for i, player_id in enumerate(sold)
+        ]
+        # A resale of an already sold player must be reported, not applied
+        purchases.append(dict(purchases[0], team_id=team_ids[-1]))
+
+        start = time.perf_counter()
+        response = client.post("/api/auction/purchase/batch", json={"purchases": purchases})
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        body = response.json()
+
+        with SessionLocal() as db:
+            mismatches = team_budget.check_consistency(db)
+        if mismatches:
+            raise SystemExit(f"team_budgets out of sync for {len(mismatches)} teams")
+
+    print(f"{len(purchases)} sales per replay: {len(body['purchased'])} applied, {len(body['failures'])} rejected")
+    print(f"median {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms over {args.runs} replays")
+
+
+if __name__ == "__main__":
+    main()
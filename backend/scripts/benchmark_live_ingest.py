@@ -0,0 +1,202 @@
+"""
+Benchmark ball-by-ball ingest through /api/live/matches/{id}/deliveries.
+
+Simulates a full T20 match (two innings of 20 overs with wides, boundaries,
+wickets and catches) between two squads of owned players, posts it one
+delivery per request and then one over per request, and reports deliveries
+per second. The final flushed scores are checked against scoring the same
+flushed raw stats rescored by the points engine, and the leaderboard is
+checked to include live points before they are flushed.
+
+Finally several matches are ingested in parallel while other threads force
+flushes of them, with a flush due on every batch; any failed request (e.g. a
+lock-order deadlock surfacing as "database is locked") fails the script.
+
+Usage (from the backend directory):
+    python scripts/benchmark_live_ingest.py [--matches 3]
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+import bench_utils
+
+
+def simulate_match(rng, batting_sides):
+    """Return the deliveries of a two-innings match and the raw totals per player."""
+    deliveries = []
+    sequence = 0
+    for innings, (batters, bowlers) in enumerate(batting_sides, start=1):
+        striker, wickets = 0, 0
+        for over in range(20):
+            bowler = bowlers[over % 5]
+            legal = 0
+            while legal < 6 and wickets < 10:
+                sequence += 1
+                delivery = {"sequence": sequence, "over": over, "innings": innings,
+                            "batter_id": batters[striker], "bowler_id": bowler}
+                roll = rng.random()
+                if roll < 0.04:
+                    delivery.update(extras=1, extra_type="wide")
+                else:
+                    legal += 1
+                    if roll < 0.08:
+                        delivery.update(wicket_kind="caught", fielder_id=rng.choice(bowlers))
+                        wickets += 1
+                        striker = wickets + 1 if wickets < 10 else striker
+                    elif roll < 0.1:
+                        delivery.update(wicket_kind="bowled")
+                        wickets += 1
+                        striker = wickets + 1 if wickets < 10 else striker
+                    else:
+                        delivery["runs"] = rng.choice([0, 0, 0, 1, 1, 1, 2, 4, 4, 6])
+                deliveries.append(delivery)
+    return deliveries
+
+
+def check_concurrent_flushes(rng, match_ids, squads, ingest_threads=3, flush_threads=2):
+    """
+    Ingest one match per thread while flush threads hammer the same matches.
+    Returns (failed requests, requests slower than a second, requests made).
+    """
+    from app.services import live_scoring
+
+    interval = live_scoring.FLUSH_INTERVAL_SECONDS
+    live_scoring.FLUSH_INTERVAL_SECONDS = 0
+    failures, slow, requests = [], [], [0]
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def post(client, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = client.post(path, **kwargs)
+            # A flush before the match's first batch is a 404
+            expected = response.status_code < 400 or (path.endswith("/flush") and response.status_code == 404)
+            error = None if expected else response.status_code
+        except Exception as e:
+            error = type(e).__name__
+        elapsed = time.perf_counter() - start
+        with lock:
+            requests[0] += 1
+            if error is not None:
+                failures.append(f"{path}: {error}")
+            if elapsed > 1.0:
+                slow.append(f"{path}: {elapsed:.2f}s")
+
+    def ingest(match_id, deliveries):
+        client = bench_utils.get_client()
+        for start in range(0, len(deliveries), 6):
+            post(client, f"/api/live/matches/{match_id}/deliveries", json={"deliveries": deliveries[start:start + 6]})
+
+    def flush():
+        client = bench_utils.get_client()
+        while not done.is_set():
+            for match_id in match_ids[:ingest_threads]:
+                post(client, f"/api/live/matches/{match_id}/flush")
+
+    ingesters = [
+        threading.Thread(target=ingest, args=(match_id, simulate_match(rng, squads)))
+        for match_id in match_ids[:ingest_threads]
+    ]
+    flushers = [threading.Thread(target=flush) for _ in range(flush_threads)]
+    try:
+        for thread in ingesters + flushers:
+            thread.start()
+        for thread in ingesters:
+            thread.join()
+        done.set()
+        for thread in flushers:
+            thread.join()
+    finally:
+        live_scoring.FLUSH_INTERVAL_SECONDS = interval
+    return failures, slow, requests[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    from app.db.database import SessionLocal
+    from app.models import PlayerMatchStats, PlayerScore
+    from app.schemas.scores import PointsRules
+    from app.services import live_scoring, points_engine
+
+    client = bench_utils.get_client()
+    bench_utils.reset_tables()
+    team_ids, player_ids = bench_utils.seed(num_players=44, initial_purse=100000.0)
+    match_ids = bench_utils.seed_matches(args.matches * 2 + 3)
+    for i, player_id in enumerate(player_ids):
+        client.post("/api/auction/purchase", json={
+            "player_id": player_id, "team_id": team_ids[i % len(team_ids)], "purchase_price": 10.0
+        }).raise_for_status()
+
+    rules = PointsRules().model_dump()
+    rng = random.Random(args.seed)
+    home, away = player_ids[:11], player_ids[11:22]
+    rates = {"per delivery": [], "per over": []}
+    for run in range(args.matches):
+        deliveries = simulate_match(rng, [(home, away), (away, home)])
+        for mode, match_id in (("per delivery", match_ids[2 * run]), ("per over", match_ids[2 * run + 1])):
+            if mode == "per delivery":
+                batches = [[delivery] for delivery in deliveries]
+            else:
+                batches = {}
+                for delivery in deliveries:
+                    batches.setdefault((delivery["innings"], delivery["over"]), []).append(delivery)
+                batches = list(batches.values())
+
+            start = time.perf_counter()
+            for batch in batches:
+                client.post(f"/api/live/matches/{match_id}/deliveries", json={"deliveries": batch}).raise_for_status()
+            rates[mode].append(len(deliveries) / (time.perf_counter() - start))
+
+            # Resending the last batch must not change anything
+            resent = client.post(f"/api/live/matches/{match_id}/deliveries", json={"deliveries": batches[-1]}).json()
+            if resent["accepted"]:
+                raise SystemExit("Resent deliveries were applied twice")
+            client.post(f"/api/live/matches/{match_id}/complete").raise_for_status()
+
+            with SessionLocal() as db:
+                stats = db.query(PlayerMatchStats).filter(PlayerMatchStats.match_id == match_id).all()
+                points = dict(db.query(PlayerScore.player_id, PlayerScore.points)
+                              .filter(PlayerScore.match_id == match_id).all())
+            if sum(line.runs for line in stats) != sum(d.get("runs", 0) for d in deliveries):
+                raise SystemExit("Flushed runs do not add up to the runs in the deliveries")
+            expected = points_engine.score_lines(stats, rules)
+            if any(abs(points[line.player_id] - value) > 1e-9 for line, value in zip(stats, expected)):
+                raise SystemExit("Flushed points disagree with the points engine")
+
+    failures, slow, requests = check_concurrent_flushes(
+        rng, match_ids[args.matches * 2:], [(home, away), (away, home)]
+    )
+
+    # Live points must reach the leaderboard before they are flushed
+    live_scoring.FLUSH_INTERVAL_SECONDS = 3600
+    match_id = client.post("/api/matches", json={
+        "match_number": len(match_ids) + 1, "team1": "MI", "team2": "CSK", "match_date": "2025-05-30", "venue": "Stadium"
+    }).json()["id"]
+    before = {t["team_id"]: t["total_points"] for t in client.get("/api/dashboard/leaderboard").json()}
+    client.post(f"/api/live/matches/{match_id}/deliveries", json={"deliveries": [
+        {"sequence": 1, "over": 0, "batter_id": home[0], "bowler_id": away[0], "runs": 6}
+    ]}).raise_for_status()
+    after = {t["team_id"]: t["total_points"] for t in client.get("/api/dashboard/leaderboard").json()}
+    if not any(after.get(team_id, 0) > before.get(team_id, 0) for team_id in after):
+        raise SystemExit("Leaderboard does not include unflushed live points")
+
+    print(f"{len(deliveries)} deliveries per match over {args.matches} matches")
+    for mode, values in rates.items():
+        print(f"{mode:>12}: median {statistics.median(values):.0f} deliveries/s")
+    print(f"concurrent ingest + flush: {requests} requests, {len(failures)} failed, {len(slow)} over 1s")
+    for failure in failures[:10]:
+        print(f"  {failure}")
+    if failures:
+        raise SystemExit("Requests failed while ingesting and flushing concurrently")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark GET /api/players as the number of sold players grows.
+
+The listing fetches players together with their team name and owner in a
+single joined query, so both the query count and the latency should stay flat
+no matter how many players have been sold.
+
+Usage (from the backend directory):
+    python scripts/benchmark_player_listing.py [--players 1000] [--iterations 20]
+"""
+import argparse
+import statistics
+
+import bench_utils
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--teams", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    from sqlalchemy import update
+    from app.db.database import engine
+    from app.models import Player
+
+    client = bench_utils.get_client()
+    bench_utils.reset_tables()
+    team_ids, player_ids = bench_utils.seed(num_teams=args.teams, num_players=args.players)
+
+    print(f"{'sold':>6} {'queries':>8} {'median ms':>10} {'p95 ms':>8}")
+    sold = 0
+    for fraction in (0.0, 0.25, 0.5, 0.75, 1.0):
+        target = int(len(player_ids) * fraction)
+        with engine.begin() as conn:
+            for player_id in player_ids[sold:target]:
+                conn.execute(
+                    update(Player)
+                    .where(Player.id == player_id)
+                    .values(team_id=team_ids[player_id % len(team_ids)], sold_price=100.0)
+                )
+        sold = target
+
+        with bench_utils.count_queries() as counter:
+            response = client.get("/api/players/", params={"limit": args.players})
+        response.raise_for_status()
+
+        latencies = bench_utils.time_calls(
+            lambda: client.get("/api/players/", params={"limit": args.players}),
+            args.iterations
+        )
+        print(
+            f"{sold:>6} {counter['queries']:>8} "
+            f"{statistics.median(latencies):>10.2f} {bench_utils.percentile(latencies, 95):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
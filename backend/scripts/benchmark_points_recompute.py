@@ -0,0 +1,98 @@
+"""
+Benchmark recomputing a season's fantasy points after a rule change.
+
+Records a season of raw scorecards through /api/scores/batch/raw, then changes
+the wicket points and times:
+- the vectorized points engine alone over every scorecard line, against a
+  plain per-line Python implementation of the same rules (results must match)
+- POST /api/scores/recompute, which reads the raw lines, rescores them and
+  bulk-updates player_scores
+
+Usage (from the backend directory):
+    python scripts/benchmark_points_recompute.py [--matches 74] [--runs 5]
+"""
+import argparse
+import random
+import statistics
+import time
+
+import bench_utils
+
+STAT_RANGES = {
+    "runs": (0, 110), "balls": (0, 60), "fours": (0, 10), "sixes": (0, 7), "wickets": (0, 5),
+    "maidens": (0, 1), "catches": (0, 3), "stumpings": (0, 1), "run_outs": (0, 1),
+}
+
+
+def reference_points(line, rules):
+    """Straightforward per-line scoring, used to check the vectorized engine."""
+    from app.services.points_engine import UNIT_RULES, MILESTONE_RULES
+
+    points = sum(line[field] * rules[rule] for field, rule in UNIT_RULES.items())
+    for field, rule in MILESTONE_RULES.items():
+        reached = [threshold for threshold in rules[rule] if line[field] >= threshold]
+        if reached:
+            points += rules[rule][max(reached)]
+    if line["balls"] >= rules["strike_rate_min_balls"]:
+        strike_rate = line["runs"] * 100.0 / line["balls"]
+        for band in rules["strike_rate_bands"]:
+            if strike_rate >= band["min"] and (band["max"] is None or strike_rate < band["max"]):
+                points += band["points"]
+    return max(points, 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=74)
+    parser.add_argument("--players-per-match", type=int, default=22)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.schemas.scores import PointsRules
+    from app.services import points_engine
+
+    client = bench_utils.get_client()
+    bench_utils.reset_tables()
+    _, player_ids = bench_utils.seed()
+    match_ids = bench_utils.seed_matches(args.matches)
+
+    rng = random.Random(args.seed)
+    lines = []
+    for match_id in match_ids:
+        players = [
+            {"player_id": player_id, **{field: rng.randint(*bounds) for field, bounds in STAT_RANGES.items()}}
+            for player_id in rng.sample(player_ids, args.players_per_match)
+        ]
+        client.post("/api/scores/batch/raw", json={"match_id": match_id, "players": players}).raise_for_status()
+        lines.extend(players)
+
+    rules = PointsRules(wicket=30).model_dump()
+    stats = points_engine.stats_matrix(lines)
+
+    vectorized = bench_utils.time_calls(lambda: points_engine.compute_points(stats, rules), args.runs)
+    looped = bench_utils.time_calls(lambda: [reference_points(line, rules) for line in lines], args.runs)
+    expected = [reference_points(line, rules) for line in lines]
+    actual = points_engine.compute_points(stats, rules).tolist()
+    if any(abs(a - b) > 1e-9 for a, b in zip(actual, expected)):
+        raise SystemExit("Vectorized engine disagrees with the reference implementation")
+
+    print(f"{len(lines)} scorecard lines over {args.matches} matches")
+    print(f"engine, vectorized:      median {statistics.median(vectorized):.2f} ms")
+    print(f"engine, per-line Python: median {statistics.median(looped):.2f} ms")
+
+    timings = []
+    for run in range(args.runs):
+        # Alternate between two rule sets so every run rewrites the scores
+        body = {"rules": PointsRules(wicket=30 if run % 2 == 0 else 25).model_dump()}
+        start = time.perf_counter()
+        response = client.post("/api/scores/recompute", json=body)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        result = response.json()
+    print(f"POST /api/scores/recompute: {result['scores_recomputed']} scores, "
+          f"median {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
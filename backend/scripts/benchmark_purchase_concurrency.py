@@ -0,0 +1,188 @@
+"""
+Fire many parallel purchases at /api/auction/purchase and check for overspend.
+
+Every team bids on every player at a price chosen so that a team can afford
+only a fraction of the players it bids on. If two bids could both pass the
+purse or squad-size check, some team would end up over its initial purse or
+over the squad limit; the script verifies that never happens and reports the
+purchase throughput.
+
+The same bids are first replayed against baseline routes mounted by this
+script, which purchase the way the endpoint used to: read the player and the
+team budget, check them in Python, then write. One runs exactly as before, the
+other takes the write lock up front with BEGIN IMMEDIATE, which is what the old
+code needed to be correct. All runs are printed side by side; only a violation
+by the guarded endpoint fails the script.
+
+Usage (from the backend directory):
+    python scripts/benchmark_purchase_concurrency.py [--threads 16] [--players 400]
+"""
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+
+import bench_utils
+
+BASELINE_PATH = "/bench/purchase-read-check-write"
+LOCKED_BASELINE_PATH = "/bench/purchase-read-check-write-locked"
+
+
+def mount_baseline_routes():
+    """Add the pre-guarded-UPDATE purchase handler to the app, without and with BEGIN IMMEDIATE."""
+    from datetime import datetime
+    from fastapi import Depends, HTTPException
+    from sqlalchemy import update
+    from sqlalchemy.orm import Session
+    from app.core.config import MAX_SQUAD_SIZE
+    from app.db.database import get_db, begin_immediate
+    from app.main import app
+    from app.models import Player
+    from app.schemas.auction import AuctionPurchase
+    from app.services import ledger, team_budget
+    from app.services.events import publish_player_event, player_state, model_to_dict
+
+    def read_check_write_purchase(purchase: AuctionPurchase, db: Session, lock: bool):
+        if lock:
+            begin_immediate(db)
+        player = db.query(Player).filter(Player.id == purchase.player_id).first()
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        if player.team_id is not None:
+            raise HTTPException(status_code=400, detail="Player is already sold")
+        budget = team_budget.get_budget(db, purchase.team_id)
+        if budget is None:
+            raise HTTPException(status_code=404, detail="Team not found")
+        if budget["player_count"] >= MAX_SQUAD_SIZE:
+            raise HTTPException(status_code=400, detail=f"Team has reached maximum size of {MAX_SQUAD_SIZE} players")
+        if budget["remaining_purse"] < float(purchase.purchase_price):
+            raise HTTPException(status_code=400, detail="Team does not have sufficient purse")
+
+        previous = player_state(player)
+        db.execute(
+            update(Player)
+            .where(Player.id == purchase.player_id)
+            .values(team_id=purchase.team_id, sold_price=purchase.purchase_price, updated_at=datetime.utcnow())
+        )
+        team_budget.add_player(db, purchase.team_id, purchase.purchase_price, player.role)
+        ledger.record(db, "purchase", player.id, purchase.team_id, purchase.purchase_price)
+        db.commit()
+        db.refresh(player)
+        publish_player_event("purchase", model_to_dict(player), previous)
+        return {"detail": "sold"}
+
+    def unlocked(purchase: AuctionPurchase, db: Session = Depends(get_db)):
+        return read_check_write_purchase(purchase, db, lock=False)
+
+    def locked(purchase: AuctionPurchase, db: Session = Depends(get_db)):
+        return read_check_write_purchase(purchase, db, lock=True)
+
+    app.add_api_route(BASELINE_PATH, unlocked, methods=["POST"])
+    app.add_api_route(LOCKED_BASELINE_PATH, locked, methods=["POST"])
+
+
+def run(path, args):
+    """Seed fresh tables, fire every bid at path and return (elapsed, outcomes, violations)."""
+    from app.core.config import MAX_SQUAD_SIZE
+    from app.db.database import SessionLocal
+    from app.models import Player, Team
+    from app.services import team_budget
+
+    bench_utils.reset_tables()
+    team_ids, player_ids = bench_utils.seed(
+        num_teams=args.teams, num_players=args.players, initial_purse=args.purse
+    )
+
+    rng = random.Random(args.seed)
+    bids = [
+        {"player_id": player_id, "team_id": team_id, "purchase_price": float(rng.randint(50, 400))}
+        for player_id in player_ids
+        for team_id in team_ids
+    ]
+    rng.shuffle(bids)
+    chunks = [bids[i::args.threads] for i in range(args.threads)]
+
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def bidder(chunk):
+        client = bench_utils.get_client()
+        local = Counter()
+        for bid in chunk:
+            try:
+                response = client.post(path, json=bid)
+            except Exception as e:
+                # e.g. "database is locked" once a bid waits out SQLite's busy timeout
+                local[(500, type(e).__name__)] += 1
+                continue
+            local[(response.status_code, response.json().get("detail", "sold"))] += 1
+        with lock:
+            outcomes.update(local)
+
+    threads = [threading.Thread(target=bidder, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    db = SessionLocal()
+    try:
+        violations = []
+        for team in db.query(Team).all():
+            squad = db.query(Player).filter(Player.team_id == team.id).all()
+            spent = sum(player.sold_price or 0 for player in squad)
+            if spent > team.initial_purse:
+                violations.append(f"{team.name} spent {spent} of {team.initial_purse}")
+            if len(squad) > MAX_SQUAD_SIZE:
+                violations.append(f"{team.name} owns {len(squad)} players")
+        mismatches = team_budget.check_consistency(db)
+        if mismatches:
+            violations.append(f"team_budgets out of sync for {len(mismatches)} teams")
+    finally:
+        db.close()
+    return len(bids), elapsed, outcomes, violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--players", type=int, default=400)
+    parser.add_argument("--teams", type=int, default=9)
+    parser.add_argument("--purse", type=float, default=2000.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    bench_utils.get_client()
+    mount_baseline_routes()
+
+    results = {}
+    runs = (
+        ("read-check-write", BASELINE_PATH),
+        ("+ BEGIN IMMEDIATE", LOCKED_BASELINE_PATH),
+        ("guarded UPDATE", "/api/auction/purchase"),
+    )
+    for label, path in runs:
+        results[label] = run(path, args)
+        bids, elapsed, outcomes, violations = results[label]
+        print(f"{label}: {bids} bids from {args.threads} threads in {elapsed:.2f}s")
+        for (status_code, detail), count in sorted(outcomes.items(), key=lambda item: -item[1]):
+            print(f"  {status_code} {detail}: {count}")
+        for violation in violations:
+            print(f"  OVERSPEND: {violation}")
+
+    print()
+    print(f"{'':<18} {'requests/s':>10} {'sold':>6} {'violations':>10}")
+    for label, (bids, elapsed, outcomes, violations) in results.items():
+        sold = sum(count for (status_code, _), count in outcomes.items() if status_code == 200)
+        print(f"{label:<18} {bids / elapsed:>10.0f} {sold:>6} {len(violations):>10}")
+
+    if results["guarded UPDATE"][3]:
+        raise SystemExit(1)
+    print("The guarded endpoint kept every team within its purse and squad limit; team_budgets is consistent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark backfilling a season through POST /api/matches/import.
+
+Generates a season file of fixtures and 22 scores per match, imports it as
+JSONL and again (into fresh tables) as CSV, and reports wall time, records
+per second and the number of SQL statements. The imported rows are checked
+against the generated file.
+
+Usage (from the backend directory):
+    python scripts/benchmark_season_import.py [--matches 74] [--chunk-size 1000]
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import time
+from datetime import date, timedelta
+
+import bench_utils
+
+CSV_FIELDS = ["type", "match_number", "team1", "team2", "match_date", "venue", "player_id", "player_name", "points"]
+
+
+def season_records(num_matches, players_per_match, player_ids, rng):
+    """Fixtures followed by their scores, half by player id and half by name."""
+    records = []
+    for i in range(num_matches):
+        teams = bench_utils.IPL_TEAMS
+        records.append({
+            "type": "match",
+            "match_number": i + 1,
+            "team1": teams[i % len(teams)],
+            "team2": teams[(i + 1 + (i // len(teams)) % (len(teams) - 1)) % len(teams)],
+            "match_date": (date(2024, 3, 22) + timedelta(days=i)).isoformat(),
+            "venue": "Stadium",
+        })
+    for i in range(num_matches):
+        for n, player_id in enumerate(rng.sample(player_ids, players_per_match)):
+            record = {"type": "score", "match_number": i + 1, "points": float(rng.randint(0, 150))}
+            if n % 2:
+                record["player_name"] = f"Player {player_id}"
+            else:
+                record["player_id"] = player_id
+            records.append(record)
+    return records
+
+
+def to_jsonl(records):
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+def to_csv(records):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    writer.writerows(records)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=74)
+    parser.add_argument("--players-per-match", type=int, default=22)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=18)
+    args = parser.parse_args()
+
+    from sqlalchemy import func
+    from app.db.database import SessionLocal
+    from app.models import Match, PlayerScore
+
+    client = bench_utils.get_client()
+    rng = random.Random(args.seed)
+
+    for file_format, render in (("jsonl", to_jsonl), ("csv", to_csv)):
+        bench_utils.reset_tables()
+        _, player_ids = bench_utils.seed()
+        records = season_records(args.matches, args.players_per_match, player_ids, rng)
+        body = render(records).encode()
+
+        with bench_utils.count_queries() as counter:
+            start = time.perf_counter()
+            response = client.post(
+                "/api/matches/import",
+                params={"format": file_format, "chunk_size": args.chunk_size},
+                content=body,
+            )
+            elapsed = time.perf_counter() - start
+        response.raise_for_status()
+        result = response.json()
+
+        expected_scores = sum(record["points"] for record in records if record["type"] == "score")
+        with SessionLocal() as db:
+            matches = db.query(func.count(Match.id)).filter(Match.is_completed.is_(True)).scalar()
+            scores, total = db.query(func.count(PlayerScore.id), func.sum(PlayerScore.points)).one()
+        if result["error_count"] or matches != args.matches or scores != args.matches * args.players_per_match \
+                or abs(total - expected_scores) > 1e-6:
+            raise SystemExit(f"{file_format} import mismatch: {result}")
+
+        print(f"{file_format}: {len(records)} records ({len(body) / 1024:.0f} KiB) in {elapsed * 1000:.0f} ms "
+              f"({len(records) / elapsed:,.0f} records/s), {result['chunks_committed']} chunks, "
+              f"{counter['queries']} SQL statements")
+
+
+if __name__ == "__main__":
+    main()
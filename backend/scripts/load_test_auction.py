@@ -0,0 +1,175 @@
+"""
+Simulate auction night: concurrent bidders hammering the auction endpoints.
+
+Each bidder thread repeatedly picks an action by weight (purchase, reset or
+stats read), fires it at the in-process app and records the latency. After the
+run the script reports throughput and p50/p95/p99 latency per endpoint, then
+checks the auction invariants against the players table:
+- no team owns more than MAX_SQUAD_SIZE players
+- no team has spent more than its initial purse
+- team_budgets, the stats accumulator and the ledger agree with the players table
+
+Exits non-zero if any invariant is violated or a request fails with a 5xx.
+
+Usage (from the backend directory):
+    python scripts/load_test_auction.py [--bidders 16] [--requests 400]
+        [--mix purchase=6,reset=2,stats=2]
+"""
+import argparse
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+
+import bench_utils
+
+ENDPOINTS = {
+    "purchase": "POST /api/auction/purchase",
+    "reset": "PUT /api/auction/reset/{player_id}",
+    "stats": "GET /api/auction/stats",
+}
+
+
+def parse_mix(value):
+    """Parse 'purchase=6,reset=2,stats=2' into action weights."""
+    weights = {}
+    for part in value.split(","):
+        action, _, weight = part.partition("=")
+        action = action.strip()
+        if action not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown action {action!r}")
+        weights[action] = float(weight or 1)
+    return weights
+
+
+def run_bidder(client, rng, player_ids, team_ids, mix, count, latencies, statuses):
+    actions, weights = zip(*mix.items())
+    for _ in range(count):
+        action = rng.choices(actions, weights)[0]
+        player_id = rng.choice(player_ids)
+        start = time.perf_counter()
+        if action == "purchase":
+            response = client.post("/api/auction/purchase", json={
+                "player_id": player_id,
+                "team_id": rng.choice(team_ids),
+                "purchase_price": float(rng.randint(20, 400)),
+            })
+        elif action == "reset":
+            response = client.put(f"/api/auction/reset/{player_id}")
+        else:
+            response = client.get("/api/auction/stats")
+        latencies[action].append((time.perf_counter() - start) * 1000)
+        statuses[action][response.status_code] += 1
+
+
+def check_invariants(client):
+    """Return a list of human-readable invariant violations."""
+    from app.core.config import MAX_SQUAD_SIZE
+    from app.db.database import SessionLocal
+    from app.models import Player, Team
+    from app.services import ledger, team_budget
+
+    violations = []
+    db = SessionLocal()
+    try:
+        squads = defaultdict(list)
+        for player in db.query(Player).filter(Player.team_id.isnot(None)).all():
+            squads[player.team_id].append(player)
+        for team in db.query(Team).all():
+            squad = squads.get(team.id, [])
+            spent = sum(player.sold_price or 0 for player in squad)
+            if len(squad) > MAX_SQUAD_SIZE:
+                violations.append(f"{team.name} owns {len(squad)} players (limit {MAX_SQUAD_SIZE})")
+            if spent > team.initial_purse + 1e-6:
+                violations.append(f"{team.name} spent {spent:.2f} of {team.initial_purse:.2f}")
+
+        mismatches = team_budget.check_consistency(db)
+        if mismatches:
+            violations.append(f"team_budgets out of sync for {len(mismatches)} teams")
+
+        replayed = ledger.state_as_of(db, ledger.last_event_id(db))
+        if replayed is None or replayed["state"] != ledger.current_state(db):
+            violations.append("ledger replay does not match the players table")
+    finally:
+        db.close()
+
+    live = client.get("/api/auction/stats").json()
+    fresh = client.get("/api/auction/stats", params={"refresh": True}).json()
+    live_teams = {(t["team_id"], t["players_bought"], round(t["total_spent"], 6)) for t in live["team_stats"]}
+    fresh_teams = {(t["team_id"], t["players_bought"], round(t["total_spent"], 6)) for t in fresh["team_stats"]}
+    if live["total_players_sold"] != fresh["total_players_sold"] or live_teams != fresh_teams:
+        violations.append("auction stats accumulator drifted from the database")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bidders", type=int, default=16, help="concurrent bidder threads")
+    parser.add_argument("--requests", type=int, default=400, help="requests per bidder")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("purchase=6,reset=2,stats=2"))
+    parser.add_argument("--players", type=int, default=228)
+    parser.add_argument("--teams", type=int, default=9)
+    parser.add_argument("--purse", type=float, default=3000.0)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    bench_utils.get_client()
+    bench_utils.reset_tables()
+    team_ids, player_ids = bench_utils.seed(
+        num_teams=args.teams, num_players=args.players, initial_purse=args.purse
+    )
+
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    lock = threading.Lock()
+
+    def bidder(index):
+        local_latencies = defaultdict(list)
+        local_statuses = defaultdict(Counter)
+        run_bidder(
+            bench_utils.get_client(), random.Random(args.seed + index), player_ids, team_ids,
+            args.mix, args.requests, local_latencies, local_statuses
+        )
+        with lock:
+            for action, values in local_latencies.items():
+                latencies[action].extend(values)
+            for action, counts in local_statuses.items():
+                statuses[action].update(counts)
+
+    threads = [threading.Thread(target=bidder, args=(i,)) for i in range(args.bidders)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total} requests from {args.bidders} bidders in {elapsed:.2f}s ({total / elapsed:.0f} requests/s)")
+    print(f"{'endpoint':<38} {'count':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for action in ENDPOINTS:
+        values = latencies.get(action)
+        if not values:
+            continue
+        codes = " ".join(f"{code}x{count}" for code, count in sorted(statuses[action].items()))
+        print(
+            f"{ENDPOINTS[action]:<38} {len(values):>6} {len(values) / elapsed:>7.0f} "
+            f"{bench_utils.percentile(values, 50):>8.2f} {bench_utils.percentile(values, 95):>8.2f} "
+            f"{bench_utils.percentile(values, 99):>8.2f}  {codes}"
+        )
+
+    violations = check_invariants(bench_utils.get_client())
+    server_errors = sum(
+        count for counts in statuses.values() for code, count in counts.items() if code >= 500
+    )
+    if server_errors:
+        violations.append(f"{server_errors} requests failed with a server error")
+    if violations:
+        for violation in violations:
+            print(f"VIOLATION: {violation}")
+        raise SystemExit(1)
+    print("Invariants hold: squad sizes and purses within limits, summaries consistent")
+
+
+if __name__ == "__main__":
+    main()